@@ -5,7 +5,9 @@ Prevents SQLAlchemy primary mapper conflicts
 
 import os
 import logging
+from collections.abc import Mapping
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -25,6 +27,17 @@ app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "growth-accelerator-staffing-dev-key")
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1) # needed for url_for to generate with https
 
+class RecordJSONProvider(DefaultJSONProvider):
+    """Serializes read-only record mappings (normalized Workable records, row views) as objects"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Mapping):
+            return dict(o)
+        return DefaultJSONProvider.default(o)
+
+app.json = RecordJSONProvider(app)
+
 # Configure database with error handling
 database_url = os.environ.get("DATABASE_URL")
 if database_url:
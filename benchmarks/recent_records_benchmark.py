@@ -0,0 +1,66 @@
+"""
+Recent Records Benchmark
+Compares a full sort on ISO strings with heap-based newest-N selection over parsed timestamps
+
+Usage: python benchmarks/recent_records_benchmark.py [--records 50000] [--limit 5] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.recent import _parse_timestamp, _select, recent
+from services.workable_records import RecordSnapshot
+
+def make_records(count, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    return [
+        {'id': str(i), 'created_at': (start + timedelta(seconds=rng.randrange(5 * 365 * 86400))).strftime('%Y-%m-%dT%H:%M:%SZ')}
+        for i in range(count)
+    ]
+
+def legacy_recent(records, limit):
+    """What dashboard() did: sort the full list on the raw strings and slice"""
+    return sorted(records, key=lambda r: r.get('created_at', ''), reverse=True)[:limit]
+
+def timed(fn, repeat, before=None):
+    best = float('inf')
+    for _ in range(repeat):
+        if before:
+            before()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=50000)
+    parser.add_argument('--limit', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    records = RecordSnapshot(make_records(args.records))
+    expected = [r['id'] for r in legacy_recent(records, args.limit)]
+    assert [r['id'] for r in recent(records, args.limit)] == expected
+
+    results = [
+        ('sorted()[:n] on strings', timed(lambda: legacy_recent(records, args.limit), args.repeat)),
+        ('nlargest (cold parse)', timed(lambda: _select(records, args.limit, 'created_at'), args.repeat,
+                                        _parse_timestamp.cache_clear)),
+        ('nlargest (parsed once)', timed(lambda: _select(records, args.limit, 'created_at'), args.repeat)),
+        ('recent() same snapshot', timed(lambda: recent(records, args.limit), args.repeat)),
+    ]
+    baseline = results[0][1]
+
+    print(f"records: {len(records)}, limit: {args.limit}, best of {args.repeat} runs")
+    for name, seconds in results:
+        print(f"{name:26} {seconds * 1000:9.2f} ms  {baseline / seconds:6.2f}x vs sort")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Record Memory Benchmark
+Compares the memory held by a candidates snapshot of plain formatted dicts with the same
+snapshot normalized into slotted CandidateRecords through the shared RecordNormalizer
+
+Usage: python benchmarks/record_memory_benchmark.py [--candidates 100000] [--repeat 3]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.workable_api import WorkableAPIService
+from services.workable_records import CandidateRecord, ConsultantRow, RecordNormalizer
+
+STAGES = ['sourced', 'applied', 'phone_screen', 'interview', 'offer', 'hired']
+DOMAINS = ['Engineering', 'Data', 'Design', 'Marketing', 'General']
+SKILLS = ['Python', 'Java', 'SQL', 'AWS', 'React', 'Docker', 'Kubernetes', 'Go']
+
+def make_payload(count, seed=42):
+    """Workable-shaped candidates, serialized so decoding gives fresh strings like a real response"""
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    return json.dumps([
+        {
+            'id': f"c{i}",
+            'firstname': f"First{i}",
+            'lastname': f"Last{i}",
+            'email': f"candidate{i}@example.com",
+            'phone': f"+31 6 {i:08d}",
+            'created_at': (start + timedelta(seconds=rng.randrange(5 * 365 * 86400))).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'updated_at': (start + timedelta(seconds=rng.randrange(5 * 365 * 86400))).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'stage': rng.choice(STAGES),
+            'domain': rng.choice(DOMAINS),
+            'experience_level': rng.choice(['junior', 'mid', 'senior']),
+            'skills': rng.sample(SKILLS, 3),
+            'headline': 'Software Engineer',
+            'jobs': [],
+        }
+        for i in range(count)
+    ])
+
+def legacy_row(candidate):
+    """What candidates() and matching() built for every candidate before"""
+    skills = candidate.get('skills', [])
+    if isinstance(skills, str):
+        skills = [skill.strip() for skill in skills.split(',')]
+    return {
+        'id': candidate.get('id', ''),
+        'first_name': candidate.get('first_name', ''),
+        'last_name': candidate.get('last_name', ''),
+        'email': candidate.get('email', ''),
+        'phone': candidate.get('phone', ''),
+        'status': candidate.get('status', 'available'),
+        'hourly_rate': candidate.get('hourly_rate', 0),
+        'skills': skills,
+        'created_at': candidate.get('created_at', ''),
+        'applications': candidate.get('total_applications', 0)
+    }
+
+def measure(build, payload):
+    """Bytes still allocated after building a snapshot from a freshly decoded payload
+
+    ``build`` returns the snapshot plus anything else it keeps alive (the
+    normalizer and its version map), which is counted too.
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    formatted = [WorkableAPIService._format_candidate(None, raw) for raw in json.loads(payload)]
+    kept = build(formatted)
+    # Drop the caller's reference to the formatted dicts: only what the snapshot keeps alive should count
+    del formatted
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return kept, held
+
+def plain_snapshot(formatted):
+    """What the cache held before normalization: the formatted dicts themselves"""
+    return formatted, None
+
+def normalized_snapshot(formatted):
+    """The production path: ``normalize_candidates`` through a RecordNormalizer"""
+    normalizer = RecordNormalizer()
+    return normalizer.normalize_all('candidates', formatted), normalizer
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    payload = make_payload(args.candidates)
+    (dicts, _), dict_bytes = measure(plain_snapshot, payload)
+    (records, normalizer), record_bytes = measure(normalized_snapshot, payload)
+    assert all(isinstance(record, CandidateRecord) for record in records)
+    assert all(dict(record, formatted_date=None) == dict(candidate, formatted_date=None)
+               for record, candidate in zip(records[:100], dicts[:100]))
+
+    print(f"candidates: {args.candidates}")
+    print(f"{'plain dicts':26} {dict_bytes / 2 ** 20:9.1f} MiB  {dict_bytes / args.candidates:7.0f} B/record")
+    print(f"{'normalize_candidates':26} {record_bytes / 2 ** 20:9.1f} MiB  {record_bytes / args.candidates:7.0f} B/record"
+          f"  {dict_bytes / record_bytes:5.2f}x smaller")
+
+    # Per-request churn: the matching page's consultant rows and the detail pages' top-5 matches
+    assert dict(ConsultantRow(records[0])) == legacy_row(dicts[0])
+    rows_copy = timed(lambda: [legacy_row(candidate) for candidate in dicts], args.repeat)
+    rows_view = timed(lambda: [ConsultantRow(record) for record in records], args.repeat)
+    match_copy = timed(lambda: [dict(candidate, match_percentage=80) for candidate in dicts[:5]], args.repeat)
+    match_derived = timed(lambda: [record.with_fields(match_percentage=80) for record in records[:5]], args.repeat)
+    print(f"best of {args.repeat} runs")
+    print(f"{'consultant rows, dicts':26} {rows_copy * 1000:9.2f} ms")
+    print(f"{'consultant rows, views':26} {rows_view * 1000:9.2f} ms")
+    print(f"{'top-5 matches, copy()':26} {match_copy * 1e6:9.1f} us")
+    print(f"{'top-5 matches, overlay':26} {match_derived * 1e6:9.1f} us")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Skill Extraction Benchmark
+Compares the legacy per-skill substring scan with the single-pass skill extractor
+
+Usage: python benchmarks/skill_extraction_benchmark.py [--jobs 2000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.skill_extractor import SKILL_TAXONOMY, SkillExtractor
+
+LEGACY_SKILLS = [
+    'Python', 'JavaScript', 'TypeScript', 'React', 'Angular', 'Vue',
+    'Node.js', 'Java', 'C#', '.NET', 'PHP', 'Ruby', 'Go', 'Rust',
+    'SQL', 'NoSQL', 'MongoDB', 'PostgreSQL', 'MySQL', 'Redis',
+    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins',
+    'DevOps', 'CI/CD', 'Git', 'Agile', 'Scrum', 'Kanban',
+    'REST', 'GraphQL', 'API', 'HTML', 'CSS', 'SASS', 'LESS',
+    'Machine Learning', 'AI', 'Data Science', 'Big Data', 'Hadoop',
+    'Marketing', 'SEO', 'SEM', 'Content Strategy', 'Social Media',
+    'UI/UX', 'Product Management', 'Growth Hacking'
+]
+
+FILLER = (
+    "We are looking for an engaged colleague to join our growing team in a fast paced "
+    "environment. You will collaborate with stakeholders, own delivery end to end and "
+    "help shape how we build products for our clients across Europe."
+).split()
+
+def legacy_extract_skills_from_job(job_details):
+    """The original extract_skills_from_job from staffing_app.py"""
+    if not job_details:
+        return []
+    skills = []
+    requirements_text = job_details.get('requirements', '')
+    if requirements_text:
+        for skill in LEGACY_SKILLS:
+            if skill.lower() in requirements_text.lower():
+                skills.append(skill)
+    if len(skills) < 2 and job_details.get('description'):
+        description_text = job_details.get('description', '')
+        for skill in LEGACY_SKILLS:
+            if skill not in skills and skill.lower() in description_text.lower():
+                skills.append(skill)
+    return skills
+
+def make_jobs(count, seed=42):
+    rng = random.Random(seed)
+    terms = [term for skill, aliases in SKILL_TAXONOMY.items() for term in (skill, *aliases)]
+    jobs = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(60, 250))
+        for _ in range(rng.randint(0, 8)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(terms))
+        requirements = ' '.join(words[:len(words) // 3])
+        jobs.append({'requirements': requirements, 'description': ' '.join(words)})
+    return jobs
+
+SYNONYM_TERMS = [(term.lower(), skill) for skill, aliases in SKILL_TAXONOMY.items() for term in (skill, *aliases)]
+
+def legacy_scan_with_synonyms(job_details, terms=SYNONYM_TERMS):
+    """The legacy linear scan extended to every taxonomy alias, i.e. what synonym support costs without indexing"""
+    skills = []
+    requirements_text = job_details.get('requirements', '')
+    for term, skill in terms:
+        if skill not in skills and term in requirements_text.lower():
+            skills.append(skill)
+    if len(skills) < 2 and job_details.get('description'):
+        description_text = job_details.get('description', '')
+        for term, skill in terms:
+            if skill not in skills and term in description_text.lower():
+                skills.append(skill)
+    return skills
+
+def timed(fn, jobs, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for job in jobs:
+            fn(job)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    started = time.perf_counter()
+    cold = SkillExtractor(cache_size=0)
+    build_ms = (time.perf_counter() - started) * 1000
+    warm = SkillExtractor(cache_size=len(jobs) * 2)
+    for job in jobs:
+        warm.extract_from_job(job)
+
+    results = [
+        ('legacy scan', timed(legacy_extract_skills_from_job, jobs, args.repeat)),
+        ('legacy + synonyms', timed(legacy_scan_with_synonyms, jobs, args.repeat)),
+        ('extractor (cold)', timed(cold.extract_from_job, jobs, args.repeat)),
+        ('extractor (memoized)', timed(warm.extract_from_job, jobs, args.repeat)),
+    ]
+    baseline = results[0][1]
+
+    print(f"jobs: {len(jobs)}, best of {args.repeat} runs, extractor build {build_ms:.2f} ms")
+    for name, seconds in results:
+        print(f"{name:22} {seconds * 1000:9.2f} ms  {seconds / len(jobs) * 1e6:8.1f} us/job  "
+              f"{baseline / seconds:6.2f}x vs legacy")
+
+if __name__ == '__main__':
+    main()
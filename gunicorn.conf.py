@@ -0,0 +1,27 @@
+import os
+
+# Loaded by the gunicorn launches in startup.sh and the deploy workflows (which also pass it with -c).
+# Their command-line flags keep setting bind, workers, timeout and preload; this file adds the
+# shared Workable snapshot.
+
+# One refresher process reads Workable and writes a snapshot file that every worker loads, so
+# upstream calls and skill extraction no longer multiply by the worker count. Each worker still
+# decodes its own copy of the records, so per-worker memory stays the same. The snapshot holds
+# candidate contact details, so it lives in a private directory of the app.
+os.environ.setdefault(
+    "WORKABLE_SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "workable", "snapshot.bin")
+)
+
+def when_ready(server):
+    try:
+        from services.workable_snapshot import start_snapshot_refresher
+    except ImportError as e:
+        server.log.warning(f"Workable snapshot refresher not available, workers fetch on their own: {e}")
+        return
+    server.workable_snapshot_refresher = start_snapshot_refresher()
+
+def on_exit(server):
+    refresher = getattr(server, "workable_snapshot_refresher", None)
+    if refresher is not None and refresher.is_alive():
+        refresher.terminate()
@@ -3,7 +3,7 @@ Database models for the Growth Accelerator Staffing Platform
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Float, UniqueConstraint, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Float, UniqueConstraint, Index, JSON
 from sqlalchemy.orm import relationship
 from flask_login import UserMixin
 
@@ -105,6 +105,11 @@ class Consultant(db.Model):
     applications = relationship("Application", back_populates="consultant")
     placements = relationship("Placement", back_populates="consultant")
     
+    # Workable mirror upserts key on workable_id
+    __table_args__ = (
+        Index('uq_consultants_workable_id', 'workable_id', unique=True),
+    )
+    
     def __repr__(self):
         return f'<Consultant {self.first_name} {self.last_name}>'
 
@@ -122,6 +127,7 @@ class Job(db.Model):
     salary_range = Column(String(100))
     remote = Column(Boolean, default=False)
     workable_id = Column(String(100))
+    shortcode = Column(String(50))  # Workable candidates reference their job by shortcode
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -130,6 +136,12 @@ class Job(db.Model):
     applications = relationship("Application", back_populates="job")
     job_skills = relationship("JobSkill", back_populates="job")
     
+    # Workable mirror upserts key on workable_id
+    __table_args__ = (
+        Index('uq_jobs_workable_id', 'workable_id', unique=True),
+        Index('ix_jobs_shortcode', 'shortcode'),
+    )
+    
     def __repr__(self):
         return f'<Job {self.title}>'
 
@@ -183,6 +195,11 @@ class Application(db.Model):
     consultant = relationship("Consultant", back_populates="applications")
     job = relationship("Job", back_populates="applications")
     
+    # One application per consultant and job, so mirrored stages can be upserted
+    __table_args__ = (
+        Index('uq_applications_consultant_job', 'consultant_id', 'job_id', unique=True),
+    )
+    
     def __repr__(self):
         return f'<Application {self.consultant_id} for job {self.job_id}>'
 
@@ -206,4 +223,38 @@ class Placement(db.Model):
     consultant = relationship("Consultant", back_populates="placements")
     
     def __repr__(self):
-        return f'<Placement {self.consultant_id} for job {self.job_id}>'
\ No newline at end of file
+        return f'<Placement {self.consultant_id} for job {self.job_id}>'
+
+class WorkableSyncState(db.Model):
+    """High-water marks for incremental Workable syncs, one row per resource"""
+    __tablename__ = 'workable_sync_state'
+    
+    resource = Column(String(50), primary_key=True)  # jobs, candidates
+    high_water_mark = Column(DateTime, nullable=True)
+    last_synced_at = Column(DateTime, nullable=True)
+    last_sync_count = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<WorkableSyncState {self.resource}@{self.high_water_mark}>'
+
+class AIMatch(db.Model):
+    """Precomputed candidate/job match scores, mirroring ai_matches in supabase-schema.sql"""
+    __tablename__ = 'ai_matches'
+    
+    id = Column(Integer, primary_key=True)
+    candidate_id = Column(String(100), nullable=False)  # Workable candidate id
+    job_id = Column(String(100), nullable=False)  # Workable job id
+    match_score = Column(Integer)  # 0-100
+    reasoning = Column(JSON)
+    suggested_at = Column(DateTime, default=datetime.utcnow)
+    status = Column(String(50), default='suggested')  # suggested, reviewed, accepted, rejected
+    
+    # Batch re-scoring upserts key on the candidate/job pair
+    __table_args__ = (
+        Index('uq_ai_matches_candidate_job', 'candidate_id', 'job_id', unique=True),
+        Index('idx_ai_matches_job_score', 'job_id', 'match_score'),
+    )
+    
+    def __repr__(self):
+        return f'<AIMatch {self.candidate_id} for job {self.job_id}: {self.match_score}>'
@@ -0,0 +1,337 @@
+"""
+AI Suggestions Service
+Azure OpenAI job-candidate suggestions behind a content-addressed TTL cache
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import logging
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt text changes so cached answers to the old prompt are not reused
+PROMPT_VERSION = 1
+
+SYSTEM_PROMPT = "You are an expert recruitment AI providing job-candidate matching suggestions."
+
+def build_prompt(job_titles: List[str], candidate_names: List[str]) -> str:
+    return f"""As a recruitment AI, create 5 intelligent job-candidate matches.
+
+Available jobs: {', '.join(job_titles)}
+Available candidates: {', '.join(candidate_names)}
+
+Return JSON format:
+{{
+    "suggestions": [
+        {{
+            "candidate_name": "candidate name",
+            "job_title": "job title",
+            "match_score": 90,
+            "reasoning": "specific matching reason"
+        }}
+    ]
+}}"""
+
+def parse_suggestions(content: str) -> Optional[List[Dict]]:
+    """Pull the suggestions list out of a chat completion, tolerating prose around the JSON"""
+    for candidate in (content, content[content.find('{'):content.rfind('}') + 1] if '{' in content else ''):
+        try:
+            data = json.loads(candidate)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(data, dict) and isinstance(data.get('suggestions'), list):
+            return data['suggestions']
+    return None
+
+def _percentile(samples: List[float], percentile: float) -> Optional[float]:
+    """Nearest-rank percentile of ``samples``"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, int(round(percentile / 100 * len(ordered) + 0.5)))
+    return round(ordered[min(rank, len(ordered)) - 1], 1)
+
+class AISuggestionService:
+    """Azure OpenAI chat completions for match suggestions, cached by prompt content
+
+    The cache key is a hash of everything that shapes the answer (job titles,
+    candidate names, deployment, prompt version), so a repeat ping with the
+    same inputs is served from memory until ``ttl`` expires. Concurrent
+    identical requests share one upstream call. Only successful completions
+    are cached.
+
+    ``submit`` is the non-blocking path for request handlers: the completion
+    runs on a small thread pool and the caller gets a task id (the cache key)
+    to poll, plus the last answer for the same inputs if an expired one is
+    still held.
+    """
+
+    def __init__(self):
+        self.endpoint = os.environ.get('AZURE_OPENAI_ENDPOINT')
+        self.api_key = os.environ.get('AZURE_OPENAI_KEY')
+        self.deployment = os.environ.get('AZURE_OPENAI_DEPLOYMENT', 'gpt-4o')
+        self.api_version = os.environ.get('AZURE_OPENAI_API_VERSION', '2024-08-01-preview')
+        self.timeout = float(os.environ.get('AZURE_OPENAI_TIMEOUT', 15))
+        self.ttl = float(os.environ.get('AI_SUGGESTIONS_TTL', 3600))
+        self.max_entries = int(os.environ.get('AI_SUGGESTIONS_MAX_ENTRIES', 256))
+        self.task_ttl = float(os.environ.get('AI_SUGGESTIONS_TASK_TTL', 600))
+        self.workers = int(os.environ.get('AI_SUGGESTIONS_WORKERS', 2))
+
+        self.session = requests.Session()
+        self._single_flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Tuple[float, List[Dict]]]' = OrderedDict()
+        self._tasks: Dict[str, Dict] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._latencies_ms = deque(maxlen=500)
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'upstream_calls': 0,
+            'upstream_errors': 0,
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'total_tokens': 0,
+            'tasks_submitted': 0,
+            'tasks_failed': 0
+        }
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.endpoint and self.api_key)
+
+    def cache_key(self, job_titles: List[str], candidate_names: List[str]) -> str:
+        material = json.dumps({
+            'jobs': list(job_titles),
+            'candidates': list(candidate_names),
+            'deployment': self.deployment,
+            'prompt_version': PROMPT_VERSION
+        }, sort_keys=True)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def get_suggestions(self, job_titles: List[str], candidate_names: List[str]) -> Tuple[Optional[List[Dict]], bool]:
+        """Return ``(suggestions, cache_hit)``; suggestions is None when the AI service is unavailable"""
+        if not self.configured:
+            return None, False
+
+        key = self.cache_key(job_titles, candidate_names)
+        entry = self._fresh_entry(key)
+        if entry:
+            return entry[1], True
+
+        suggestions = self._single_flight.do(key, lambda: self._complete(key, job_titles, candidate_names))
+        return suggestions, False
+
+    def _fresh_entry(self, key: str) -> Optional[Tuple[float, List[Dict]]]:
+        """The cached entry for ``key`` if still within the TTL; counts the hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            self._count('hits')
+            return entry
+        self._count('misses')
+        return None
+
+    # Background generation --------------------------------------------------
+
+    def submit(self, job_titles: List[str], candidate_names: List[str]) -> Dict:
+        """Non-blocking lookup: a cached answer, or a queued completion to poll
+
+        Returns ``{'status': 'done', 'task_id', 'suggestions'}`` on a fresh
+        cache hit, ``{'status': 'pending', 'task_id', 'previous'}`` once a
+        completion is queued (``previous`` is the expired answer for the same
+        inputs, or None), and ``{'status': 'unavailable'}`` without credentials.
+        """
+        if not self.configured:
+            return {'status': 'unavailable'}
+
+        key = self.cache_key(job_titles, candidate_names)
+        entry = self._fresh_entry(key)
+        if entry:
+            return {'status': 'done', 'task_id': key, 'suggestions': entry[1]}
+
+        now = time.time()
+        with self._lock:
+            self._prune_tasks(now)
+            previous = self._entries.get(key)
+            task = self._tasks.get(key)
+            if task is None or task['status'] != 'pending':
+                task = {'status': 'pending', 'submitted_at': now, 'completed_at': None, 'suggestions': None}
+                self._tasks[key] = task
+                self._stats['tasks_submitted'] += 1
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='ai-suggestions')
+                self._executor.submit(self._run_task, key, list(job_titles), list(candidate_names))
+        return {'status': 'pending', 'task_id': key, 'previous': previous[1] if previous else None}
+
+    def _run_task(self, key: str, job_titles: List[str], candidate_names: List[str]):
+        try:
+            suggestions = self._single_flight.do(key, lambda: self._complete(key, job_titles, candidate_names))
+        except Exception as e:
+            logger.error(f"AI suggestion task failed: {str(e)}")
+            suggestions = None
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is None:
+                return
+            task['completed_at'] = time.time()
+            if suggestions is None:
+                task['status'] = 'failed'
+                self._stats['tasks_failed'] += 1
+            else:
+                task['status'] = 'done'
+                task['suggestions'] = suggestions
+
+    def _prune_tasks(self, now: float):
+        """Forget finished tasks older than ``task_ttl``; caller holds the lock"""
+        expired = [key for key, task in self._tasks.items()
+                   if task['status'] != 'pending' and now - task['completed_at'] > self.task_ttl]
+        for key in expired:
+            del self._tasks[key]
+
+    def get_task(self, task_id: str) -> Optional[Dict]:
+        """Status of a submitted completion, or None if unknown or expired"""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                # Task ids are cache keys, so a pruned task still resolves while its answer is cached
+                entry = self._entries.get(task_id)
+                if entry is None:
+                    return None
+                return {'task_id': task_id, 'status': 'done', 'suggestions': entry[1]}
+            return {'task_id': task_id, **task}
+
+    # Upstream ---------------------------------------------------------------
+
+    def _complete(self, key: str, job_titles: List[str], candidate_names: List[str]) -> Optional[List[Dict]]:
+        payload = {
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": build_prompt(job_titles, candidate_names)}
+            ],
+            "max_tokens": 600,
+            "temperature": 0.7
+        }
+        url = (f"{self.endpoint.rstrip('/')}/openai/deployments/{self.deployment}"
+               f"/chat/completions?api-version={self.api_version}")
+
+        self._count('upstream_calls')
+        started = time.monotonic()
+        try:
+            response = self.session.post(
+                url,
+                headers={'api-key': self.api_key, 'Content-Type': 'application/json'},
+                json=payload,
+                timeout=self.timeout
+            )
+        except requests.RequestException as e:
+            self._count('upstream_errors')
+            logger.error(f"Azure OpenAI request failed: {str(e)}")
+            return None
+        finally:
+            with self._lock:
+                self._latencies_ms.append((time.monotonic() - started) * 1000)
+
+        if response.status_code != 200:
+            self._count('upstream_errors')
+            logger.error(f"Azure OpenAI returned {response.status_code}")
+            return None
+
+        try:
+            result = response.json()
+            usage = result.get('usage') or {}
+            for field in ('prompt_tokens', 'completion_tokens', 'total_tokens'):
+                self._count(field, int(usage.get(field) or 0))
+            suggestions = parse_suggestions(result['choices'][0]['message']['content'])
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            self._count('upstream_errors')
+            logger.error(f"Unexpected Azure OpenAI response: {str(e)}")
+            return None
+
+        if suggestions is None:
+            logger.warning("Azure OpenAI response contained no suggestions JSON")
+            return None
+        with self._lock:
+            self._entries[key] = (time.monotonic(), suggestions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return suggestions
+
+    def invalidate(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        return count
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            latencies = list(self._latencies_ms)
+            entries = len(self._entries)
+            pending = sum(1 for task in self._tasks.values() if task['status'] == 'pending')
+        lookups = stats['hits'] + stats['misses']
+        stats.update({
+            'configured': self.configured,
+            'ttl_seconds': self.ttl,
+            'entries': entries,
+            'tasks_pending': pending,
+            'hit_rate': round(stats['hits'] / lookups, 4) if lookups else 0.0,
+            'deduplicated': self._single_flight.get_stats()['shared'],
+            'latency_ms': {
+                'samples': len(latencies),
+                'p50': _percentile(latencies, 50),
+                'p90': _percentile(latencies, 90),
+                'p99': _percentile(latencies, 99)
+            }
+        })
+        return stats
+
+# Global instance
+ai_suggestion_service = AISuggestionService()
+
+def stub_chat_completion(payload: Dict) -> Dict:
+    """Deterministic stand-in for an Azure OpenAI chat completion, built from the prompt's lists"""
+    prompt = next((m.get('content', '') for m in payload.get('messages', []) if m.get('role') == 'user'), '')
+    jobs_line = re.search(r'Available jobs: (.*)', prompt)
+    candidates_line = re.search(r'Available candidates: (.*)', prompt)
+    jobs = [job.strip() for job in jobs_line.group(1).split(',') if job.strip()] if jobs_line else []
+    candidates = [c.strip() for c in candidates_line.group(1).split(',') if c.strip()] if candidates_line else []
+
+    suggestions = [
+        {
+            "candidate_name": candidate,
+            "job_title": jobs[i % len(jobs)] if jobs else "Open Position",
+            "match_score": 90 - i * 3,
+            "reasoning": "Stub suggestion"
+        }
+        for i, candidate in enumerate(candidates[:5])
+    ]
+    content = json.dumps({"suggestions": suggestions})
+    prompt_tokens = sum(len(m.get('content', '').split()) for m in payload.get('messages', []))
+    completion_tokens = len(content.split())
+    return {
+        "id": "stub-completion",
+        "object": "chat.completion",
+        "model": "stub",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
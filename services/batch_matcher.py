@@ -0,0 +1,474 @@
+"""
+Batch Matcher
+Re-scores every candidate against every open job across a process pool and
+stores the best matches in the ai_matches table
+
+Usage: python -m services.batch_matcher [--workers N] [--top-k K] [--min-score S] [--dry-run]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+from typing import Dict, List, Optional
+
+from services.matching_engine import matching_engine, CLOSED_JOB_STATES
+from services.skill_index import skill_mask
+from services.skill_registry import skill_registry
+
+logger = logging.getLogger(__name__)
+
+# Candidate masks shipped to each worker once, instead of with every chunk
+_worker_masks: List[int] = []
+
+def _init_worker(candidate_masks: List[int]):
+    global _worker_masks
+    _worker_masks = candidate_masks
+
+def _score_chunk(start: int, job_weights: List[Dict[int, int]], top_k: int, min_score: int) -> List:
+    """Score one slice of jobs against all candidates (runs in a worker process)"""
+    results, _ = matching_engine.score(job_weights, _worker_masks, top_k, min_score)
+    return [(start + job_index, ranked) for job_index, ranked in results]
+
+class BatchMatcher:
+    """Full jobs x candidates re-scoring with the matching engine's scoring
+
+    Jobs are split into chunks that a ``ProcessPoolExecutor`` scores in
+    parallel (candidate masks are sent to each worker once via the pool
+    initializer), so a run scales with the number of cores. The top
+    ``top_k`` candidates per job are upserted into ``ai_matches``; suggestions
+    from earlier runs that dropped out are removed, while reviewed, accepted or
+    rejected rows are left alone. The matching dashboard reads these rows
+    instead of scoring on every request.
+    """
+
+    def __init__(self):
+        self.workers = int(os.environ.get('BATCH_MATCH_WORKERS', os.cpu_count() or 1))
+        self.top_k = int(os.environ.get('BATCH_MATCH_TOP_K', 50))
+        self.chunk_size = int(os.environ.get('BATCH_MATCH_CHUNK', 32))
+        # 0 disables the background job; set e.g. 86400 for a nightly run
+        self.interval = int(os.environ.get('BATCH_MATCH_INTERVAL', 0))
+        self.max_age = int(os.environ.get('BATCH_MATCH_MAX_AGE', max(2 * self.interval, 86400)))
+        # How long a process serves its copy of ai_matches before re-reading rows other processes wrote
+        self.cache_ttl = float(os.environ.get('BATCH_MATCH_CACHE_TTL', 60))
+
+        self._run_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._cache: Optional[Dict] = None
+        self._cache_loaded_at: Optional[float] = None
+        # Scoring inputs behind the stored matches, kept for incremental updates
+        self._state: Optional[Dict] = None
+        self.last_run: Dict = {}
+        self.batch_thread = None
+        self.running = False
+
+    # Inputs ----------------------------------------------------------------
+
+    def load_inputs(self):
+        """Current jobs and candidates: the cached Workable snapshot, else the sync store"""
+        from services.workable_cache import workable_cache
+        from services.workable_sync import workable_sync
+        jobs = workable_cache.get_jobs() or workable_sync.get_records('jobs')
+        candidates = workable_cache.get_candidates() or workable_sync.get_records('candidates')
+        return jobs, candidates
+
+    # Scoring ---------------------------------------------------------------
+
+    def _score(self, job_weights: List[Dict[int, int]], candidate_masks: List[int],
+               top_k: int, min_score: int, workers: int) -> List:
+        chunks = [
+            (start, job_weights[start:start + self.chunk_size])
+            for start in range(0, len(job_weights), self.chunk_size)
+        ]
+        if workers <= 1 or len(chunks) <= 1:
+            _init_worker(candidate_masks)
+            return [result for start, chunk in chunks for result in _score_chunk(start, chunk, top_k, min_score)]
+
+        # spawn: the background job runs next to request threads, where fork is unsafe
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=context,
+                                 initializer=_init_worker, initargs=(candidate_masks,)) as executor:
+            starts, slices = zip(*chunks)
+            scored = executor.map(_score_chunk, starts, slices, repeat(top_k), repeat(min_score))
+            return [result for chunk_results in scored for result in chunk_results]
+
+    def run(self, jobs: Optional[List[Dict]] = None, candidates: Optional[List[Dict]] = None,
+            top_k: Optional[int] = None, min_score: Optional[int] = None,
+            workers: Optional[int] = None, write: bool = True) -> Dict:
+        """Re-score everything and (unless ``write`` is False) store the results"""
+        with self._run_lock:
+            started = time.monotonic()
+            started_at = datetime.utcnow()
+            if jobs is None or candidates is None:
+                loaded_jobs, loaded_candidates = self.load_inputs()
+                jobs = loaded_jobs if jobs is None else jobs
+                candidates = loaded_candidates if candidates is None else candidates
+            top_k = top_k or self.top_k
+            min_score = matching_engine.min_score if min_score is None else min_score
+            workers = workers or self.workers
+
+            importance = matching_engine.load_importance()
+            open_jobs = [job for job in jobs if str(job.get('status') or '').lower() not in CLOSED_JOB_STATES]
+            job_weights = [matching_engine.job_weights(job, importance) for job in open_jobs]
+            candidate_masks = [skill_mask(candidate.get('skills')) for candidate in candidates]
+
+            results = self._score(job_weights, candidate_masks, top_k, min_score, workers)
+            scored_at = time.monotonic()
+            self._state = self._build_state(open_jobs, job_weights, candidates, candidate_masks)
+            self._state.update(top_k=top_k, min_score=min_score)
+
+            rows = []
+            for job_index, ranked in results:
+                job = open_jobs[job_index]
+                job_mask = skill_registry.mask_of_ids(job_weights[job_index])
+                for candidate_index, score in ranked:
+                    candidate = candidates[candidate_index]
+                    if job.get('id') is None or candidate.get('id') is None:
+                        continue
+                    rows.append({
+                        'candidate_id': str(candidate['id']),
+                        'job_id': str(job['id']),
+                        'match_score': score,
+                        'reasoning': {
+                            'matched_skills': skill_registry.names(job_mask & candidate_masks[candidate_index]),
+                            'source': 'batch'
+                        },
+                        'suggested_at': started_at,
+                        'status': 'suggested'
+                    })
+
+            written, removed = self._write(rows, started_at) if write else (0, 0)
+
+            self.last_run = {
+                'jobs': len(open_jobs),
+                'candidates': len(candidates),
+                'pairs_scored': len(open_jobs) * len(candidates),
+                'matches': len(rows),
+                'written': written,
+                'removed': removed,
+                'workers': workers,
+                'score_seconds': round(scored_at - started, 2),
+                'duration_seconds': round(time.monotonic() - started, 2),
+                'finished_at': datetime.now().isoformat()
+            }
+            logger.info(f"Batch matching scored {self.last_run['pairs_scored']} pairs with {workers} workers "
+                        f"in {self.last_run['score_seconds']}s, kept {len(rows)} matches")
+            return self.last_run
+
+    # Storage ---------------------------------------------------------------
+
+    def _write(self, rows: List[Dict], started_at: datetime):
+        """Upsert this run's matches and drop untouched suggestions from earlier runs"""
+        from app import app, db
+        if 'sqlalchemy' not in app.extensions:
+            logger.warning("No database configured, batch match results not stored")
+            return 0, 0
+        from models import AIMatch
+        from services.workable_mirror import workable_mirror
+
+        with app.app_context():
+            try:
+                AIMatch.__table__.create(bind=db.engine, checkfirst=True)
+                written = workable_mirror.upsert_rows(
+                    AIMatch.__table__, rows, ['candidate_id', 'job_id'],
+                    ['match_score', 'reasoning', 'suggested_at']
+                )
+                removed = (AIMatch.query
+                           .filter(AIMatch.status == 'suggested', AIMatch.suggested_at < started_at)
+                           .delete(synchronize_session=False))
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Failed to store batch match results: {str(e)}")
+                return 0, 0
+        with self._cache_lock:
+            self._cache_loaded_at = None
+        return written, removed
+
+    def _load_matches(self) -> Optional[Dict]:
+        """job_id -> [(candidate_id, score, matched_skills)] from ai_matches, cached for ``cache_ttl``"""
+        with self._cache_lock:
+            if self._cache_loaded_at and time.monotonic() - self._cache_loaded_at < self.cache_ttl:
+                return self._cache
+        matches = None
+        try:
+            from app import app
+            if 'sqlalchemy' in app.extensions:
+                from models import AIMatch
+                with app.app_context():
+                    newest = AIMatch.query.with_entities(AIMatch.suggested_at).order_by(AIMatch.suggested_at.desc()).first()
+                    if newest and (datetime.utcnow() - newest[0]).total_seconds() < self.max_age:
+                        matches = {'computed_at': newest[0], 'jobs': {}}
+                        rows = (AIMatch.query
+                                .filter(AIMatch.status != 'rejected')
+                                .order_by(AIMatch.job_id, AIMatch.match_score.desc(), AIMatch.id)
+                                .all())
+                        for row in rows:
+                            skills = (row.reasoning or {}).get('matched_skills', [])
+                            matches['jobs'].setdefault(row.job_id, []).append((row.candidate_id, row.match_score, skills))
+        except Exception as e:
+            logger.error(f"Could not load precomputed matches: {str(e)}")
+        with self._cache_lock:
+            self._cache = matches
+            self._cache_loaded_at = time.monotonic()
+        return matches
+
+    def precomputed(self, jobs: List[Dict], candidates: List[Dict], top_k: Optional[int] = None,
+                    min_score: Optional[int] = None) -> Optional[Dict]:
+        """Stored matches in ``matching_engine.match`` shape, or None when there is no recent batch run"""
+        stored = self._load_matches()
+        if not stored:
+            return None
+        top_k = top_k or matching_engine.top_k
+        min_score = matching_engine.min_score if min_score is None else min_score
+        candidates_by_id = {str(candidate.get('id')): candidate for candidate in candidates}
+
+        matches = []
+        best_scores = {}
+        open_jobs = [job for job in jobs if str(job.get('status') or '').lower() not in CLOSED_JOB_STATES]
+        for job in open_jobs:
+            ranked = [
+                (candidates_by_id[candidate_id], score, skills)
+                for candidate_id, score, skills in stored['jobs'].get(str(job.get('id')), [])
+                if candidate_id in candidates_by_id and score >= min_score
+            ][:top_k]
+            best_scores[job.get('id')] = ranked[0][1] if ranked else 0
+            matches.extend((job, candidate, score, skills) for candidate, score, skills in ranked)
+        matches.sort(key=lambda match: match[2], reverse=True)
+        return {
+            'matches': matches,
+            'best_scores': best_scores,
+            'engine': 'batch',
+            'jobs': len(open_jobs),
+            'candidates': len(candidates),
+            'complete': True,
+            'computed_at': stored['computed_at'].isoformat()
+        }
+
+    # Incremental maintenance -----------------------------------------------
+
+    @staticmethod
+    def _build_state(open_jobs: List[Dict], job_weights: List[Dict[int, int]],
+                     candidates: List[Dict], candidate_masks: List[int]) -> Dict:
+        return {
+            'weights': {str(job['id']): weights for job, weights in zip(open_jobs, job_weights) if job.get('id') is not None},
+            'masks': {
+                str(candidate['id']): mask
+                for candidate, mask in zip(candidates, candidate_masks) if candidate.get('id') is not None
+            }
+        }
+
+    def _ensure_state(self) -> Dict:
+        """Scoring inputs for incremental updates, rebuilt from the current snapshot after a restart"""
+        if self._state is None:
+            jobs, candidates = self.load_inputs()
+            importance = matching_engine.load_importance()
+            open_jobs = [job for job in jobs if str(job.get('status') or '').lower() not in CLOSED_JOB_STATES]
+            self._state = self._build_state(
+                open_jobs, [matching_engine.job_weights(job, importance) for job in open_jobs],
+                candidates, [skill_mask(candidate.get('skills')) for candidate in candidates]
+            )
+            self._state.update(top_k=self.top_k, min_score=matching_engine.min_score)
+        return self._state
+
+    def _rank_job(self, weights: Dict[int, int], masks: Dict[str, int], top_k: int, min_score: int) -> List:
+        """Recompute one job's column: its top-k over all candidates"""
+        candidate_ids = list(masks)
+        mask_list = list(masks.values())
+        results, _ = matching_engine.score([weights], mask_list, top_k, min_score)
+        job_mask = skill_registry.mask_of_ids(weights)
+        return [
+            (candidate_ids[index], score, skill_registry.names(job_mask & mask_list[index]))
+            for index, score in (results[0][1] if results else [])
+        ]
+
+    def apply_changes(self, resource: str, records: List[Dict]) -> Dict:
+        """Fold changed jobs or candidates into the stored top-k lists
+
+        A changed candidate is scored against every open job (one row of the
+        matrix) and merged into each job's list; only jobs where it dropped out
+        of a full list need that job's column recomputed. A changed job has its
+        column recomputed, and a closed job loses its matches. Does nothing until
+        a batch run has stored matches.
+
+        The process running the sync sees the new lists at once; other workers
+        read them from ``ai_matches`` when their cache expires, so a Workable
+        change reaches every /matching page within one sync interval plus
+        ``cache_ttl``. The cached mapping is never mutated: readers keep the
+        one they loaded and a new one is swapped in at the end.
+        """
+        stored = self._load_matches()
+        if not stored or not records:
+            return {'resource': resource, 'jobs_updated': 0}
+        started = time.monotonic()
+
+        with self._run_lock:
+            state = self._ensure_state()
+            top_k, min_score = state['top_k'], state['min_score']
+            lists = dict(stored['jobs'])
+            touched = set()
+
+            if resource == 'jobs':
+                importance = matching_engine.load_importance()
+                for job in records:
+                    if job.get('id') is None:
+                        continue
+                    job_id = str(job['id'])
+                    touched.add(job_id)
+                    if str(job.get('status') or '').lower() in CLOSED_JOB_STATES:
+                        state['weights'].pop(job_id, None)
+                        lists[job_id] = []
+                        continue
+                    weights = matching_engine.job_weights(job, importance)
+                    state['weights'][job_id] = weights
+                    lists[job_id] = self._rank_job(weights, state['masks'], top_k, min_score)
+            else:
+                job_ids = list(state['weights'])
+                job_weights = list(state['weights'].values())
+                for candidate in records:
+                    if candidate.get('id') is None:
+                        continue
+                    candidate_id = str(candidate['id'])
+                    mask = skill_mask(candidate.get('skills'))
+                    state['masks'][candidate_id] = mask
+                    # One row: this candidate against every open job
+                    results, _ = matching_engine.score(job_weights, [mask], 1, 0)
+                    scores = {job_ids[job_index]: ranked[0][1] for job_index, ranked in results if ranked}
+                    for job_id, weights in zip(job_ids, job_weights):
+                        current = lists.get(job_id, [])
+                        previous = next((entry for entry in current if entry[0] == candidate_id), None)
+                        score = scores.get(job_id, 0)
+                        if previous is None and (score < min_score or (len(current) >= top_k and score <= current[-1][1])):
+                            continue
+                        touched.add(job_id)
+                        if previous is not None and len(current) >= top_k and score < previous[1]:
+                            # Someone outside the list may now outrank this candidate
+                            lists[job_id] = self._rank_job(weights, state['masks'], top_k, min_score)
+                            continue
+                        updated = [entry for entry in current if entry[0] != candidate_id]
+                        if score >= min_score:
+                            job_mask = skill_registry.mask_of_ids(weights)
+                            entry = (candidate_id, score, skill_registry.names(job_mask & mask))
+                            position = next((i for i, other in enumerate(updated) if other[1] < score), len(updated))
+                            updated.insert(position, entry)
+                        lists[job_id] = updated[:top_k]
+
+            stored_rows = self._replace_job_matches({job_id: lists[job_id] for job_id in touched})
+            with self._cache_lock:
+                if self._cache is stored:
+                    self._cache = dict(stored, jobs=lists)
+
+        result = {
+            'resource': resource,
+            'records': len(records),
+            'jobs_updated': len(touched),
+            'rows_written': stored_rows,
+            'duration_ms': round((time.monotonic() - started) * 1000, 1)
+        }
+        logger.info(f"Incremental match update for {len(records)} {resource}: {len(touched)} jobs touched")
+        return result
+
+    def _replace_job_matches(self, job_lists: Dict[str, List]) -> int:
+        """Store the new top-k lists for a few jobs, dropping suggestions that fell out"""
+        if not job_lists:
+            return 0
+        from app import app, db
+        if 'sqlalchemy' not in app.extensions:
+            return 0
+        from models import AIMatch
+        from services.workable_mirror import workable_mirror
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                'candidate_id': candidate_id,
+                'job_id': job_id,
+                'match_score': score,
+                'reasoning': {'matched_skills': skills, 'source': 'incremental'},
+                'suggested_at': now,
+                'status': 'suggested'
+            }
+            for job_id, ranked in job_lists.items()
+            for candidate_id, score, skills in ranked
+        ]
+        with app.app_context():
+            try:
+                written = workable_mirror.upsert_rows(
+                    AIMatch.__table__, rows, ['candidate_id', 'job_id'],
+                    ['match_score', 'reasoning', 'suggested_at']
+                )
+                (AIMatch.query
+                 .filter(AIMatch.job_id.in_(list(job_lists)), AIMatch.status == 'suggested',
+                         AIMatch.suggested_at < now)
+                 .delete(synchronize_session=False))
+                db.session.commit()
+                return written
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Failed to store incremental match updates: {str(e)}")
+                return 0
+
+    # Background job --------------------------------------------------------
+
+    def _batch_loop(self):
+        while self.running:
+            try:
+                self.run()
+            except Exception as e:
+                logger.error(f"Batch matching error: {str(e)}")
+            time.sleep(self.interval)
+
+    def start_background_batch(self):
+        """Re-score every ``interval`` seconds in a daemon thread; off unless BATCH_MATCH_INTERVAL is set"""
+        if self.interval <= 0:
+            return None
+        if self.batch_thread and self.batch_thread.is_alive():
+            logger.warning("Batch matching already running")
+            return self.batch_thread
+        self.running = True
+        self.batch_thread = threading.Thread(target=self._batch_loop, daemon=True)
+        self.batch_thread.start()
+        logger.info(f"Batch matching started (every {self.interval}s, {self.workers} workers)")
+        return self.batch_thread
+
+    def stop_background_batch(self):
+        self.running = False
+
+    def get_status(self) -> Dict:
+        return {
+            'running': bool(self.batch_thread and self.batch_thread.is_alive()),
+            'interval_seconds': self.interval,
+            'workers': self.workers,
+            'top_k': self.top_k,
+            'last_run': self.last_run
+        }
+
+# Global instance
+batch_matcher = BatchMatcher()
+
+def start_batch_matcher():
+    """Start the periodic full re-scoring when BATCH_MATCH_INTERVAL is configured"""
+    return batch_matcher.start_background_batch()
+
+def main():
+    """CLI entry point for a one-off full re-scoring"""
+    parser = argparse.ArgumentParser(description="Re-score every candidate against every open job")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--top-k', type=int, default=None, help="matches kept per job")
+    parser.add_argument('--min-score', type=int, default=None, help="minimum match percentage")
+    parser.add_argument('--dry-run', action='store_true', help="score without writing ai_matches")
+    args = parser.parse_args()
+
+    result = batch_matcher.run(top_k=args.top_k, min_score=args.min_score,
+                               workers=args.workers, write=not args.dry_run)
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
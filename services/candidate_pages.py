@@ -0,0 +1,101 @@
+"""
+Candidate Pages
+Newest-first keyset pagination and status counts over the cached candidates snapshot
+"""
+import base64
+import bisect
+import json
+import os
+import time
+import threading
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from services.recent import record_timestamp
+
+logger = logging.getLogger(__name__)
+
+def encode_cursor(key: Tuple[float, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Optional[Tuple[float, str]]:
+    """Position encoded by ``encode_cursor``, or None if the cursor is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        negated_timestamp, candidate_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return float(negated_timestamp), str(candidate_id)
+    except (ValueError, TypeError, UnicodeError):
+        return None
+
+class CandidatePager:
+    """Pages of the candidates snapshot ordered newest first, by ``(created_at, id)``
+
+    The order is built once per snapshot (the cache hands out the same list
+    until it refreshes) as a sorted array of ``(-timestamp, id)`` keys, along
+    with the per-status counts. A page is then a slice of that array: by
+    number, or after/before a keyset cursor located by bisection, which stays
+    on the right rows when candidates are added between requests. Either way
+    a page costs the same at any depth.
+    """
+
+    def __init__(self):
+        self.per_page = int(os.environ.get('CANDIDATES_PER_PAGE', 25))
+
+        self._lock = threading.Lock()
+        self._source = None
+        self._keys: List[Tuple[float, str]] = []
+        self._records: List[Dict] = []
+        self._counts: Dict[str, int] = {'new': 0, 'active': 0, 'all': 0}
+        self.stats = {'builds': 0, 'last_build_ms': 0.0, 'pages': 0}
+
+    def _index(self, candidates: List[Dict]):
+        """Sort keys and status counts for a snapshot; caller holds the lock"""
+        if self._source is candidates:
+            return
+        started = time.monotonic()
+        entries = sorted(
+            ((-record_timestamp(candidate), str(candidate.get('id', '')), position)
+             for position, candidate in enumerate(candidates)),
+        )
+        self._keys = [(negated_timestamp, candidate_id) for negated_timestamp, candidate_id, _ in entries]
+        self._records = [candidates[position] for _, _, position in entries]
+        new = sum(1 for candidate in candidates if candidate.get('status', 'available') == 'new')
+        self._counts = {'new': new, 'active': len(candidates) - new, 'all': len(candidates)}
+        self._source = candidates
+        self.stats['builds'] += 1
+        self.stats['last_build_ms'] = round((time.monotonic() - started) * 1000, 1)
+
+    def page(self, candidates: List[Dict], page: int = 1, after: Optional[str] = None,
+             before: Optional[str] = None) -> Dict:
+        """One page of ``candidates``: after or before a cursor when given, else by page number"""
+        with self._lock:
+            self._index(candidates)
+            keys, records, total = self._keys, self._records, len(self._keys)
+            counts = dict(self._counts)
+            self.stats['pages'] += 1
+
+        position = decode_cursor(after) if after else None
+        previous = decode_cursor(before) if before and position is None else None
+        if position is not None:
+            start = bisect.bisect_right(keys, position)
+        elif previous is not None:
+            start = max(0, bisect.bisect_left(keys, previous) - self.per_page)
+        else:
+            start = (max(page, 1) - 1) * self.per_page
+        end = min(start + self.per_page, total)
+        return {
+            'records': records[start:end],
+            'page': start // self.per_page + 1,
+            'start': start,
+            'total': total,
+            'counts': counts,
+            'next_cursor': encode_cursor(keys[end - 1]) if end < total and end > start else None,
+            'prev_cursor': encode_cursor(keys[start]) if 0 < start < total else None
+        }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {'candidates': len(self._keys), **self.stats}
+
+# Global instance
+candidate_pager = CandidatePager()
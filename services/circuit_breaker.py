@@ -0,0 +1,123 @@
+"""
+Circuit Breaker
+Stops calling an unhealthy upstream for a while instead of waiting out its timeouts
+"""
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+class CircuitBreaker:
+    """Classic closed / open / half-open breaker
+
+    ``failure_threshold`` consecutive failures open the circuit. While open,
+    calls are rejected immediately. After ``recovery_timeout`` seconds up to
+    ``half_open_max_calls`` trial calls are let through. A success closes the
+    circuit again, and a failure re-opens it. Calls whose outcome says nothing
+    about the upstream's health (e.g. a 4xx) are recorded as ignored.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._half_open_calls = 0
+        self._last_transition_at: Optional[datetime] = None
+        self._transitions: Dict[str, int] = {}
+        self._stats = {'successes': 0, 'failures': 0, 'ignored': 0, 'rejected': 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def _transition(self, new_state: str):
+        """Move to ``new_state``; caller must hold the lock"""
+        key = f"{self._state}->{new_state}"
+        self._transitions[key] = self._transitions.get(key, 0) + 1
+        self._last_transition_at = datetime.now()
+        logger.warning(f"Circuit '{self.name}' {key}")
+        self._state = new_state
+        if new_state == self.OPEN:
+            self._opened_at = time.monotonic()
+        elif new_state == self.HALF_OPEN:
+            self._half_open_calls = 0
+        else:
+            self._consecutive_failures = 0
+
+    def allow_request(self) -> bool:
+        """Whether a call may proceed right now"""
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    self._stats['rejected'] += 1
+                    return False
+                self._transition(self.HALF_OPEN)
+            if self._state == self.HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    self._stats['rejected'] += 1
+                    return False
+                self._half_open_calls += 1
+            return True
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may proceed"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+
+    def record_success(self):
+        with self._lock:
+            self._stats['successes'] += 1
+            self._consecutive_failures = 0
+            if self._state == self.HALF_OPEN:
+                self._transition(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._stats['failures'] += 1
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN:
+                self._transition(self.OPEN)
+            elif self._state == self.CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._transition(self.OPEN)
+
+    def record_ignored(self):
+        """Neither a success nor a failure; frees the trial slot when half-open"""
+        with self._lock:
+            self._stats['ignored'] += 1
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            retry_in = None
+            if self._state == self.OPEN:
+                retry_in = max(0.0, round(self.recovery_timeout - (time.monotonic() - self._opened_at), 1))
+            return {
+                'name': self.name,
+                'state': self._state,
+                'consecutive_failures': self._consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'recovery_timeout_seconds': self.recovery_timeout,
+                'retry_in_seconds': retry_in,
+                'last_transition_at': self._last_transition_at.isoformat() if self._last_transition_at else None,
+                'transitions': dict(self._transitions),
+                **self._stats
+            }
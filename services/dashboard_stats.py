@@ -0,0 +1,192 @@
+"""
+Dashboard Stats
+Dashboard aggregates and recent-record lists maintained as jobs and candidates change
+"""
+import heapq
+import itertools
+import os
+import time
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from services.recent import record_timestamp
+
+logger = logging.getLogger(__name__)
+
+OPEN_JOB_STATES = frozenset({'open', 'published'})
+
+class _Recent:
+    """The ``limit`` newest records by ``created_at``, kept as (timestamp, -sequence, id) keys"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.keys: List[Tuple[float, int, str]] = []
+
+    def update(self, key: Tuple[float, int, str], total: int) -> bool:
+        """Place a changed record; returns False when the list must be rebuilt from all ``total`` records"""
+        previous = next((existing for existing in self.keys if existing[2] == key[2]), None)
+        if previous is not None:
+            self.keys.remove(previous)
+            if key < previous and total > self.limit:
+                # It moved back, so a record outside the list may now outrank it
+                return False
+        if len(self.keys) < self.limit or key > self.keys[-1]:
+            self.keys.append(key)
+            self.keys.sort(reverse=True)
+            del self.keys[self.limit:]
+        return True
+
+    def remove(self, entity_id: str, total: int) -> bool:
+        """Drop a removed record; returns False when a record outside the list must take its place"""
+        before = len(self.keys)
+        self.keys = [existing for existing in self.keys if existing[2] != entity_id]
+        return len(self.keys) == before or total < self.limit
+
+    def rebuild(self, records: Dict[str, Tuple]):
+        self.keys = heapq.nlargest(self.limit, (entry[0] for entry in records.values()))
+
+class DashboardStats:
+    """Materialized ``/dashboard`` numbers: counts, application total, open jobs and newest records
+
+    Each job's contribution (its application count and whether it is open) is
+    remembered, so an upsert or removal adjusts the totals by the difference
+    instead of re-summing every job. The five newest jobs and candidates are
+    kept as sorted keys and only rebuilt when a listed record moves back or
+    disappears. ``sync`` reconciles with the cached Workable snapshots by
+    record identity, so handing it the same lists again is free;
+    ``apply_changes`` takes records straight from the incremental sync.
+    """
+
+    def __init__(self):
+        self.recent_limit = int(os.environ.get('DASHBOARD_RECENT_LIMIT', 5))
+
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        # id -> (recent key, record, applications, is_open)
+        self._jobs: Dict[str, Tuple] = {}
+        # id -> (recent key, record)
+        self._candidates: Dict[str, Tuple] = {}
+        self._recent = {'jobs': _Recent(self.recent_limit), 'candidates': _Recent(self.recent_limit)}
+        self._sources = {'jobs': None, 'candidates': None}
+        self.applications_count = 0
+        self.open_jobs = 0
+
+        self.updated_at: Optional[float] = None
+        self.stats = {'updates': 0, 'rebuilds': 0, 'last_update_ms': 0.0, 'total_update_ms': 0.0}
+
+    # Maintenance -----------------------------------------------------------
+
+    def _recent_key(self, records: Dict[str, Tuple], entity_id: str, record: Dict) -> Tuple[float, int, str]:
+        previous = records.get(entity_id)
+        # Keep the first-seen sequence so ties on created_at stay in snapshot order
+        sequence = previous[0][1] if previous else -next(self._sequence)
+        return (record_timestamp(record), sequence, entity_id)
+
+    def _upsert(self, resource: str, record: Dict):
+        entity_id = str(record['id'])
+        records = self._jobs if resource == 'jobs' else self._candidates
+        key = self._recent_key(records, entity_id, record)
+        if resource == 'jobs':
+            applications = record.get('applications') or 0
+            is_open = record.get('status') in OPEN_JOB_STATES
+            previous = records.get(entity_id)
+            if previous:
+                self.applications_count -= previous[2]
+                self.open_jobs -= previous[3]
+            self.applications_count += applications
+            self.open_jobs += is_open
+            records[entity_id] = (key, record, applications, is_open)
+        else:
+            records[entity_id] = (key, record)
+        if not self._recent[resource].update(key, len(records)):
+            self._recent[resource].rebuild(records)
+            self.stats['rebuilds'] += 1
+
+    def _remove(self, resource: str, entity_id: str):
+        records = self._jobs if resource == 'jobs' else self._candidates
+        previous = records.pop(entity_id, None)
+        if previous is None:
+            return
+        if resource == 'jobs':
+            self.applications_count -= previous[2]
+            self.open_jobs -= previous[3]
+        if not self._recent[resource].remove(entity_id, len(records)):
+            self._recent[resource].rebuild(records)
+            self.stats['rebuilds'] += 1
+
+    def _timed(self, update):
+        started = time.monotonic()
+        update()
+        elapsed = (time.monotonic() - started) * 1000
+        self.updated_at = time.time()
+        self.stats['updates'] += 1
+        self.stats['last_update_ms'] = round(elapsed, 3)
+        self.stats['total_update_ms'] = round(self.stats['total_update_ms'] + elapsed, 3)
+
+    def _sync_resource(self, resource: str, snapshot: List[Dict]):
+        records = self._jobs if resource == 'jobs' else self._candidates
+        seen = set()
+        for record in snapshot:
+            if record.get('id') is None:
+                continue
+            entity_id = str(record['id'])
+            seen.add(entity_id)
+            current = records.get(entity_id)
+            if current is None or current[1] is not record:
+                self._upsert(resource, record)
+        for entity_id in [entity_id for entity_id in records if entity_id not in seen]:
+            self._remove(resource, entity_id)
+        self._sources[resource] = snapshot
+
+    def sync(self, jobs: Optional[List[Dict]], candidates: Optional[List[Dict]]):
+        """Reconcile with full jobs and candidates snapshots; a no-op for lists already seen"""
+        with self._lock:
+            # A None snapshot (fetch failed or timed out) leaves that resource as it was
+            stale = [(resource, snapshot) for resource, snapshot in (('jobs', jobs), ('candidates', candidates))
+                     if snapshot is not None and self._sources[resource] is not snapshot]
+            if not stale:
+                return
+            self._timed(lambda: [self._sync_resource(resource, snapshot) for resource, snapshot in stale])
+
+    def apply_changes(self, resource: str, records: List[Dict]):
+        """Fold records from the incremental sync into the aggregates"""
+        if resource not in self._recent or not records:
+            return
+        with self._lock:
+            def update():
+                for record in records:
+                    if record.get('id') is not None:
+                        self._upsert(resource, record)
+            self._timed(update)
+
+    # Reads -----------------------------------------------------------------
+
+    def snapshot(self) -> Dict:
+        """Current aggregates and newest records, without touching the underlying lists"""
+        with self._lock:
+            return {
+                'stats': {
+                    'jobs_count': len(self._jobs),
+                    'candidates_count': len(self._candidates),
+                    'applications_count': self.applications_count,
+                    'open_jobs': self.open_jobs,
+                    'active_candidates': len(self._candidates)
+                },
+                'recent_jobs': [self._jobs[key[2]][1] for key in self._recent['jobs'].keys],
+                'recent_candidates': [self._candidates[key[2]][1] for key in self._recent['candidates'].keys]
+            }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'jobs': len(self._jobs),
+                'candidates': len(self._candidates),
+                'updated_at': datetime.fromtimestamp(self.updated_at).isoformat() if self.updated_at else None,
+                'age_seconds': round(time.time() - self.updated_at, 1) if self.updated_at else None,
+                **self.stats
+            }
+
+# Global instance
+dashboard_stats = DashboardStats()
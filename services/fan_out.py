@@ -0,0 +1,99 @@
+"""
+Fan-Out
+Runs a request's independent upstream fetches concurrently under one deadline
+"""
+import contextvars
+import os
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class FanOut:
+    """Shared bounded thread pool for the independent fetches of one request
+
+    Each call runs in a copy of the caller's context, so Flask's request and
+    ``g`` (and with it the per-request memo) are visible to it. ``run``
+    waits for all calls up to the deadline; a call that fails or is still
+    running by then yields its default instead, and a slow one finishes in
+    the background without holding the request.
+    """
+
+    def __init__(self):
+        self.max_workers = int(os.environ.get('FAN_OUT_WORKERS', 8))
+        self.deadline = float(os.environ.get('FAN_OUT_DEADLINE', 10))
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.stats = {'runs': 0, 'calls': 0, 'errors': 0, 'timeouts': 0, 'wall_ms': 0.0, 'serial_ms': 0.0}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fan-out')
+            return self._executor
+
+    @staticmethod
+    def _timed(fn: Callable[[], Any]):
+        started = time.monotonic()
+        result = fn()
+        return result, (time.monotonic() - started) * 1000
+
+    def run(self, calls: Dict[str, Callable[[], Any]], deadline: Optional[float] = None,
+            defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run ``calls`` concurrently; returns name -> result, or the name's default on error or timeout"""
+        defaults = defaults or {}
+        deadline = self.deadline if deadline is None else deadline
+        executor = self._get_executor()
+        started = time.monotonic()
+        futures = {
+            name: executor.submit(contextvars.copy_context().run, self._timed, fn)
+            for name, fn in calls.items()
+        }
+        wait(futures.values(), timeout=deadline)
+
+        results = {}
+        errors = timeouts = 0
+        serial_ms = 0.0
+        for name, future in futures.items():
+            if not future.done():
+                future.cancel()
+                timeouts += 1
+                logger.warning(f"Fan-out call {name} missed the {deadline}s deadline")
+                results[name] = defaults.get(name)
+                continue
+            try:
+                results[name], elapsed = future.result()
+                serial_ms += elapsed
+            except Exception as e:
+                errors += 1
+                logger.error(f"Fan-out call {name} failed: {str(e)}")
+                results[name] = defaults.get(name)
+
+        with self._lock:
+            self.stats['runs'] += 1
+            self.stats['calls'] += len(calls)
+            self.stats['errors'] += errors
+            self.stats['timeouts'] += timeouts
+            self.stats['wall_ms'] += (time.monotonic() - started) * 1000
+            self.stats['serial_ms'] += serial_ms
+        return results
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+        # Time the same calls would have taken back to back, minus what the fan-outs actually took
+        stats['saved_ms'] = round(max(0.0, stats['serial_ms'] - stats['wall_ms']), 1)
+        stats['wall_ms'] = round(stats['wall_ms'], 1)
+        stats['serial_ms'] = round(stats['serial_ms'], 1)
+        return stats
+
+# Global instance
+fan_out = FanOut()
+
+def fetch_concurrently(calls: Dict[str, Callable[[], Any]], deadline: Optional[float] = None,
+                       defaults: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return fan_out.run(calls, deadline, defaults)
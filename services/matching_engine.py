@@ -0,0 +1,260 @@
+"""
+Matching Engine
+Scores every job against every candidate as one weighted skill-matrix product
+"""
+import heapq
+import os
+import time
+import threading
+import logging
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional, pure Python fallback below
+    np = None
+
+from services.skill_extractor import skill_extractor
+from services.skill_index import skill_mask
+from services.skill_registry import skill_registry
+
+logger = logging.getLogger(__name__)
+
+CLOSED_JOB_STATES = frozenset({'closed', 'archived'})
+
+class MatchingEngine:
+    """Weighted skill-coverage scoring for jobs x candidates
+
+    Each job becomes a row of skill weights (``JobSkill.importance`` when the
+    job is mirrored in the database, 1 for skills only found in its text) and
+    each candidate a 0/1 row over the same skill vocabulary. A candidate's
+    score for a job is the weight of the job's skills they have divided by the
+    job's total weight, so with all weights at 1 it is the old
+    "shared skills / job skills" percentage. Scores for a block of jobs are one
+    matrix product; per-job top-k comes from ``argpartition``.
+    """
+
+    def __init__(self):
+        self.top_k = int(os.environ.get('MATCHING_TOP_K', 10))
+        self.min_score = int(os.environ.get('MATCHING_MIN_SCORE', 50))
+        self.budget_ms = float(os.environ.get('MATCHING_BUDGET_MS', 500))
+        self.block_size = int(os.environ.get('MATCHING_JOB_BLOCK', 64))
+        self.importance_ttl = float(os.environ.get('MATCHING_IMPORTANCE_TTL', 300))
+
+        self._lock = threading.Lock()
+        self._importance: Dict[str, Dict[str, int]] = {}
+        self._importance_loaded_at: Optional[float] = None
+        # Encoded candidates for the last snapshot list seen (cached lists are reused across requests)
+        self._encoded_source = None
+        self._encoded_masks: List[int] = []
+        self._encoded_matrix = None
+        self.last_run: Dict = {}
+
+    # Inputs ----------------------------------------------------------------
+
+    def load_importance(self) -> Dict[str, Dict[str, int]]:
+        """workable_id -> {skill: importance} from JobSkill, cached for ``importance_ttl``"""
+        with self._lock:
+            if self._importance_loaded_at and time.monotonic() - self._importance_loaded_at < self.importance_ttl:
+                return self._importance
+        importance: Dict[str, Dict[str, int]] = {}
+        try:
+            from app import app, db
+            if 'sqlalchemy' in app.extensions:
+                from models import Job, JobSkill, Skill
+                with app.app_context():
+                    if not skill_registry.loaded:
+                        skill_registry.load()
+                    rows = (db.session.query(Job.workable_id, Skill.name, JobSkill.importance)
+                            .join(JobSkill, JobSkill.job_id == Job.id)
+                            .join(Skill, Skill.id == JobSkill.skill_id)
+                            .filter(Job.workable_id.isnot(None))
+                            .all())
+                for workable_id, skill, weight in rows:
+                    importance.setdefault(str(workable_id), {})[skill_extractor.canonicalize(skill)] = max(1, weight or 1)
+        except Exception as e:
+            logger.error(f"Could not load job skill importance: {str(e)}")
+        with self._lock:
+            self._importance = importance
+            self._importance_loaded_at = time.monotonic()
+        return importance
+
+    def _candidate_masks(self, candidates: List[Dict]) -> List[int]:
+        with self._lock:
+            if self._encoded_source is candidates:
+                return self._encoded_masks
+        encoded = [skill_mask(candidate.get('skills')) for candidate in candidates]
+        with self._lock:
+            self._encoded_source, self._encoded_masks, self._encoded_matrix = candidates, encoded, None
+        return encoded
+
+    def _candidate_matrix(self, candidate_masks: List[int], vocabulary: Dict[int, int]):
+        """0/1 candidates x vocabulary matrix, reused while the snapshot and vocabulary are unchanged"""
+        key = tuple(vocabulary)
+        with self._lock:
+            cached = self._encoded_matrix
+            if cached is not None and cached[0] == key and candidate_masks is self._encoded_masks:
+                return cached[1]
+        if max(vocabulary) < 64 and max(candidate_masks, default=0).bit_length() <= 64:
+            # Every mask fits a uint64: unpack the vocabulary's bits in one shot
+            masks = np.array(candidate_masks, dtype=np.uint64)
+            shifts = np.array(list(vocabulary), dtype=np.uint64)
+            has_skill = ((masks[:, None] >> shifts) & np.uint64(1)).astype(np.float32)
+        else:
+            has_skill = np.zeros((len(candidate_masks), len(vocabulary)), dtype=np.float32)
+            for row, mask in enumerate(candidate_masks):
+                columns = [vocabulary[skill_id] for skill_id in skill_registry.ids(mask) if skill_id in vocabulary]
+                if columns:
+                    has_skill[row, columns] = 1.0
+        with self._lock:
+            if candidate_masks is self._encoded_masks:
+                self._encoded_matrix = (key, has_skill)
+        return has_skill
+
+    def job_weights(self, job: Dict, importance: Dict[str, Dict[str, int]]) -> Dict[int, int]:
+        """Interned skill id -> weight for one job"""
+        weights = {skill: 1 for skill in skill_extractor.extract_from_job(job)}
+        weights.update(importance.get(str(job.get('id')), {}))
+        return {skill_registry.intern(skill): weight for skill, weight in weights.items()}
+
+    # Scoring ---------------------------------------------------------------
+
+    def match(self, jobs: List[Dict], candidates: List[Dict], top_k: Optional[int] = None,
+              min_score: Optional[int] = None) -> Dict:
+        """Top candidates per open job
+
+        Returns ``{'matches': [(job, candidate, score, matched_skills), ...],
+        'best_scores': {job_id: score}, 'complete': bool, ...}``. Jobs left
+        unscored when the time budget runs out are reported via ``complete``.
+        """
+        top_k = top_k or self.top_k
+        min_score = self.min_score if min_score is None else min_score
+        started = time.monotonic()
+        deadline = started + self.budget_ms / 1000
+
+        importance = self.load_importance()
+        open_jobs = [job for job in jobs if str(job.get('status') or '').lower() not in CLOSED_JOB_STATES]
+        job_weights = [self.job_weights(job, importance) for job in open_jobs]
+        candidate_masks = self._candidate_masks(candidates)
+        results, scored_jobs = self.score(job_weights, candidate_masks, top_k, min_score, deadline)
+
+        matches = []
+        best_scores = {}
+        for job_index, ranked in results:
+            job = open_jobs[job_index]
+            job_mask = skill_registry.mask_of_ids(job_weights[job_index])
+            best_scores[job.get('id')] = ranked[0][1] if ranked else 0
+            for candidate_index, score in ranked:
+                matched_skills = skill_registry.names(job_mask & candidate_masks[candidate_index])
+                matches.append((job, candidates[candidate_index], score, matched_skills))
+        matches.sort(key=lambda match: match[2], reverse=True)
+
+        self.last_run = {
+            'engine': 'numpy' if np is not None else 'python',
+            'jobs': len(open_jobs),
+            'candidates': len(candidates),
+            'scored_jobs': scored_jobs,
+            'complete': scored_jobs == len(open_jobs),
+            'match_count': len(matches),
+            'duration_ms': round((time.monotonic() - started) * 1000, 1)
+        }
+        if not self.last_run['complete']:
+            logger.warning(f"Matching budget of {self.budget_ms}ms exhausted after "
+                           f"{scored_jobs}/{len(open_jobs)} jobs")
+        return {'matches': matches, 'best_scores': best_scores, **self.last_run}
+
+    def score(self, job_weights: List[Dict[int, int]], candidate_masks: List[int], top_k: int,
+              min_score: int, deadline: Optional[float] = None) -> Tuple[List, int]:
+        """Rank candidates for each job's skill weights
+
+        Returns ``([(job_index, [(candidate_index, score), ...]), ...], jobs_scored)``;
+        scoring stops between job blocks once ``deadline`` (a monotonic time) passes.
+        """
+        deadline = deadline if deadline is not None else float('inf')
+        if np is not None:
+            return self._score_numpy(job_weights, candidate_masks, top_k, min_score, deadline)
+        return self._score_python(job_weights, candidate_masks, top_k, min_score, deadline)
+
+    def _score_numpy(self, job_weights: List[Dict[int, int]], candidate_masks: List[int],
+                     top_k: int, min_score: int, deadline: float) -> Tuple[List, int]:
+        vocabulary = {skill_id: column for column, skill_id in enumerate(sorted(set().union(*job_weights)))} if job_weights else {}
+        if not vocabulary or not candidate_masks:
+            return [], len(job_weights)
+
+        weights = np.zeros((len(job_weights), len(vocabulary)), dtype=np.float32)
+        for row, job in enumerate(job_weights):
+            for skill_id, weight in job.items():
+                weights[row, vocabulary[skill_id]] = weight
+        totals = weights.sum(axis=1, dtype=np.float64)
+
+        # Candidates only matter through the skills some job asks for
+        has_skill = self._candidate_matrix(candidate_masks, vocabulary)
+
+        k = min(top_k, len(candidate_masks))
+        # Bound the (candidates x jobs) score block to a few million cells
+        block_size = max(1, min(self.block_size, 2_000_000 // len(candidate_masks)))
+        tie_break = np.arange(len(candidate_masks) - 1, -1, -1, dtype=np.float64)
+        candidates_by_skill = np.ascontiguousarray(has_skill.T)
+        results = []
+        scored = 0
+        for start in range(0, len(job_weights), block_size):
+            if scored and time.monotonic() > deadline:
+                break
+            block = slice(start, start + block_size)
+            # (jobs x skills) @ (skills x candidates) -> covered weight per job and candidate
+            covered = (weights[block] @ candidates_by_skill).astype(np.float64)
+            block_totals = totals[block][:, None]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                scores = np.floor(np.where(block_totals > 0, covered * 100 / block_totals, 0))
+            # Fold "earlier in the snapshot wins" into the key so ties break deterministically
+            rank_keys = scores * len(candidate_masks) + tie_break
+            if k < len(candidate_masks):
+                top = np.argpartition(-rank_keys, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(len(candidate_masks)), scores.shape)
+            for row in range(scores.shape[0]):
+                candidates = top[row]
+                candidates = candidates[np.argsort(-rank_keys[row, candidates])]
+                ranked = [
+                    (int(candidate), int(min(100, score)))
+                    for candidate, score in zip(candidates, scores[row, candidates])
+                    if score >= min_score and score > 0
+                ]
+                results.append((start + row, ranked))
+            scored = min(len(job_weights), start + block_size)
+        return results, scored
+
+    def _score_python(self, job_weights: List[Dict[int, int]], candidate_masks: List[int],
+                      top_k: int, min_score: int, deadline: float) -> Tuple[List, int]:
+        results = []
+        for job_index, weights in enumerate(job_weights):
+            if job_index and time.monotonic() > deadline:
+                return results, job_index
+            total = sum(weights.values())
+            job_mask = skill_registry.mask_of_ids(weights)
+            unweighted = total == len(weights)
+            scored = []
+            if total:
+                for candidate_index, mask in enumerate(candidate_masks):
+                    shared = job_mask & mask
+                    if not shared:
+                        continue
+                    covered = shared.bit_count() if unweighted else sum(weights[i] for i in skill_registry.ids(shared))
+                    score = covered * 100 // total
+                    if score >= min_score:
+                        scored.append((candidate_index, min(100, score)))
+            ranked = heapq.nsmallest(top_k, scored, key=lambda item: (-item[1], item[0]))
+            results.append((job_index, ranked))
+        return results, len(job_weights)
+
+    def get_stats(self) -> Dict:
+        return {
+            'engine': 'numpy' if np is not None else 'python',
+            'top_k': self.top_k,
+            'min_score': self.min_score,
+            'budget_ms': self.budget_ms,
+            'last_run': self.last_run
+        }
+
+# Global instance
+matching_engine = MatchingEngine()
@@ -0,0 +1,57 @@
+"""
+Recent Records
+Newest-N selection over record lists by a timestamp field
+"""
+import heapq
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from services.workable_records import RecordSnapshot
+
+# Sorts after every real timestamp, like the empty string did in the old string comparisons
+MISSING_TIMESTAMP = float('-inf')
+
+@lru_cache(maxsize=65536)
+def _parse_timestamp(value) -> float:
+    try:
+        # Python 3.11 parses Workable's trailing "Z" directly; aware values need no UTC round trip
+        parsed = datetime.fromisoformat(value) if isinstance(value, str) else value
+    except ValueError:
+        return MISSING_TIMESTAMP
+    if not isinstance(parsed, datetime):
+        return MISSING_TIMESTAMP
+    return parsed.timestamp() if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc).timestamp()
+
+def _timestamp(value) -> float:
+    """Only strings and datetimes reach the cache; anything else (e.g. a dict) has no timestamp"""
+    if isinstance(value, (str, datetime)):
+        return _parse_timestamp(value)
+    return MISSING_TIMESTAMP
+
+def record_timestamp(record: Dict, field: str = 'created_at') -> float:
+    """POSIX timestamp of ``record[field]``; each distinct value is parsed once"""
+    return _timestamp(record.get(field) or '')
+
+def _select(records: List[Dict], limit: Optional[int], field: str) -> List[Dict]:
+    keys = [_timestamp(record.get(field) or '') for record in records]
+    if limit is None:
+        order = sorted(range(len(records)), key=keys.__getitem__, reverse=True)
+    else:
+        order = heapq.nlargest(limit, range(len(records)), key=keys.__getitem__)
+    return [records[index] for index in order]
+
+def recent(records: List[Dict], limit: Optional[int] = 5, field: str = 'created_at') -> List[Dict]:
+    """The ``limit`` newest records by ``field`` (all of them, newest first, when ``limit`` is None)
+
+    Ties keep their input order, the same as a stable ``sorted(..., reverse=True)``.
+    A cached RecordSnapshot remembers its selections, so they are computed once
+    per snapshot and go away with it; other lists are selected every time.
+    """
+    if not isinstance(records, RecordSnapshot):
+        return _select(records if isinstance(records, list) else list(records), limit, field)
+    memo_key = ('recent', limit, field)
+    selection = records.memo.get(memo_key)
+    if selection is None:
+        selection = records.memo.setdefault(memo_key, _select(records, limit, field))
+    return list(selection)
@@ -0,0 +1,59 @@
+"""
+Request Memo
+Per-request memoization of data helpers on ``flask.g``
+"""
+import functools
+import threading
+import logging
+from typing import Callable, Dict
+
+from flask import g, has_request_context
+
+logger = logging.getLogger(__name__)
+
+class RequestMemo:
+    """Remembers helper results for the rest of the current request
+
+    Results live on ``flask.g``, so they are dropped when the request ends
+    and never leak between requests or threads. Outside a request (startup,
+    background threads) the helper simply runs. Counters are process-wide.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, name: str, key: str):
+        with self._lock:
+            counters = self.stats.setdefault(name, {'calls': 0, 'avoided': 0})
+            counters[key] += 1
+
+    def memoize(self, fn: Callable) -> Callable:
+        """Decorator: run ``fn`` at most once per request for each set of arguments"""
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not has_request_context():
+                return fn(*args, **kwargs)
+            memo = g.setdefault('_request_memo', {})
+            key = (name, args, tuple(sorted(kwargs.items())))
+            if key in memo:
+                self._count(name, 'avoided')
+                return memo[key]
+            self._count(name, 'calls')
+            value = memo[key] = fn(*args, **kwargs)
+            return value
+
+        return wrapper
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = {name: dict(counters) for name, counters in self.stats.items()}
+        for counters in stats.values():
+            total = counters['calls'] + counters['avoided']
+            counters['avoided_rate'] = round(counters['avoided'] / total, 4) if total else 0.0
+        return stats
+
+# Global instance
+request_memo = RequestMemo()
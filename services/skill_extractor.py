@@ -0,0 +1,189 @@
+"""
+Skill Extractor
+Finds taxonomy skills (and their synonyms) in free text in a single tokenizing pass
+"""
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Canonical skill -> aliases. Order is the order extracted skills are reported in.
+SKILL_TAXONOMY: Dict[str, Tuple[str, ...]] = {
+    'Python': ('python3',),
+    'JavaScript': ('js', 'ecmascript'),
+    'TypeScript': (),
+    'React': ('react.js', 'reactjs'),
+    'Angular': ('angularjs', 'angular.js'),
+    'Vue': ('vue.js', 'vuejs'),
+    'Node.js': ('nodejs',),
+    'Java': (),
+    'C#': ('csharp', 'c sharp'),
+    '.NET': ('dotnet', 'asp.net', '.net core'),
+    'PHP': (),
+    'Ruby': ('ruby on rails', 'rails'),
+    'Go': ('golang',),
+    'Rust': (),
+    'SQL': (),
+    'NoSQL': (),
+    'MongoDB': ('mongo',),
+    'PostgreSQL': ('postgres',),
+    'MySQL': (),
+    'Redis': (),
+    'AWS': ('amazon web services',),
+    'Azure': ('microsoft azure',),
+    'GCP': ('google cloud', 'google cloud platform'),
+    'Docker': (),
+    'Kubernetes': ('k8s',),
+    'Jenkins': (),
+    'DevOps': (),
+    'CI/CD': ('ci cd', 'continuous integration', 'continuous delivery', 'continuous deployment'),
+    'Git': ('github', 'gitlab'),
+    'Agile': (),
+    'Scrum': (),
+    'Kanban': (),
+    'REST': ('restful',),
+    'GraphQL': (),
+    'API': ('apis',),
+    'HTML': ('html5',),
+    'CSS': ('css3',),
+    'SASS': ('scss',),
+    'LESS': (),
+    'Machine Learning': ('ML',),
+    'AI': ('artificial intelligence',),
+    'Data Science': (),
+    'Big Data': (),
+    'Hadoop': (),
+    'Marketing': (),
+    'SEO': ('search engine optimization',),
+    'SEM': ('search engine marketing',),
+    'Content Strategy': (),
+    'Social Media': (),
+    'UI/UX': ('UX', 'UI', 'UX/UI', 'user experience'),
+    'Product Management': ('product manager',),
+    'Growth Hacking': (),
+}
+
+# Terms that are also everyday English words or fragments ("go", "the rest",
+# "less than") only count when written the way the skill is written
+CASE_SENSITIVE_TERMS = frozenset({'Go', 'REST', 'LESS', 'AI', 'SEM', 'ML', 'UI', 'UX', 'Rust'})
+
+# Every byte that can't be part of a term becomes a separator; non-ASCII bytes
+# stay word characters so accented words aren't split into false hits
+_TERM_CHARS = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.#/')
+_TOKEN_TABLE = bytes(b if b in _TERM_CHARS or b >= 128 else 32 for b in range(256))
+_SLASH_TABLE = _TOKEN_TABLE.replace(b'/', b' ')
+
+def _term_pattern(term: str) -> str:
+    """Escape a term, letting any run of spaces or hyphens separate its words"""
+    return r'[\s\-]+'.join(re.escape(word) for word in term.split())
+
+class SkillExtractor:
+    """Single-pass skill matcher built once from a taxonomy
+
+    The text is tokenized once (a byte translate plus split, both in C) and the
+    token set is intersected with the first word of every term. Single-word,
+    case-insensitive terms are decided by that lookup alone; multi-word terms
+    and the case-sensitive ones are confirmed with a precompiled regex that is
+    only run when their first word actually occurs. Terms must not be glued to
+    other letters or digits, which keeps "Java" out of "JavaScript" and "Go"
+    out of "Google". Results are memoized per text, since the same job texts
+    are extracted on every request.
+    """
+
+    def __init__(self, taxonomy: Optional[Dict[str, Iterable[str]]] = None,
+                 case_sensitive: Iterable[str] = CASE_SENSITIVE_TERMS, cache_size: int = 4096):
+        self.taxonomy = {skill: tuple(aliases) for skill, aliases in (taxonomy or SKILL_TAXONOMY).items()}
+        self._rank = {skill: index for index, skill in enumerate(self.taxonomy)}
+        self._canonical: Dict[str, str] = {}
+
+        case_sensitive = set(case_sensitive)
+        # First word of a term (and its sentence-final "word." form) -> [(skill, verifier)]
+        self._triggers: Dict[bytes, List[Tuple[str, Optional[re.Pattern]]]] = {}
+        for skill, aliases in self.taxonomy.items():
+            for term in (skill, *aliases):
+                self._canonical[self._key(term)] = skill
+                words = term.split()
+                verifier = None
+                if len(words) > 1 or term in case_sensitive:
+                    flags = 0 if term in case_sensitive else re.IGNORECASE
+                    verifier = re.compile(r'(?<![\w])' + _term_pattern(term) + r'(?![\w])', flags)
+                first = words[0].lower().encode('utf-8')
+                for trigger in (first, first + b'.'):
+                    self._triggers.setdefault(trigger, []).append((skill, verifier))
+        self._trigger_keys = frozenset(self._triggers)
+        self._extract_text = lru_cache(maxsize=cache_size)(self._scan)
+        self._canonicalize = lru_cache(maxsize=cache_size)(self._lookup)
+
+    @staticmethod
+    def _key(term: str) -> str:
+        return ' '.join(re.split(r'[\s\-]+', term.strip().lower()))
+
+    @staticmethod
+    def _as_text(value) -> str:
+        if not value:
+            return ''
+        if isinstance(value, str):
+            return value
+        if isinstance(value, dict):
+            return str(value.get('text') or '')
+        if isinstance(value, (list, tuple)):
+            return '\n'.join(str(item) for item in value if item)
+        return str(value)
+
+    def _scan(self, text: str) -> Tuple[str, ...]:
+        lowered = text.encode('utf-8', 'ignore').lower()
+        tokens = set(lowered.translate(_TOKEN_TABLE).split())
+        if b'/' in lowered:
+            # "Python/Django" must also yield "python"; "CI/CD" stays whole above
+            tokens.update(lowered.translate(_SLASH_TABLE).split())
+
+        found = set()
+        for trigger in tokens & self._trigger_keys:
+            for skill, verifier in self._triggers[trigger]:
+                if skill not in found and (verifier is None or verifier.search(text)):
+                    found.add(skill)
+        return tuple(sorted(found, key=self._rank.__getitem__))
+
+    def extract(self, text) -> List[str]:
+        """Canonical skills mentioned in ``text``, in taxonomy order"""
+        text = self._as_text(text)
+        return list(self._extract_text(text)) if text else []
+
+    def _lookup(self, skill: str) -> str:
+        return self._canonical.get(self._key(skill), skill)
+
+    def canonicalize(self, skill: str) -> str:
+        """Canonical name for a known skill or alias; unknown skills are returned unchanged"""
+        if not skill:
+            return skill
+        return self._canonicalize(skill)
+
+    def normalize_skills(self, skills: Iterable[str]) -> List[str]:
+        """Canonicalize a skill list (e.g. candidate tags), dropping duplicates"""
+        normalized = []
+        seen = set()
+        for skill in skills or []:
+            canonical = self.canonicalize(skill)
+            if canonical and canonical not in seen:
+                seen.add(canonical)
+                normalized.append(canonical)
+        return normalized
+
+    def extract_from_job(self, job_details: Dict) -> List[str]:
+        """Skills from a job's requirements, topped up from the description when fewer than two are found"""
+        if not job_details:
+            return []
+        skills = self.extract(job_details.get('requirements'))
+        if len(skills) < 2 and job_details.get('description'):
+            skills = sorted(set(skills) | set(self.extract(job_details.get('description'))),
+                            key=self._rank.__getitem__)
+        return skills
+
+# Global instance
+skill_extractor = SkillExtractor()
+
+def extract_skills(text) -> List[str]:
+    """Extract canonical skills from free text"""
+    return skill_extractor.extract(text)
@@ -0,0 +1,198 @@
+"""
+Skill Index
+Inverted index from skill to the jobs and candidates that have it, for top-k matching
+"""
+import heapq
+import itertools
+import threading
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from services.skill_extractor import skill_extractor
+from services.skill_registry import skill_registry
+
+logger = logging.getLogger(__name__)
+
+def skill_names(skills) -> List[str]:
+    """Canonical names from a candidate's ``skills`` (plain strings or Workable ``{'name': ...}`` dicts)"""
+    names = []
+    for skill in skills or []:
+        name = skill.get('name') if isinstance(skill, dict) else skill
+        if name:
+            names.append(str(name))
+    return skill_extractor.normalize_skills(names)
+
+def skill_mask(skills) -> int:
+    """Bitmask of a candidate's ``skills`` over the interned skill ids"""
+    return skill_registry.mask(skill_names(skills))
+
+class _Side:
+    """Posting lists plus per-id skill masks and records for one kind of entity"""
+
+    def __init__(self):
+        self.postings: Dict[int, Set[str]] = defaultdict(set)
+        self.skills: Dict[str, int] = {}
+        self.records: Dict[str, Dict] = {}
+        self.order: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self.source = None
+
+    def upsert(self, entity_id: str, record: Dict, mask: int):
+        previous = self.skills.get(entity_id, 0)
+        for skill_id in skill_registry.ids(previous & ~mask):
+            self._unpost(skill_id, entity_id)
+        for skill_id in skill_registry.ids(mask & ~previous):
+            self.postings[skill_id].add(entity_id)
+        self.skills[entity_id] = mask
+        self.records[entity_id] = record
+        if entity_id not in self.order:
+            self.order[entity_id] = next(self._sequence)
+
+    def remove(self, entity_id: str):
+        for skill_id in skill_registry.ids(self.skills.pop(entity_id, 0)):
+            self._unpost(skill_id, entity_id)
+        self.records.pop(entity_id, None)
+        self.order.pop(entity_id, None)
+
+    def _unpost(self, skill_id: int, entity_id: str):
+        posting = self.postings.get(skill_id)
+        if posting is not None:
+            posting.discard(entity_id)
+            if not posting:
+                del self.postings[skill_id]
+
+    def overlap_counts(self, mask: int) -> Dict[str, int]:
+        """Merge the posting lists of the skills in ``mask`` into id -> number of shared skills"""
+        counts: Dict[str, int] = defaultdict(int)
+        for skill_id in skill_registry.ids(mask):
+            for entity_id in self.postings.get(skill_id, ()):
+                counts[entity_id] += 1
+        return counts
+
+class SkillIndex:
+    """Maintained skill -> job ids / candidate ids posting lists
+
+    Job skills come from the skill extractor, candidate skills from their
+    ``skills`` field, both canonicalized so synonyms line up and stored as
+    bitmasks over the interned skill ids. ``sync_jobs`` and
+    ``sync_candidates`` reconcile the index with a snapshot incrementally: only
+    records whose object changed are re-indexed, and passing the same cached
+    list again is a no-op. A detail page then only touches the postings of
+    its own skills instead of scanning every job or candidate.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._jobs = _Side()
+        self._candidates = _Side()
+        self.stats = {'job_updates': 0, 'candidate_updates': 0, 'removals': 0, 'queries': 0}
+
+    # Maintenance -----------------------------------------------------------
+
+    def upsert_job(self, job: Dict, skills: Optional[List[str]] = None):
+        if job.get('id') is None:
+            return
+        if skills is None:
+            skills = skill_extractor.extract_from_job(job)
+        with self._lock:
+            self._jobs.upsert(str(job['id']), job, skill_registry.mask(skills))
+            self.stats['job_updates'] += 1
+
+    def upsert_candidate(self, candidate: Dict):
+        if candidate.get('id') is None:
+            return
+        with self._lock:
+            self._candidates.upsert(str(candidate['id']), candidate, skill_mask(candidate.get('skills')))
+            self.stats['candidate_updates'] += 1
+
+    def remove_job(self, job_id):
+        with self._lock:
+            self._jobs.remove(str(job_id))
+            self.stats['removals'] += 1
+
+    def remove_candidate(self, candidate_id):
+        with self._lock:
+            self._candidates.remove(str(candidate_id))
+            self.stats['removals'] += 1
+
+    def _sync(self, side: _Side, records: List[Dict], upsert, remove):
+        with self._lock:
+            if side.source is records:
+                return
+            seen = set()
+            for record in records:
+                if record.get('id') is None:
+                    continue
+                entity_id = str(record['id'])
+                seen.add(entity_id)
+                if side.records.get(entity_id) is not record:
+                    upsert(record)
+            for entity_id in [entity_id for entity_id in side.records if entity_id not in seen]:
+                remove(entity_id)
+            side.source = records
+
+    def sync_jobs(self, jobs: List[Dict]):
+        """Reconcile the job postings with a full jobs snapshot, reusing skills it already carries"""
+        extracted = getattr(jobs, 'skills', None) or {}
+        self._sync(self._jobs, jobs, lambda job: self.upsert_job(job, extracted.get(str(job['id']))),
+                   self.remove_job)
+
+    def sync_candidates(self, candidates: List[Dict]):
+        """Reconcile the candidate postings with a full candidates snapshot"""
+        self._sync(self._candidates, candidates, self.upsert_candidate, self.remove_candidate)
+
+    # Queries ---------------------------------------------------------------
+
+    def top_candidates(self, job_skills: Iterable[str], limit: int = 5) -> List[Tuple[Dict, int]]:
+        """Best (candidate, match percentage) pairs for a job's skills
+
+        The percentage is the share of the job's skills the candidate has.
+        Skills nobody has interned still count towards that share.
+        """
+        job_skills = {skill_registry.normalize(skill) for skill in job_skills if skill} - {''}
+        job_mask = skill_registry.query_mask(job_skills)
+        if not job_mask:
+            return []
+        total = len(job_skills)
+        with self._lock:
+            self.stats['queries'] += 1
+            counts = self._candidates.overlap_counts(job_mask)
+            order = self._candidates.order
+            best = heapq.nlargest(limit, counts.items(), key=lambda item: (item[1], -order[item[0]]))
+            return [
+                (self._candidates.records[candidate_id], min(100, int(shared / total * 100)))
+                for candidate_id, shared in best
+            ]
+
+    def top_jobs(self, candidate_skills, limit: int = 5) -> List[Tuple[Dict, int]]:
+        """Best (job, match percentage) pairs for a candidate's skills
+
+        The percentage is the share of each job's skills the candidate has.
+        """
+        candidate_mask = skill_registry.query_mask(skill_names(candidate_skills))
+        if not candidate_mask:
+            return []
+        with self._lock:
+            self.stats['queries'] += 1
+            counts = self._jobs.overlap_counts(candidate_mask)
+            masks, order = self._jobs.skills, self._jobs.order
+            scored = (
+                (job_id, min(100, int(shared / masks[job_id].bit_count() * 100)))
+                for job_id, shared in counts.items()
+            )
+            best = heapq.nlargest(limit, scored, key=lambda item: (item[1], -order[item[0]]))
+            return [(self._jobs.records[job_id], percentage) for job_id, percentage in best]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'jobs': len(self._jobs.records),
+                'candidates': len(self._candidates.records),
+                'job_skills': len(self._jobs.postings),
+                'candidate_skills': len(self._candidates.postings),
+                **self.stats
+            }
+
+# Global instance
+skill_index = SkillIndex()
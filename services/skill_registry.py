@@ -0,0 +1,179 @@
+"""
+Skill Registry
+Interns skill names to dense integer ids so skill sets can be stored as bitmasks
+"""
+import threading
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from services.skill_extractor import skill_extractor
+
+logger = logging.getLogger(__name__)
+
+# Length of ``Skill.name``; longer names are truncated before they are interned
+SKILL_NAME_MAX_LENGTH = 100
+
+class SkillRegistry:
+    """Canonical skill name <-> dense bit position, backed by the ``Skill`` table
+
+    Bit positions are handed out in first-seen order: the extractor's taxonomy
+    first (so the common skills share the low bits), then whatever the
+    ``skills`` table and candidate data add. A set of skills is one Python int
+    with a bit per skill, so an overlap is ``(a & b).bit_count()``. Names
+    interned at runtime are written back to the ``skills`` table by ``flush``.
+    Queries go through ``lookup``/``query_mask``, which never allocate, so
+    arbitrary request input can't grow the registry.
+    """
+
+    def __init__(self, names: Optional[Iterable[str]] = None):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._unsaved: List[str] = []
+        self._loaded = False
+        for name in names if names is not None else skill_extractor.taxonomy:
+            self._intern(name)
+
+    def _intern(self, name: str) -> int:
+        """Assign the next bit to ``name``; caller must hold the lock or be in __init__"""
+        skill_id = self._ids.get(name)
+        if skill_id is None:
+            skill_id = len(self._names)
+            self._ids[name] = skill_id
+            self._names.append(name)
+            self._unsaved.append(name)
+        return skill_id
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Canonical, whitespace-collapsed name cut to the ``skills.name`` column length"""
+        return skill_extractor.canonicalize(' '.join(str(name).split()))[:SKILL_NAME_MAX_LENGTH]
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Dense id for a skill name if it is already interned"""
+        return self._ids.get(self.normalize(name))
+
+    def intern(self, name: str) -> int:
+        """Dense id for a skill name (normalized first), allocating one if new"""
+        name = self.normalize(name)
+        skill_id = self._ids.get(name)
+        if skill_id is not None:
+            return skill_id
+        with self._lock:
+            return self._intern(name)
+
+    def mask(self, names: Iterable[str]) -> int:
+        """Bitmask for a collection of skill names, interning new ones"""
+        mask = 0
+        for name in names:
+            if name and self.normalize(name):
+                mask |= 1 << self.intern(name)
+        return mask
+
+    def query_mask(self, names: Iterable[str]) -> int:
+        """Bitmask of the already interned names; unknown names are left out"""
+        mask = 0
+        for name in names:
+            skill_id = self.lookup(name) if name else None
+            if skill_id is not None:
+                mask |= 1 << skill_id
+        return mask
+
+    @staticmethod
+    def mask_of_ids(skill_ids: Iterable[int]) -> int:
+        """Bitmask for a collection of skill ids"""
+        mask = 0
+        for skill_id in skill_ids:
+            mask |= 1 << skill_id
+        return mask
+
+    def ids(self, mask: int) -> List[int]:
+        """Set bit positions of ``mask``, lowest first"""
+        ids = []
+        while mask:
+            low = mask & -mask
+            ids.append(low.bit_length() - 1)
+            mask ^= low
+        return ids
+
+    def names(self, mask: int) -> List[str]:
+        return [self._names[skill_id] for skill_id in self.ids(mask)]
+
+    def name(self, skill_id: int) -> str:
+        return self._names[skill_id]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    # Skill table -----------------------------------------------------------
+
+    def load(self):
+        """Intern every name in the ``skills`` table; needs an app context"""
+        try:
+            from models import Skill
+            known = [name for (name,) in Skill.query.with_entities(Skill.name).order_by(Skill.id).all()]
+        except Exception as e:
+            logger.error(f"Could not load skills table: {str(e)}")
+            return
+        with self._lock:
+            for name in known:
+                self._intern(self.normalize(name))
+            # Anything the table already has doesn't need writing back
+            stored = set(known)
+            self._unsaved = [name for name in self._unsaved if name not in stored]
+            self._loaded = True
+        logger.info(f"Skill registry loaded {len(known)} skills ({len(self._names)} interned)")
+
+    def flush(self) -> int:
+        """Insert skills interned since the last flush into the ``skills`` table; needs an app context"""
+        from app import db
+        from models import Skill
+        if not self._loaded:
+            self.load()
+        with self._lock:
+            pending, self._unsaved = self._unsaved, []
+        if not pending:
+            return 0
+        try:
+            existing = {name for (name,) in db.session.query(Skill.name).filter(Skill.name.in_(pending)).all()}
+        except Exception as e:
+            # The table isn't reachable: keep everything for the next flush
+            db.session.rollback()
+            with self._lock:
+                self._unsaved = pending + self._unsaved
+            logger.error(f"Could not save interned skills: {str(e)}")
+            return 0
+        new_names = [name for name in pending if name and name not in existing and len(name) <= SKILL_NAME_MAX_LENGTH]
+        try:
+            db.session.add_all([Skill(name=name) for name in new_names])
+            db.session.commit()
+            return len(new_names)
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Batch insert of {len(new_names)} skills failed, retrying one by one: {str(e)}")
+        # Rows that fail on their own are dropped; they stay interned in memory
+        saved = 0
+        for name in new_names:
+            try:
+                db.session.add(Skill(name=name))
+                db.session.commit()
+                saved += 1
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Could not save skill {name!r}: {str(e)}")
+        return saved
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {'skills': len(self._names), 'unsaved': len(self._unsaved), 'loaded': self._loaded}
+
+# Global instance
+skill_registry = SkillRegistry()
+
+def skill_overlap(a: int, b: int) -> int:
+    """Number of skills two masks share"""
+    return (a & b).bit_count()
@@ -3,12 +3,23 @@ Real Workable API Integration
 Fetches live job and candidate data from Workable API
 """
 import os
+import random
+import threading
+import time
 import requests
 import logging
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from requests.adapters import HTTPAdapter
+
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Status codes worth retrying: rate limiting and transient upstream failures
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
 class WorkableAPIService:
     def __init__(self):
         self.api_key = os.environ.get('WORKABLE_API_KEY')
@@ -20,8 +31,232 @@ class WorkableAPIService:
             'Content-Type': 'application/json'
         }
         
-        # Test connection on initialization
-        self.connected = self._test_connection()
+        # HTTP transport settings (pool size and retry budget)
+        self.pool_size = int(os.environ.get('WORKABLE_POOL_SIZE', 10))
+        self.max_retries = int(os.environ.get('WORKABLE_MAX_RETRIES', 3))
+        self.backoff_factor = float(os.environ.get('WORKABLE_BACKOFF_FACTOR', 0.5))
+        self.max_backoff = float(os.environ.get('WORKABLE_MAX_BACKOFF', 30))
+        # Total seconds one call may spend on attempts plus backoff before it gives up retrying
+        self.retry_budget = float(os.environ.get('WORKABLE_RETRY_BUDGET', 45))
+        
+        self._stats_lock = threading.Lock()
+        self._http_stats = {
+            'requests': 0,
+            'attempts': 0,
+            'retries': 0,
+            'retries_by_reason': {},
+            'failures': 0
+        }
+        # Built per process: keep-alive sockets and pool locks must not be shared across a fork
+        self._session: Optional[requests.Session] = None
+        self._session_pid: Optional[int] = None
+        self._session_lock = threading.Lock()
+        # A lock held by another thread at fork time would stay held forever in the child
+        os.register_at_fork(after_in_child=self._reset_session_lock)
+        
+        # Coalesces identical concurrent fetches into one upstream request
+        self._single_flight = SingleFlight()
+        
+        # Fails fast while Workable is unhealthy instead of waiting out timeouts
+        self.breaker = CircuitBreaker(
+            'workable',
+            failure_threshold=int(os.environ.get('WORKABLE_BREAKER_FAILURES', 5)),
+            recovery_timeout=float(os.environ.get('WORKABLE_BREAKER_RESET', 30))
+        )
+        
+        # Connection state is probed lazily in the background; None means not probed yet
+        self.health_interval = float(os.environ.get('WORKABLE_HEALTH_INTERVAL', 60))
+        self._connected: Optional[bool] = None
+        self._last_probe_at: Optional[datetime] = None
+        self._health_lock = threading.Lock()
+        self._health_thread: Optional[threading.Thread] = None
+        self._health_pid: Optional[int] = None
+    
+    @property
+    def connected(self) -> bool:
+        """Whether Workable is usable, without ever blocking on network I/O
+
+        The first access starts the background health check. Until its first
+        probe completes, configured credentials are assumed to work.
+        """
+        if not self.api_key or not self.subdomain:
+            return False
+        self._ensure_health_monitor()
+        return self._connected is not False
+    
+    @connected.setter
+    def connected(self, value: bool):
+        self._connected = bool(value)
+    
+    def _ensure_health_monitor(self):
+        """Start the health-check thread once per process (threads don't survive a fork)"""
+        pid = os.getpid()
+        if self._health_pid == pid and self._health_thread and self._health_thread.is_alive():
+            return
+        with self._health_lock:
+            if self._health_pid == pid and self._health_thread and self._health_thread.is_alive():
+                return
+            self._health_pid = pid
+            self._health_thread = threading.Thread(target=self._health_loop, daemon=True)
+            self._health_thread.start()
+    
+    def _health_loop(self):
+        """Refresh the connected state every ``health_interval`` seconds"""
+        while True:
+            self._connected = self._test_connection()
+            self._last_probe_at = datetime.now()
+            time.sleep(self.health_interval)
+    
+    def get_connection_status(self) -> Dict:
+        """Result of the most recent background probe"""
+        configured = bool(self.api_key and self.subdomain)
+        if not configured:
+            state = 'not_configured'
+        elif self._connected is None:
+            state = 'unknown'
+        else:
+            state = 'connected' if self._connected else 'disconnected'
+        return {
+            'configured': configured,
+            'state': state,
+            'last_probe_at': self._last_probe_at.isoformat() if self._last_probe_at else None,
+            'probe_interval_seconds': self.health_interval
+        }
+    
+    @property
+    def session(self) -> requests.Session:
+        """The keep-alive session for this process, rebuilt after a fork"""
+        pid = os.getpid()
+        if self._session_pid == pid and self._session is not None:
+            return self._session
+        with self._session_lock:
+            if self._session_pid != pid or self._session is None:
+                # The parent's session is left alone: closing it here would close the parent's sockets
+                self._session = self._build_session()
+                self._session_pid = pid
+            return self._session
+    
+    def _reset_session_lock(self):
+        self._session_lock = threading.Lock()
+    
+    def _build_session(self) -> requests.Session:
+        """Create the shared keep-alive session used for every Workable call"""
+        session = requests.Session()
+        # Retries are handled in _request so they can be counted and jittered
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=0
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self.headers)
+        return session
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Exponential backoff with full jitter, honouring Retry-After when given"""
+        if retry_after:
+            try:
+                return min(self.max_backoff, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        ceiling = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, ceiling)
+    
+    def _record_http(self, key: str, reason: Optional[str] = None):
+        with self._stats_lock:
+            self._http_stats[key] += 1
+            if reason is not None:
+                by_reason = self._http_stats['retries_by_reason']
+                by_reason[reason] = by_reason.get(reason, 0) + 1
+    
+    def _request(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> requests.Response:
+        """Send a request over the pooled session, retrying 429/5xx and connection errors
+
+        Read timeouts are not retried: each one already cost a full ``timeout``.
+        Retries stop after ``retries`` (default ``max_retries``) or once the next
+        backoff would take the call past ``retry_budget`` seconds.
+
+        Raises CircuitOpenError without touching the network while the breaker is open.
+        """
+        max_retries = self.max_retries if retries is None else retries
+        self.breaker.before_call()
+        self._record_http('requests')
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            self._record_http('attempts')
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.ConnectionError as e:
+                # Includes ConnectTimeout, which fails fast before Workable saw the request
+                reason = type(e).__name__
+                delay = self._backoff_delay(attempt)
+                if not self._may_retry(attempt, max_retries, started, delay):
+                    self._record_http('failures')
+                    self.breaker.record_failure()
+                    raise
+            except Exception:
+                self._record_http('failures')
+                self.breaker.record_failure()
+                raise
+            else:
+                status = response.status_code
+                retryable = status in RETRY_STATUS_CODES
+                delay = self._backoff_delay(attempt, response.headers.get('Retry-After')) if retryable else 0.0
+                if not retryable or not self._may_retry(attempt, max_retries, started, delay):
+                    if status >= 400:
+                        self._record_http('failures')
+                    if retryable:
+                        self.breaker.record_failure()
+                    elif status >= 400:
+                        # Workable answered; a client error says nothing about its health
+                        self.breaker.record_ignored()
+                    else:
+                        self.breaker.record_success()
+                    return response
+                reason = str(status)
+                response.close()
+            
+            attempt += 1
+            self._record_http('retries', reason)
+            logger.warning(f"Workable {method} {url} failed ({reason}), retry {attempt}/{max_retries} in {delay:.2f}s")
+            time.sleep(delay)
+    
+    def _may_retry(self, attempt: int, max_retries: int, started: float, delay: float) -> bool:
+        """Whether another attempt fits in both the retry count and the time budget"""
+        return attempt < max_retries and time.monotonic() - started + delay <= self.retry_budget
+    
+    def get_http_stats(self) -> Dict:
+        """Connection reuse and retry counters for the Workable HTTP session"""
+        new_connections = 0
+        pooled_requests = 0
+        adapter = self.session.get_adapter(self.base_url)
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            new_connections += pool.num_connections
+            pooled_requests += pool.num_requests
+        
+        with self._stats_lock:
+            stats = dict(self._http_stats)
+            stats['retries_by_reason'] = dict(self._http_stats['retries_by_reason'])
+        
+        reused = max(0, pooled_requests - new_connections)
+        stats.update({
+            'pool_size': self.pool_size,
+            'max_retries': self.max_retries,
+            'retry_budget_seconds': self.retry_budget,
+            'new_connections': new_connections,
+            'reused_connections': reused,
+            'keep_alive_hit_rate': round(reused / pooled_requests, 4) if pooled_requests else 0.0,
+            'single_flight': self._single_flight.get_stats(),
+            'connection': self.get_connection_status()
+        })
+        return stats
         
     def _test_connection(self) -> bool:
         """Test Workable API connection"""
@@ -30,128 +265,156 @@ class WorkableAPIService:
                 logger.warning("Workable API credentials not provided")
                 return False
                 
-            response = requests.get(f"{self.base_url}/jobs", headers=self.headers, timeout=10)
+            # A probe reports the current state; retrying it would only delay that
+            response = self._request('GET', f"{self.base_url}/jobs", params={'limit': 1}, retries=0, timeout=10)
             if response.status_code == 200:
                 logger.info("✓ Workable API connection successful")
                 return True
             else:
                 logger.error(f"Workable API connection failed: {response.status_code}")
                 return False
+        except CircuitOpenError:
+            # The breaker already knows Workable is unhealthy; keep the last known state
+            return self._connected is not False
         except Exception as e:
             logger.error(f"Workable API connection error: {str(e)}")
             return False
     
-    def get_jobs(self, limit: int = 100) -> List[Dict]:
-        """Fetch jobs from Workable API"""
-        if not self.connected:
-            return []
-            
-        try:
-            response = requests.get(
-                f"{self.base_url}/jobs",
-                headers=self.headers,
-                params={'limit': limit},  # Get all jobs (published and archived)
-                timeout=15
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                jobs = data.get('jobs', [])
-                logger.info(f"Retrieved {len(jobs)} jobs from Workable API")
-                
-                # Transform jobs to our format
-                formatted_jobs = []
-                for job in jobs:
-                    formatted_job = {
-                        'id': job.get('id'),
-                        'title': job.get('title'),
-                        'description': job.get('description', ''),
-                        'requirements': job.get('requirements', []),
-                        'department': job.get('department'),
-                        'employment_type': job.get('employment_type'),
-                        'experience_level': job.get('experience_level'),
-                        'location': job.get('location', {}),
-                        'created_at': job.get('created_at'),
-                        'status': job.get('state', 'published'),
-                        'application_url': f"/apply/{job.get('shortcode', job.get('id'))}",
-                        'applications': job.get('candidate_count', 0),
-                        'benefits': job.get('benefits', []),
-                        'salary_min': job.get('salary_min'),
-                        'salary_max': job.get('salary_max'),
-                        'rate_min': job.get('salary_min'),
-                        'rate_max': job.get('salary_max')
-                    }
-                    formatted_jobs.append(formatted_job)
-                    
-                return formatted_jobs
-            else:
-                logger.error(f"Failed to fetch jobs: {response.status_code}")
-                return []
-                
-        except Exception as e:
-            logger.error(f"Error fetching jobs from Workable: {str(e)}")
-            return []
+    def _format_job(self, job: Dict) -> Dict:
+        """Transform a raw Workable job into our format"""
+        return {
+            'id': job.get('id'),
+            'shortcode': job.get('shortcode'),
+            'title': job.get('title'),
+            'description': job.get('description', ''),
+            'requirements': job.get('requirements', []),
+            'department': job.get('department'),
+            'employment_type': job.get('employment_type'),
+            'experience_level': job.get('experience_level'),
+            'location': job.get('location', {}),
+            'created_at': job.get('created_at'),
+            'updated_at': job.get('updated_at'),
+            'status': job.get('state', 'published'),
+            'application_url': f"/apply/{job.get('shortcode', job.get('id'))}",
+            'applications': job.get('candidate_count', 0),
+            'benefits': job.get('benefits', []),
+            'salary_min': job.get('salary_min'),
+            'salary_max': job.get('salary_max'),
+            'rate_min': job.get('salary_min'),
+            'rate_max': job.get('salary_max')
+        }
+    
+    def _format_candidate(self, candidate: Dict) -> Dict:
+        """Transform a raw Workable candidate into our format"""
+        return {
+            'id': candidate.get('id'),
+            'first_name': candidate.get('firstname', ''),
+            'last_name': candidate.get('lastname', ''),
+            'name': f"{candidate.get('firstname', '')} {candidate.get('lastname', '')}".strip(),
+            'email': candidate.get('email'),
+            'phone': candidate.get('phone'),
+            'created_at': candidate.get('created_at'),
+            'updated_at': candidate.get('updated_at'),
+            'stage': candidate.get('stage'),
+            'status': candidate.get('stage', 'new'),
+            'domain': candidate.get('domain', 'General'),
+            'experience': candidate.get('experience_level', 'mid'),
+            'skills': candidate.get('skills', []),
+            'current_position': candidate.get('headline', ''),
+            'cover_letter': candidate.get('cover_letter', ''),
+            'resume_url': candidate.get('resume_url'),
+            'applications': len(candidate.get('jobs', [])),
+            'hourly_rate': candidate.get('salary_expectation'),
+            'job': candidate.get('job')
+        }
     
-    def get_candidates(self, limit: int = 100) -> List[Dict]:
-        """Fetch candidates from Workable API"""
+    def _iter_resource(self, resource: str, formatter, limit: Optional[int] = None,
+                       page_size: int = 100, updated_after: Optional[str] = None,
+                       created_after: Optional[str] = None, strict: bool = False) -> Iterator[Dict]:
+        """Stream formatted records of a Workable list endpoint one page at a time
+
+        Follows the ``paging.next`` cursor until the account is exhausted or
+        ``limit`` records have been yielded, so only a single page of raw
+        API data is held in memory at any point. With ``strict`` set, upstream
+        failures are raised instead of silently ending the stream.
+        """
         if not self.connected:
-            return []
-            
+            return
+        
+        url = f"{self.base_url}/{resource}"
+        params = {'limit': min(page_size, limit) if limit else page_size}
+        if updated_after:
+            params['updated_after'] = updated_after
+        if created_after:
+            params['created_after'] = created_after
+        yielded = 0
+        pages = 0
+        
         try:
-            response = requests.get(
-                f"{self.base_url}/candidates",
-                headers=self.headers,
-                params={'limit': 1000},  # Get up to 1000 candidates
-                timeout=15
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                candidates = data.get('candidates', [])
-                logger.info(f"Retrieved {len(candidates)} candidates from Workable API")
+            while url:
+                response = self._request('GET', url, params=params, timeout=15)
+                if response.status_code != 200:
+                    logger.error(f"Failed to fetch {resource}: {response.status_code}")
+                    if strict:
+                        response.raise_for_status()
+                        raise requests.HTTPError(f"Unexpected status {response.status_code} for {resource}")
+                    return
                 
-                # Transform candidates to our format
-                formatted_candidates = []
-                for candidate in candidates:
-                    formatted_candidate = {
-                        'id': candidate.get('id'),
-                        'first_name': candidate.get('firstname', ''),
-                        'last_name': candidate.get('lastname', ''),
-                        'name': f"{candidate.get('firstname', '')} {candidate.get('lastname', '')}".strip(),
-                        'email': candidate.get('email'),
-                        'phone': candidate.get('phone'),
-                        'created_at': candidate.get('created_at'),
-                        'stage': candidate.get('stage'),
-                        'status': candidate.get('stage', 'new'),
-                        'domain': candidate.get('domain', 'General'),
-                        'experience': candidate.get('experience_level', 'mid'),
-                        'skills': candidate.get('skills', []),
-                        'current_position': candidate.get('headline', ''),
-                        'cover_letter': candidate.get('cover_letter', ''),
-                        'resume_url': candidate.get('resume_url'),
-                        'applications': len(candidate.get('jobs', [])),
-                        'hourly_rate': candidate.get('salary_expectation')
-                    }
-                    formatted_candidates.append(formatted_candidate)
-                    
-                return formatted_candidates
-            else:
-                logger.error(f"Failed to fetch candidates: {response.status_code}")
-                return []
+                data = response.json()
+                pages += 1
+                for record in data.get(resource, []):
+                    yield formatter(record)
+                    yielded += 1
+                    if limit is not None and yielded >= limit:
+                        return
                 
+                # The next link already carries the query string, including the cursor
+                url = (data.get('paging') or {}).get('next')
+                params = None
         except Exception as e:
-            logger.error(f"Error fetching candidates from Workable: {str(e)}")
-            return []
+            logger.error(f"Error fetching {resource} from Workable: {str(e)}")
+            if strict:
+                raise
+        finally:
+            logger.info(f"Retrieved {yielded} {resource} from Workable API across {pages} page(s)")
+    
+    def iter_jobs(self, limit: Optional[int] = None, page_size: int = 100,
+                  updated_after: Optional[str] = None, created_after: Optional[str] = None,
+                  strict: bool = False) -> Iterator[Dict]:
+        """Stream formatted jobs, optionally only those changed after an ISO timestamp"""
+        return self._iter_resource('jobs', self._format_job, limit, page_size,
+                                   updated_after, created_after, strict)
+    
+    def iter_candidates(self, limit: Optional[int] = None, page_size: int = 100,
+                        updated_after: Optional[str] = None, created_after: Optional[str] = None,
+                        strict: bool = False) -> Iterator[Dict]:
+        """Stream formatted candidates, optionally only those changed after an ISO timestamp"""
+        return self._iter_resource('candidates', self._format_candidate, limit, page_size,
+                                   updated_after, created_after, strict)
+    
+    def get_jobs(self, limit: int = 100) -> List[Dict]:
+        """Fetch jobs from Workable API, sharing any identical fetch already in flight"""
+        return self._single_flight.do(('jobs', limit), lambda: list(self.iter_jobs(limit=limit)))
+    
+    def get_candidates(self, limit: Optional[int] = None) -> List[Dict]:
+        """Fetch candidates from Workable API, following pagination up to ``limit``
+
+        Concurrent calls with the same limit share a single paginated fetch.
+        """
+        return self._single_flight.do(('candidates', limit), lambda: list(self.iter_candidates(limit=limit)))
     
     def get_job_details(self, job_id: str) -> Optional[Dict]:
         """Get detailed information for a specific job"""
+        return self._single_flight.do(('job', job_id), lambda: self._fetch_job_details(job_id))
+    
+    def _fetch_job_details(self, job_id: str) -> Optional[Dict]:
         if not self.connected:
             return None
             
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f"{self.base_url}/jobs/{job_id}",
-                headers=self.headers,
                 timeout=10
             )
             
@@ -169,13 +432,16 @@ class WorkableAPIService:
     
     def get_candidate_details(self, candidate_id: str) -> Optional[Dict]:
         """Get detailed information for a specific candidate"""
+        return self._single_flight.do(('candidate', candidate_id), lambda: self._fetch_candidate_details(candidate_id))
+    
+    def _fetch_candidate_details(self, candidate_id: str) -> Optional[Dict]:
         if not self.connected:
             return None
             
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f"{self.base_url}/candidates/{candidate_id}",
-                headers=self.headers,
                 timeout=10
             )
             
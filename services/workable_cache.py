@@ -0,0 +1,230 @@
+"""
+Workable Data Cache
+TTL + stale-while-revalidate cache in front of the Workable API fetches
+"""
+import os
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.workable_api import workable_api
+from services.workable_records import RecordSnapshot, normalize_candidates, normalize_jobs
+from services.workable_snapshot import workable_snapshot
+
+logger = logging.getLogger(__name__)
+
+class WorkableCache:
+    """In-memory cache keyed by (account, resource)
+
+    Fresh entries (younger than ``ttl``) are served directly. Entries past the
+    TTL but still inside the ``stale_ttl`` window are served as-is while a single
+    background thread refreshes them. Anything older is fetched synchronously.
+
+    The last good snapshot per key survives expiry and invalidation, and is
+    served whenever a synchronous fetch comes back empty (upstream down or the
+    Workable circuit open).
+
+    When a shared snapshot is configured (``WORKABLE_SNAPSHOT_PATH``), jobs and
+    candidates are served from it and this cache is only the fallback until
+    the refresher has written a version. Invalidation removes the snapshot
+    as well.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, stale_ttl: Optional[float] = None):
+        self.ttl = ttl if ttl is not None else float(os.environ.get('WORKABLE_CACHE_TTL', 300))
+        self.stale_ttl = stale_ttl if stale_ttl is not None else float(os.environ.get('WORKABLE_CACHE_STALE_TTL', 1800))
+
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Dict] = {}
+        self._last_good: Dict[Tuple[str, str], Dict] = {}
+        self._refreshing = set()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'stale_hits': 0,
+            'refreshes': 0,
+            'refresh_failures': 0,
+            'invalidations': 0,
+            'merges': 0,
+            'fallbacks': 0
+        }
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _store(self, key: Tuple[str, str], value: List[Dict]):
+        with self._lock:
+            entry = {'value': value, 'fetched_at': time.monotonic()}
+            self._entries[key] = entry
+            self._last_good[key] = entry
+
+    def _refresh(self, key: Tuple[str, str], loader: Callable[[], List[Dict]]):
+        try:
+            value = loader()
+            if value:
+                self._store(key, value)
+                self._count('refreshes')
+                logger.info(f"Refreshed cached Workable {key[1]} for {key[0]} ({len(value)} records)")
+            else:
+                # Keep serving the stale copy rather than replacing it with nothing
+                self._count('refresh_failures')
+                logger.warning(f"Background refresh of Workable {key[1]} returned no data, keeping stale copy")
+        except Exception as e:
+            self._count('refresh_failures')
+            logger.error(f"Background refresh of Workable {key[1]} failed: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _refresh_async(self, key: Tuple[str, str], loader: Callable[[], List[Dict]]):
+        """Start a background refresh unless one is already running for this key"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        thread = threading.Thread(target=self._refresh, args=(key, loader), daemon=True)
+        thread.start()
+
+    def get(self, account: str, resource: str, loader: Callable[[], List[Dict]]) -> List[Dict]:
+        """Return cached records for (account, resource), loading them when needed"""
+        key = (account, resource)
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry:
+            age = time.monotonic() - entry['fetched_at']
+            if age < self.ttl:
+                self._count('hits')
+                return entry['value']
+            if age < self.ttl + self.stale_ttl:
+                self._count('stale_hits')
+                self._refresh_async(key, loader)
+                return entry['value']
+
+        self._count('misses')
+        value = loader()
+        # Empty results usually mean the API is unavailable; don't pin them
+        if value:
+            self._store(key, value)
+            return value
+
+        with self._lock:
+            last_good = self._last_good.get(key)
+        if last_good:
+            self._count('fallbacks')
+            logger.warning(f"Workable {resource} unavailable, serving last good snapshot "
+                           f"({len(last_good['value'])} records)")
+            return last_good['value']
+        return value
+
+    def apply_changes(self, resource: str, records: List[Dict], account: Optional[str] = None) -> int:
+        """Merge changed records into the cached snapshots of ``resource``; returns how many were updated
+
+        Records replace the cached ones with the same id and new ids are
+        appended. The merged list is stored as a new snapshot with the
+        entry's original fetch time, so the cache is not emptied and the
+        usual TTL refresh still picks up deletions.
+        """
+        changed = {str(record['id']): record for record in records if record.get('id') is not None}
+        if not changed:
+            return 0
+        replaced: Dict[int, Dict] = {}
+        with self._lock:
+            for store in (self._entries, self._last_good):
+                for key, entry in list(store.items()):
+                    if key[1] != resource or (account is not None and key[0] != account):
+                        continue
+                    # The current entry is usually also the last good one; merge it once
+                    if id(entry) not in replaced:
+                        seen = set()
+                        merged = []
+                        for record in entry['value']:
+                            record_id = str(record.get('id'))
+                            seen.add(record_id)
+                            merged.append(changed.get(record_id, record))
+                        merged.extend(record for record_id, record in changed.items() if record_id not in seen)
+                        replaced[id(entry)] = {'value': RecordSnapshot(merged), 'fetched_at': entry['fetched_at']}
+                    store[key] = replaced[id(entry)]
+            self._stats['merges'] += len(replaced)
+        return len(replaced)
+
+    def invalidate(self, resource: Optional[str] = None, account: Optional[str] = None) -> int:
+        """Drop cached entries matching resource and/or account; returns how many were removed"""
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if (account is None or key[0] == account) and (resource is None or key[1] == resource)
+            ]
+            for key in keys:
+                del self._entries[key]
+            self._stats['invalidations'] += len(keys)
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cached Workable entries")
+        # Jobs and candidates are served from the shared snapshot when there is one, so it has to go too
+        removed = len(keys)
+        if account is None or account == workable_api.subdomain:
+            removed += int(workable_snapshot.invalidate())
+        return removed
+
+    def get_stats(self) -> Dict:
+        """Hit/miss/staleness counters and the age of each cached entry"""
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self._stats)
+            entries = {
+                f"{account}:{resource}": {
+                    'records': len(entry['value']),
+                    'age_seconds': round(now - entry['fetched_at'], 1),
+                    'stale': now - entry['fetched_at'] >= self.ttl,
+                    'refreshing': (account, resource) in self._refreshing
+                }
+                for (account, resource), entry in self._entries.items()
+            }
+            last_good_age = {
+                f"{account}:{resource}": round(now - entry['fetched_at'], 1)
+                for (account, resource), entry in self._last_good.items()
+            }
+
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats.update({
+            'ttl_seconds': self.ttl,
+            'stale_ttl_seconds': self.stale_ttl,
+            'hit_rate': round((stats['hits'] + stats['stale_hits']) / lookups, 4) if lookups else 0.0,
+            'entries': entries,
+            'last_good_age_seconds': last_good_age
+        })
+        return stats
+
+    @staticmethod
+    def _when_connected(fetch: Callable[[], List[Dict]]) -> Callable[[], List[Dict]]:
+        """Skip the upstream call while Workable is unconfigured or known to be down"""
+        return lambda: fetch() if workable_api.connected else []
+
+    def get_jobs(self) -> List[Dict]:
+        """Cached, normalized Workable jobs for the configured account"""
+        shared = workable_snapshot.get('jobs')
+        if shared:
+            return shared
+        return self.get(workable_api.subdomain, 'jobs',
+                        self._when_connected(lambda: normalize_jobs(workable_api.get_jobs())))
+
+    def get_candidates(self) -> List[Dict]:
+        """Cached, normalized Workable candidates for the configured account"""
+        shared = workable_snapshot.get('candidates')
+        if shared:
+            return shared
+        return self.get(workable_api.subdomain, 'candidates',
+                        self._when_connected(lambda: normalize_candidates(workable_api.get_candidates())))
+
+# Global instance
+workable_cache = WorkableCache()
+
+def invalidate_workable_jobs() -> int:
+    """Invalidation hook for anything that changes Workable jobs"""
+    return workable_cache.invalidate('jobs')
+
+def invalidate_workable_candidates() -> int:
+    """Invalidation hook for anything that changes Workable candidates"""
+    return workable_cache.invalidate('candidates')
@@ -0,0 +1,240 @@
+"""
+Workable SQL Mirror
+Bulk-upserts Workable jobs and candidates into the local Job, Consultant and
+Application tables with multi-row INSERT ... ON CONFLICT statements
+"""
+import os
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from services.workable_records import format_location
+from services.workable_sync import parse_workable_timestamp
+
+logger = logging.getLogger(__name__)
+
+# SQLite builds before 3.32 cap bound parameters per statement at 999
+SQLITE_MAX_VARIABLES = 999
+
+def job_row(record: Dict, now: datetime) -> Optional[Dict]:
+    """Map a formatted Workable job onto ``jobs`` columns"""
+    if record.get('id') is None:
+        return None
+    location = record.get('location')
+    requirements = record.get('requirements')
+    salary_range = None
+    if record.get('salary_min') or record.get('salary_max'):
+        salary_range = f"{record.get('salary_min') or ''}-{record.get('salary_max') or ''}"[:100]
+    return {
+        'workable_id': str(record['id']),
+        'shortcode': (record.get('shortcode') or '')[:50] or None,
+        'title': (record.get('title') or 'Untitled')[:100],
+        'description': record.get('description') or '',
+        'requirements': "\n".join(requirements) if isinstance(requirements, list) else (requirements or ''),
+        'location': format_location(location)[:100],
+        'job_type': (record.get('employment_type') or '')[:50],
+        'salary_range': salary_range,
+        'remote': bool(isinstance(location, dict) and location.get('telecommuting')),
+        'created_at': parse_workable_timestamp(record.get('created_at')) or now,
+        'updated_at': now
+    }
+
+def consultant_row(record: Dict, now: datetime) -> Optional[Dict]:
+    """Map a formatted Workable candidate onto ``consultants`` columns"""
+    # Consultant.email is required and unique; candidates without one can't be mirrored
+    if record.get('id') is None or not record.get('email'):
+        return None
+    try:
+        hourly_rate = float(record['hourly_rate']) if record.get('hourly_rate') else None
+    except (TypeError, ValueError):
+        hourly_rate = None
+    return {
+        'workable_id': str(record['id']),
+        'first_name': (record.get('first_name') or '')[:50],
+        'last_name': (record.get('last_name') or '')[:50],
+        'email': record['email'][:120],
+        'phone': (record.get('phone') or '')[:20],
+        'resume_url': (record.get('resume_url') or '')[:200] or None,
+        'status': (record.get('status') or '')[:50] or None,
+        'hourly_rate': hourly_rate,
+        'created_at': parse_workable_timestamp(record.get('created_at')) or now,
+        'updated_at': now
+    }
+
+def _dedupe(rows: Iterable[Dict], *keys: str) -> List[Dict]:
+    """Keep the last row per key so a statement never touches the same row twice"""
+    for key in keys:
+        rows = list({row[key]: row for row in rows}.values())
+    return list(rows)
+
+class WorkableMirror:
+    """Mirrors Workable records into the SQL tables via batched upserts
+
+    Works on PostgreSQL and SQLite, both of which support
+    ``INSERT ... ON CONFLICT (...) DO UPDATE``. If a batch trips a different
+    unique constraint (e.g. two Workable candidates sharing an email), the batch
+    is retried row by row and the offending rows are skipped.
+    """
+
+    def __init__(self):
+        self.batch_size = int(os.environ.get('WORKABLE_MIRROR_BATCH_SIZE', 500))
+        self._indexes_ready = False
+        self.stats = {'upserted': 0, 'skipped': 0, 'batches': 0, 'row_fallbacks': 0}
+
+    def _insert(self, table):
+        from app import db
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise ValueError(f"Workable mirror needs PostgreSQL or SQLite, not the {dialect} dialect")
+        return insert(table)
+
+    def _rows_per_batch(self, columns: int) -> int:
+        from app import db
+        if db.engine.dialect.name == 'sqlite':
+            return max(1, min(self.batch_size, SQLITE_MAX_VARIABLES // columns))
+        return self.batch_size
+
+    def ensure_indexes(self):
+        """Create the columns and indexes the upserts rely on, for tables that predate them"""
+        if self._indexes_ready:
+            return
+        from sqlalchemy import inspect, text
+        from app import db
+        from models import Job, Consultant, Application
+        existing = {column['name'] for column in inspect(db.engine).get_columns(Job.__tablename__)}
+        if 'shortcode' not in existing:
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(text(f"ALTER TABLE {Job.__tablename__} ADD COLUMN shortcode VARCHAR(50)"))
+            except Exception as e:
+                logger.error(f"Could not add jobs.shortcode: {str(e)}")
+        for model in (Job, Consultant, Application):
+            for index in model.__table__.indexes:
+                try:
+                    index.create(bind=db.engine, checkfirst=True)
+                except Exception as e:
+                    logger.error(f"Could not create index {index.name}: {str(e)}")
+        self._indexes_ready = True
+
+    def _upsert(self, table, rows: List[Dict], conflict_columns: List[str], update_columns: List[str]) -> int:
+        from app import db
+        if not rows:
+            return 0
+        written = 0
+        batch = self._rows_per_batch(len(rows[0]))
+        for start in range(0, len(rows), batch):
+            chunk = rows[start:start + batch]
+            try:
+                self._execute_upsert(table, chunk, conflict_columns, update_columns)
+                db.session.commit()
+                written += len(chunk)
+                self.stats['batches'] += 1
+            except IntegrityError as e:
+                db.session.rollback()
+                logger.warning(f"Batch upsert into {table.name} hit a constraint, retrying row by row: {str(e.orig)}")
+                self.stats['row_fallbacks'] += 1
+                for row in chunk:
+                    try:
+                        self._execute_upsert(table, [row], conflict_columns, update_columns)
+                        db.session.commit()
+                        written += 1
+                    except IntegrityError:
+                        db.session.rollback()
+                        self.stats['skipped'] += 1
+        self.stats['upserted'] += written
+        return written
+
+    def _execute_upsert(self, table, rows: List[Dict], conflict_columns: List[str], update_columns: List[str]):
+        from app import db
+        stmt = self._insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={column: stmt.excluded[column] for column in update_columns}
+        )
+        db.session.execute(stmt)
+
+    def upsert_jobs(self, records: Iterable[Dict]) -> int:
+        """Insert or update jobs keyed on workable_id; must run inside an app context"""
+        from models import Job
+        self.ensure_indexes()
+        now = datetime.utcnow()
+        rows = _dedupe(filter(None, (job_row(record, now) for record in records)), 'workable_id')
+        updates = [column for column in rows[0] if column not in ('workable_id', 'created_at')] if rows else []
+        return self._upsert(Job.__table__, rows, ['workable_id'], updates)
+
+    def upsert_candidates(self, records: Iterable[Dict]) -> int:
+        """Insert or update consultants keyed on workable_id; must run inside an app context"""
+        from models import Consultant
+        self.ensure_indexes()
+        now = datetime.utcnow()
+        rows = []
+        for record in records:
+            row = consultant_row(record, now)
+            if row is None:
+                self.stats['skipped'] += 1
+                continue
+            rows.append(row)
+        rows = _dedupe(rows, 'workable_id')
+        # Two Workable candidates sharing an email map onto one consultant; only the last is kept
+        deduped = len(rows)
+        rows = _dedupe(rows, 'email')
+        self.stats['skipped'] += deduped - len(rows)
+        updates = [column for column in rows[0] if column not in ('workable_id', 'created_at')] if rows else []
+        return self._upsert(Consultant.__table__, rows, ['workable_id'], updates)
+
+    def upsert_applications(self, candidates: Iterable[Dict]) -> int:
+        """Upsert one application per candidate for the job it applied to in Workable
+
+        Candidates reference their job by shortcode (older payloads by id), which
+        is resolved against the mirrored ``jobs`` table.
+        """
+        from app import db
+        from models import Application, Consultant, Job
+        self.ensure_indexes()
+
+        links = {}
+        for candidate in candidates:
+            job = candidate.get('job') or {}
+            if candidate.get('id') is not None and (job.get('shortcode') or job.get('id')):
+                links[str(candidate['id'])] = (job.get('shortcode'), job.get('id'), candidate.get('stage') or 'applied')
+        if not links:
+            return 0
+
+        consultant_ids = dict(db.session.query(Consultant.workable_id, Consultant.id)
+                              .filter(Consultant.workable_id.in_(list(links))).all())
+        shortcodes = {shortcode for shortcode, _, _ in links.values() if shortcode}
+        workable_ids = {str(job_id) for _, job_id, _ in links.values() if job_id is not None}
+        job_ids_by_shortcode = dict(db.session.query(Job.shortcode, Job.id)
+                                    .filter(Job.shortcode.in_(shortcodes)).all()) if shortcodes else {}
+        job_ids_by_workable_id = dict(db.session.query(Job.workable_id, Job.id)
+                                      .filter(Job.workable_id.in_(workable_ids)).all()) if workable_ids else {}
+
+        now = datetime.utcnow()
+        rows = []
+        for candidate_id, (shortcode, job_workable_id, stage) in links.items():
+            job_id = job_ids_by_shortcode.get(shortcode) or job_ids_by_workable_id.get(str(job_workable_id))
+            if candidate_id in consultant_ids and job_id:
+                rows.append({
+                    'consultant_id': consultant_ids[candidate_id],
+                    'job_id': job_id,
+                    'status': stage[:50],
+                    'application_date': now,
+                    'updated_at': now
+                })
+        return self._upsert(Application.__table__, rows, ['consultant_id', 'job_id'], ['status', 'updated_at'])
+
+    def upsert_rows(self, table, rows: List[Dict], conflict_columns: List[str], update_columns: List[str]) -> int:
+        """Batched INSERT ... ON CONFLICT for any table with a unique index on ``conflict_columns``"""
+        return self._upsert(table, rows, conflict_columns, update_columns)
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats)
+
+# Global instance
+workable_mirror = WorkableMirror()
@@ -0,0 +1,366 @@
+"""
+Workable Records
+Normalization stage for ingested Workable jobs and candidates: display fields are
+computed once per record version into compact, frozen slotted records
+"""
+import sys
+import marshal
+import threading
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def format_location(location) -> str:
+    """Flatten a Workable location dict into a display string"""
+    if isinstance(location, dict):
+        parts = [location.get('city')]
+        if location.get('region') and location.get('region') != location.get('city'):
+            parts.append(location.get('region'))
+        parts.append(location.get('country'))
+        return ", ".join(filter(None, parts))
+    return str(location or '')
+
+# Enum-like values shared by many records; interned so each distinct value is stored once
+INTERNED_FIELDS = frozenset({'status', 'stage', 'domain', 'experience', 'department',
+                             'employment_type', 'experience_level'})
+
+class WorkableRecord(Mapping):
+    """Read-only mapping view over a slotted record's fields
+
+    Records are shared by every request, the skill index and the dashboard
+    materializer, so they never change after construction. Only the fields
+    present in the source record are set; reading an unset one raises
+    ``KeyError`` (``AttributeError`` as an attribute), so ``get`` defaults,
+    ``in`` checks and Jinja's ``undefined`` behave exactly as they did for
+    dicts. Keys outside the schema are kept in ``extra``. ``copy()`` and
+    ``dict(record)`` give a plain, mutable dict; ``with_fields`` gives a
+    view with a few fields added or replaced without copying the rest.
+    Nested values (location dicts, skill lists) are shared and read-only.
+    """
+
+    __slots__ = ()
+
+    # Schema field names (everything but ``extra``), set per subclass below
+    FIELDS: ClassVar[Tuple[str, ...]] = ()
+    _field_set: ClassVar[frozenset] = frozenset()
+
+    @classmethod
+    def from_mapping(cls, source: Dict):
+        record = object.__new__(cls)
+        extra = None
+        for key, value in source.items():
+            if key in cls._field_set:
+                if key in INTERNED_FIELDS and type(value) is str:
+                    value = sys.intern(value)
+                object.__setattr__(record, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        object.__setattr__(record, 'extra', extra)
+        return record
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for name in self.FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict:
+        return dict(self)
+
+    def with_fields(self, **fields) -> 'RecordOverlay':
+        """A read-only view of this record with ``fields`` added or replaced; nothing is copied"""
+        return RecordOverlay(self, fields)
+
+    def __reduce__(self):
+        return (type(self).from_mapping, (dict(self),))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+@dataclass(frozen=True, slots=True, eq=False, repr=False)
+class JobRecord(WorkableRecord):
+    """A normalized Workable job (``WorkableAPIService._format_job`` plus display fields)"""
+    id: Any = None
+    shortcode: Optional[str] = None
+    title: Optional[str] = None
+    description: Any = None
+    requirements: Any = None
+    department: Optional[str] = None
+    employment_type: Optional[str] = None
+    experience_level: Optional[str] = None
+    location: Any = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    status: Optional[str] = None
+    application_url: Optional[str] = None
+    applications: Any = None
+    benefits: Any = None
+    salary_min: Any = None
+    salary_max: Any = None
+    rate_min: Any = None
+    rate_max: Any = None
+    formatted_location: Optional[str] = None
+    formatted_date: Optional[str] = None
+    formatted_description: Optional[str] = None
+    extra: Optional[Dict] = None
+
+@dataclass(frozen=True, slots=True, eq=False, repr=False)
+class CandidateRecord(WorkableRecord):
+    """A normalized Workable candidate (``WorkableAPIService._format_candidate`` plus display fields)"""
+    id: Any = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    stage: Optional[str] = None
+    status: Optional[str] = None
+    domain: Optional[str] = None
+    experience: Optional[str] = None
+    skills: Any = None
+    current_position: Optional[str] = None
+    cover_letter: Optional[str] = None
+    resume_url: Optional[str] = None
+    applications: Any = None
+    hourly_rate: Any = None
+    job: Any = None
+    formatted_date: Optional[str] = None
+    extra: Optional[Dict] = None
+
+for _record_type in (JobRecord, CandidateRecord):
+    _record_type.FIELDS = tuple(field.name for field in fields(_record_type) if field.name != 'extra')
+    _record_type._field_set = frozenset(_record_type.FIELDS)
+
+def format_display_date(value):
+    """``YYYY-MM-DD`` for an ISO timestamp string, anything else unchanged"""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+        except (ValueError, TypeError):
+            return value
+    return value
+
+def normalize_job(job: Dict) -> JobRecord:
+    """Frozen record of a job with its display fields filled in"""
+    if isinstance(job, JobRecord):
+        return job
+    normalized = dict(job)
+    if isinstance(job.get('location'), dict):
+        normalized['formatted_location'] = format_location(job['location'])
+    elif isinstance(job.get('location_str'), str):
+        normalized['formatted_location'] = job['location_str']
+    else:
+        normalized['formatted_location'] = str(job.get('location', 'Remote'))
+    normalized['formatted_date'] = format_display_date(job.get('created_at', ''))
+    if not job.get('rate_min'):
+        normalized['rate_min'] = job.get('salary_min', '60')
+    if not job.get('rate_max'):
+        normalized['rate_max'] = job.get('salary_max', '85')
+    description = job.get('description')
+    if isinstance(description, dict):
+        normalized['formatted_description'] = description.get('text', 'No description available')
+    elif isinstance(description, str):
+        normalized['formatted_description'] = description
+    else:
+        normalized['formatted_description'] = 'No description available'
+    return JobRecord.from_mapping(normalized)
+
+def normalize_candidate(candidate: Dict) -> CandidateRecord:
+    """Frozen record of a candidate with its display fields filled in"""
+    if isinstance(candidate, CandidateRecord):
+        return candidate
+    normalized = dict(candidate)
+    normalized['formatted_date'] = format_display_date(candidate.get('created_at', ''))
+    return CandidateRecord.from_mapping(normalized)
+
+class RecordOverlay(Mapping):
+    """A record seen through a few added or replaced fields, e.g. a match percentage for one page"""
+
+    __slots__ = ('record', 'fields')
+
+    def __init__(self, record: Mapping, fields: Dict):
+        self.record = record
+        self.fields = fields
+
+    def __getitem__(self, key):
+        if key in self.fields:
+            return self.fields[key]
+        return self.record[key]
+
+    def __iter__(self):
+        yield from self.record
+        for key in self.fields:
+            if key not in self.record:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict:
+        return dict(self)
+
+    def with_fields(self, **fields) -> 'RecordOverlay':
+        return RecordOverlay(self.record, {**self.fields, **fields})
+
+# Consultant row key -> (candidate key, default), as listed on the candidates and matching pages
+CONSULTANT_ROW_FIELDS = {
+    'id': ('id', ''),
+    'first_name': ('first_name', ''),
+    'last_name': ('last_name', ''),
+    'email': ('email', ''),
+    'phone': ('phone', ''),
+    'status': ('status', 'available'),
+    'hourly_rate': ('hourly_rate', 0),
+    'skills': ('skills', []),
+    'created_at': ('created_at', ''),
+    'applications': ('total_applications', 0)
+}
+
+class ConsultantRow(Mapping):
+    """A candidate as a consultant row, read from the record on access instead of copied
+
+    Comma-separated skill strings are split into a list.
+    """
+
+    __slots__ = ('candidate',)
+
+    def __init__(self, candidate: Dict):
+        self.candidate = candidate
+
+    def __getitem__(self, key):
+        source, default = CONSULTANT_ROW_FIELDS[key]
+        value = self.candidate.get(source, default)
+        if key == 'skills' and isinstance(value, str):
+            value = [skill.strip() for skill in value.split(',')]
+        return value
+
+    def __iter__(self):
+        return iter(CONSULTANT_ROW_FIELDS)
+
+    def __len__(self) -> int:
+        return len(CONSULTANT_ROW_FIELDS)
+
+class RecordSnapshot(list):
+    """A list of records plus id and shortcode lookup maps built with it
+
+    The cache stores and hands out the snapshot as one object, so a refresh
+    swaps the list and its maps together. Snapshots are never modified after
+    construction; slicing or filtering one gives a plain list. ``skills``
+    optionally carries skills already extracted per record id (the shared
+    snapshot ships them for jobs). ``memo`` holds views derived from the
+    records (e.g. newest-N selections) and lives exactly as long as they do.
+    """
+
+    def __init__(self, records: Iterable[Dict] = ()):
+        super().__init__(records)
+        self.skills: Dict[str, List[str]] = {}
+        self.memo: Dict[tuple, Any] = {}
+        self.by_id: Dict[str, Dict] = {str(record['id']): record for record in self if record.get('id') is not None}
+        self.by_shortcode: Dict[str, Dict] = {record['shortcode']: record for record in self if record.get('shortcode')}
+
+    def get_by_id(self, record_id) -> Optional[Dict]:
+        return self.by_id.get(str(record_id)) if record_id is not None else None
+
+    def get_by_shortcode(self, shortcode) -> Optional[Dict]:
+        return self.by_shortcode.get(shortcode) if shortcode else None
+
+NORMALIZERS = {'jobs': normalize_job, 'candidates': normalize_candidate}
+
+def version_key(record: Dict) -> int:
+    """Content hash of a source record, small enough to keep per id instead of the record itself"""
+    try:
+        # Format version 2 writes no back-references, so equal content always gives equal bytes
+        return hash(marshal.dumps(record, 2))
+    except ValueError:
+        # Values marshal can't encode (e.g. datetimes in sample data)
+        return hash(repr(record))
+
+class RecordNormalizer:
+    """Normalizes each record version once and hands back the same frozen object after that
+
+    A content hash of the source record each normalized one was built from
+    is remembered by id; the source itself is not kept, so it can be freed
+    once normalized. When a refresh or sync delivers an identical record again, the existing
+    frozen record is returned, so the object identity downstream caches key
+    on (skill index, dashboard stats, candidate pages) stays stable for
+    records that did not change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, Dict[str, Tuple[int, WorkableRecord]]] = {resource: {} for resource in NORMALIZERS}
+        self.stats = {'normalized': 0, 'reused': 0}
+
+    def _normalize(self, resource: str, record: Dict, versions: Dict[str, Tuple[int, WorkableRecord]],
+                   previous: Dict[str, Tuple[int, WorkableRecord]]) -> WorkableRecord:
+        if isinstance(record, WorkableRecord) or record.get('id') is None:
+            return NORMALIZERS[resource](record)
+        record_id = str(record['id'])
+        key = version_key(record)
+        known = previous.get(record_id)
+        if known is not None and known[0] == key:
+            self.stats['reused'] += 1
+            versions[record_id] = known
+            return known[1]
+        normalized = NORMALIZERS[resource](record)
+        self.stats['normalized'] += 1
+        versions[record_id] = (key, normalized)
+        return normalized
+
+    def normalize(self, resource: str, record: Dict) -> WorkableRecord:
+        """Normalize one changed record (sync feed, detail fetch)"""
+        with self._lock:
+            versions = self._versions[resource]
+            return self._normalize(resource, record, versions, versions)
+
+    def normalize_all(self, resource: str, records: Iterable[Dict]) -> RecordSnapshot:
+        """Normalize a full snapshot; versions of records no longer present are forgotten"""
+        records = list(records)
+        if not records:
+            # An empty load means Workable was unavailable; keep the versions for the next one
+            return RecordSnapshot()
+        with self._lock:
+            previous = self._versions[resource]
+            versions: Dict[str, Tuple[int, WorkableRecord]] = {}
+            normalized = [self._normalize(resource, record, versions, previous) for record in records]
+            self._versions[resource] = versions
+        return RecordSnapshot(normalized)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'jobs': len(self._versions['jobs']),
+                'candidates': len(self._versions['candidates']),
+                **self.stats
+            }
+
+# Global instance
+record_normalizer = RecordNormalizer()
+
+def normalize_jobs(jobs: Iterable[Dict]) -> RecordSnapshot:
+    return record_normalizer.normalize_all('jobs', jobs)
+
+def normalize_candidates(candidates: Iterable[Dict]) -> RecordSnapshot:
+    return record_normalizer.normalize_all('candidates', candidates)
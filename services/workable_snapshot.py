@@ -0,0 +1,387 @@
+"""
+Workable Snapshot
+Versioned snapshot file of Workable data written by one process and loaded by every worker
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import marshal
+import struct
+import tempfile
+import threading
+import logging
+import multiprocessing
+from typing import Dict, Optional
+
+from services.workable_records import RecordSnapshot, normalize_candidates, normalize_job, normalize_jobs
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'WKSNAP01'
+# Magic, then the length of the JSON header that follows it
+PREFIX = struct.Struct('<8sI')
+RESOURCES = ('jobs', 'candidates')
+
+def write_snapshot(path: str, sections: Dict[str, object]) -> int:
+    """Atomically replace the snapshot at ``path``; returns the new version
+
+    Each section is marshalled into one contiguous blob, and a JSON header
+    records where each blob starts. The snapshot holds candidate contact
+    details, so its directory is created private and the file is written
+    owner-only (``mkstemp``) beside ``path`` and renamed over it; readers see
+    either the old version or the new one.
+    """
+    version = time.time_ns()
+    blobs = {name: marshal.dumps(value) for name, value in sections.items()}
+    offsets, position = {}, 0
+    for name, blob in blobs.items():
+        offsets[name] = [position, len(blob)]
+        position += len(blob)
+    header = json.dumps({
+        'version': version,
+        'written_at': time.time(),
+        'marshal_version': marshal.version,
+        'sections': offsets
+    }).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix='.workable-snapshot-', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(PREFIX.pack(MAGIC, len(header)))
+            f.write(header)
+            for blob in blobs.values():
+                f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return version
+
+def read_snapshot(path: str) -> Dict:
+    """Header and decoded sections of the snapshot at ``path``
+
+    The file is read once and every section is decoded in full; workers hold
+    their own decoded records, so sharing the file saves upstream calls and
+    skill extraction, not per-worker record memory.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, header_length = PREFIX.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a Workable snapshot")
+    header = json.loads(data[PREFIX.size:PREFIX.size + header_length])
+    if header['marshal_version'] != marshal.version:
+        raise ValueError(f"Snapshot was written with marshal version {header['marshal_version']}")
+    base = PREFIX.size + header_length
+    with memoryview(data) as view:
+        sections = {}
+        for name, (offset, length) in header['sections'].items():
+            with view[base + offset:base + offset + length] as blob:
+                sections[name] = marshal.loads(blob)
+    return {'header': header, 'sections': sections}
+
+class WorkableSnapshot:
+    """A worker's view of the shared snapshot file
+
+    Enabled by ``WORKABLE_SNAPSHOT_PATH``. At most once per
+    ``check_interval`` a request triggers a background stat of the file;
+    when it has been replaced, the new version is decoded and swapped in as
+    a whole while requests keep being served the previous one. Only the very
+    first load is waited for. Records are normalized through
+    the shared normalizer, so records that did not change between versions
+    keep their identity and downstream caches only redo the changed ones.
+
+    This is a shared file, not shared memory: every worker decodes its own
+    copy of the records, so it saves upstream calls and skill extraction
+    per worker but not record memory.
+    """
+
+    def __init__(self):
+        self.path = os.environ.get('WORKABLE_SNAPSHOT_PATH', '')
+        self.check_interval = float(os.environ.get('WORKABLE_SNAPSHOT_CHECK_INTERVAL', 1))
+
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._checking = False
+        self._file_identity = None
+        self._checked_at = 0.0
+        self._header: Dict = {}
+        self._records: Dict[str, RecordSnapshot] = {}
+        self.stats = {'loads': 0, 'load_errors': 0, 'last_load_ms': 0.0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def get(self, resource: str) -> Optional[RecordSnapshot]:
+        """Records of ``resource`` from the newest snapshot, or None when there is none yet"""
+        if not self.path:
+            return None
+        self._reload_if_replaced()
+        return self._records.get(resource)
+
+    def _reload_if_replaced(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        if not self._records:
+            # Nothing to serve yet: this request waits for the first version
+            self._check()
+            return
+        with self._lock:
+            if self._checking:
+                return
+            self._checking = True
+        # Later versions are decoded in the background while the current one keeps being served
+        threading.Thread(target=self._check, daemon=True).start()
+
+    def _check(self):
+        with self._load_lock:
+            try:
+                if self._records and time.monotonic() - self._checked_at < self.check_interval:
+                    return
+                self._checked_at = time.monotonic()
+                try:
+                    stat = os.stat(self.path)
+                except FileNotFoundError:
+                    if self._records:
+                        # Invalidated: stop serving it until the refresher writes a new version
+                        logger.info(f"Workable snapshot {self.path} was removed, falling back to the cache")
+                        self._drop()
+                    return
+                identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+                if identity != self._file_identity:
+                    self._load()
+                    self._file_identity = identity
+            except Exception as e:
+                self.stats['load_errors'] += 1
+                logger.error(f"Could not load Workable snapshot {self.path}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._checking = False
+
+    def _drop(self):
+        self._records = {}
+        self._header = {}
+        self._file_identity = None
+
+    def invalidate(self) -> bool:
+        """Remove the shared snapshot so no worker keeps serving it; True if there was one
+
+        Every worker drops its copy on its next check and falls back to the
+        cache, and the refresher rewrites the snapshot from Workable as soon
+        as it notices the file is gone.
+        """
+        if not self.path:
+            return False
+        with self._load_lock:
+            try:
+                os.remove(self.path)
+                removed = True
+            except FileNotFoundError:
+                removed = False
+            self._drop()
+            self._checked_at = 0.0
+        if removed:
+            logger.info(f"Invalidated Workable snapshot {self.path}")
+        return removed
+
+    def _load(self):
+        started = time.monotonic()
+        snapshot = read_snapshot(self.path)
+        sections = snapshot['sections']
+        jobs = normalize_jobs(sections.get('jobs', []))
+        jobs.skills = sections.get('job_skills', {})
+        candidates = normalize_candidates(sections.get('candidates', []))
+        self._records = {'jobs': jobs, 'candidates': candidates}
+        self._header = snapshot['header']
+        self.stats['loads'] += 1
+        self.stats['last_load_ms'] = round((time.monotonic() - started) * 1000, 1)
+        logger.info(f"Loaded Workable snapshot version {self._header['version']} "
+                    f"({len(jobs)} jobs, {len(candidates)} candidates)")
+
+    def get_stats(self) -> Dict:
+        header, records = self._header, self._records
+        return {
+            'enabled': self.enabled,
+            'path': self.path,
+            'version': header.get('version'),
+            'age_seconds': round(time.time() - header['written_at'], 1) if header else None,
+            'records': {resource: len(snapshot) for resource, snapshot in records.items()},
+            **self.stats
+        }
+
+# Global instance
+workable_snapshot = WorkableSnapshot()
+
+class SnapshotRefresher:
+    """Keeps the shared snapshot current from one process for the whole server
+
+    Every ``interval`` seconds it runs the incremental Workable sync (which
+    also mirrors changes into the database) and writes a new version when
+    anything changed. Every ``full_interval`` seconds it re-reads the whole
+    account, which is what drops deleted records. Upstream calls, skill
+    extraction and persistence therefore happen once per server instead of
+    once per worker. A resource that comes back empty (upstream down,
+    circuit open) keeps its previous contents rather than blanking every
+    worker.
+    """
+
+    def __init__(self, path: str, interval: Optional[float] = None, full_interval: Optional[float] = None):
+        self.path = path
+        self.interval = interval if interval is not None else float(os.environ.get('WORKABLE_SYNC_INTERVAL', 300))
+        self.full_interval = full_interval if full_interval is not None else float(
+            os.environ.get('WORKABLE_SNAPSHOT_FULL_INTERVAL', 3600))
+        self._sections: Dict[str, object] = {}
+        self._last_full: Optional[float] = None
+
+    def refresh(self) -> Optional[int]:
+        """Write a new snapshot version; None when there was nothing new to write"""
+        from services.workable_api import workable_api
+        from services.skill_extractor import skill_extractor
+
+        if not workable_api.connected:
+            return None
+        fetched = {'jobs': workable_api.get_jobs(), 'candidates': workable_api.get_candidates()}
+        if not any(fetched.values()):
+            logger.warning("Workable returned no data, keeping the current snapshot")
+            return None
+        for resource in RESOURCES:
+            if fetched[resource]:
+                self._sections[resource] = fetched[resource]
+            elif resource in self._sections:
+                logger.warning(f"Workable {resource} unavailable, keeping them from the previous snapshot")
+        if fetched['jobs']:
+            # Job skills are extracted here once, for the skill index of every worker
+            self._sections['job_skills'] = {
+                str(job['id']): skill_extractor.extract_from_job(normalize_job(job))
+                for job in fetched['jobs'] if job.get('id') is not None
+            }
+        self._last_full = time.monotonic()
+        return self._write()
+
+    def sync(self) -> Optional[int]:
+        """Run the incremental sync and fold its changes into the snapshot; None when nothing changed"""
+        from services.workable_sync import workable_sync
+        from services.skill_extractor import skill_extractor
+
+        results = workable_sync.sync_all()
+        changed = False
+        for resource in RESOURCES:
+            result = results.get(resource) or {}
+            if resource not in self._sections:
+                # A complete first (full) sync already read the whole account: start the snapshot from it
+                if result.get('mode') == 'full' and result.get('complete'):
+                    self._sections[resource] = [dict(record) for record in workable_sync.get_records(resource)]
+                    changed = True
+                continue
+            records = workable_sync.last_changes.get(resource) or []
+            if not records:
+                continue
+            updates = {str(record['id']): dict(record) for record in records if record.get('id') is not None}
+            current = self._sections[resource]
+            known = {str(record.get('id')) for record in current}
+            self._sections[resource] = (
+                [updates.get(str(record.get('id')), record) for record in current] +
+                [record for record_id, record in updates.items() if record_id not in known]
+            )
+            changed = True
+        if not changed:
+            return None
+        if 'jobs' in self._sections:
+            changed_jobs = {str(record['id']) for record in workable_sync.last_changes.get('jobs') or []
+                            if record.get('id') is not None}
+            previous = self._sections.get('job_skills') or {}
+            skills = {}
+            for job in self._sections['jobs']:
+                if job.get('id') is None:
+                    continue
+                job_id = str(job['id'])
+                # Skills are only re-extracted for new or changed jobs
+                if job_id in previous and job_id not in changed_jobs:
+                    skills[job_id] = previous[job_id]
+                else:
+                    skills[job_id] = skill_extractor.extract_from_job(normalize_job(job))
+            self._sections['job_skills'] = skills
+        if self._last_full is None and all(resource in self._sections for resource in RESOURCES):
+            self._last_full = time.monotonic()
+        return self._write()
+
+    def _write(self) -> int:
+        version = write_snapshot(self.path, self._sections)
+        logger.info(f"Wrote Workable snapshot version {version} to {self.path}")
+        return version
+
+    def rewrite_if_invalidated(self) -> Optional[int]:
+        """Re-read Workable when a worker removed the snapshot; falls back to the last contents if that fails"""
+        if not self._sections or os.path.exists(self.path):
+            return None
+        logger.info("Workable snapshot was invalidated, re-reading Workable")
+        try:
+            version = self.refresh()
+        except Exception as e:
+            logger.error(f"Workable snapshot refresh failed: {str(e)}")
+            version = None
+        # Without fresh data, workers are still better off sharing the last snapshot than each fetching
+        return version if version is not None else self._write()
+
+    def run_forever(self):
+        parent = os.getppid()
+        # Stop once the server that started us is gone
+        while os.getppid() == parent:
+            try:
+                self.sync()
+            except Exception as e:
+                logger.error(f"Workable snapshot sync failed: {str(e)}")
+            try:
+                if self._last_full is None or time.monotonic() - self._last_full >= self.full_interval:
+                    self.refresh()
+            except Exception as e:
+                logger.error(f"Workable snapshot refresh failed: {str(e)}")
+            # Sleep in short steps so an invalidation is picked up within a second
+            deadline = time.monotonic() + self.interval
+            while time.monotonic() < deadline and os.getppid() == parent:
+                time.sleep(1)
+                self.rewrite_if_invalidated()
+
+def _refresher_main(path: str, interval: Optional[float]):
+    logging.basicConfig(level=logging.INFO)
+    SnapshotRefresher(path, interval).run_forever()
+
+def start_snapshot_refresher(path: Optional[str] = None, interval: Optional[float] = None):
+    """Start the refresher process (e.g. from gunicorn's ``when_ready``); None when no path is configured"""
+    path = path or os.environ.get('WORKABLE_SNAPSHOT_PATH')
+    if not path:
+        return None
+    # Spawned rather than forked so it does not inherit the server's threads and sockets
+    context = multiprocessing.get_context('spawn')
+    process = context.Process(target=_refresher_main, args=(path, interval),
+                              name='workable-snapshot-refresher', daemon=True)
+    process.start()
+    logger.info(f"Workable snapshot refresher started (pid {process.pid}, writing {path})")
+    return process
+
+def main():
+    """CLI entry point: write one snapshot, or keep refreshing it"""
+    parser = argparse.ArgumentParser(description="Write the shared Workable snapshot")
+    parser.add_argument('--path', default=os.environ.get('WORKABLE_SNAPSHOT_PATH'), required=not os.environ.get('WORKABLE_SNAPSHOT_PATH'))
+    parser.add_argument('--interval', type=float, default=None, help="seconds between incremental syncs")
+    parser.add_argument('--once', action='store_true', help="write one full snapshot and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    refresher = SnapshotRefresher(args.path, args.interval)
+    if args.once:
+        return 0 if refresher.refresh() else 1
+    refresher.run_forever()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
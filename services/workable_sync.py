@@ -0,0 +1,285 @@
+"""
+Workable Incremental Sync
+Pulls only the jobs and candidates changed since the last high-water mark and
+merges them into the local Job / Consultant store
+"""
+import os
+import threading
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from services.workable_api import workable_api
+
+logger = logging.getLogger(__name__)
+
+SYNC_RESOURCES = ('jobs', 'candidates')
+
+def parse_workable_timestamp(value) -> Optional[datetime]:
+    """Parse a Workable ISO timestamp into a naive UTC datetime (the models' convention)"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+class WorkableSyncEngine:
+    """Incremental Workable sync driven by per-resource high-water marks
+
+    Each run asks Workable only for records with ``updated_after`` the stored
+    mark (minus a small overlap, since merges are idempotent), merges them into
+    an in-memory store keyed by Workable id and, when a database is configured,
+    bulk-upserts them into the ``Job`` and ``Consultant`` tables. The mark only advances when the
+    whole change feed was read successfully.
+    """
+
+    def __init__(self, api=None):
+        self.api = api or workable_api
+        self.overlap = timedelta(seconds=int(os.environ.get('WORKABLE_SYNC_OVERLAP', 60)))
+        self.interval = int(os.environ.get('WORKABLE_SYNC_INTERVAL', 300))
+
+        self._run_lock = threading.Lock()
+        self._store_lock = threading.Lock()
+        self._state_loaded = False
+        self.watermarks: Dict[str, Optional[datetime]] = {resource: None for resource in SYNC_RESOURCES}
+        self.store: Dict[str, Dict[str, Dict]] = {resource: {} for resource in SYNC_RESOURCES}
+        self.last_results: Dict[str, Dict] = {}
+        # Normalized records changed by the latest run of each resource
+        self.last_changes: Dict[str, List[Dict]] = {resource: [] for resource in SYNC_RESOURCES}
+
+        self.sync_thread = None
+        self.running = False
+        self._start_lock = threading.Lock()
+
+    # Local store -----------------------------------------------------------
+
+    def get_records(self, resource: str) -> List[Dict]:
+        """Locally merged records for a resource"""
+        with self._store_lock:
+            return list(self.store[resource].values())
+
+    def _merge_into_store(self, resource: str, records: List[Dict]):
+        with self._store_lock:
+            store = self.store[resource]
+            for record in records:
+                if record.get('id') is not None:
+                    store[str(record['id'])] = record
+
+    # Database persistence --------------------------------------------------
+
+    def _database_ready(self) -> bool:
+        from app import app
+        return 'sqlalchemy' in app.extensions
+
+    def _load_state(self):
+        """Restore watermarks from the database once per process"""
+        if self._state_loaded:
+            return
+        self._state_loaded = True
+        if not self._database_ready():
+            return
+        try:
+            from app import app
+            from models import WorkableSyncState
+            with app.app_context():
+                for state in WorkableSyncState.query.all():
+                    if state.resource in self.watermarks:
+                        self.watermarks[state.resource] = state.high_water_mark
+            logger.info(f"Loaded Workable sync watermarks: {self.watermarks}")
+        except Exception as e:
+            logger.error(f"Could not load Workable sync watermarks: {str(e)}")
+
+    def _save_state(self, resource: str, high_water_mark: Optional[datetime], count: int):
+        if not self._database_ready():
+            return
+        try:
+            from app import app, db
+            from models import WorkableSyncState
+            with app.app_context():
+                state = db.session.get(WorkableSyncState, resource) or WorkableSyncState(resource=resource)
+                state.high_water_mark = high_water_mark
+                state.last_synced_at = datetime.utcnow()
+                state.last_sync_count = count
+                db.session.add(state)
+                db.session.commit()
+        except Exception as e:
+            logger.error(f"Could not save Workable sync watermark for {resource}: {str(e)}")
+
+    def _persist(self, resource: str, records: List[Dict]) -> int:
+        """Bulk-upsert changed records into the SQL mirror"""
+        if not records or not self._database_ready():
+            return 0
+        from app import app, db
+        from services.skill_registry import skill_registry
+        from services.workable_mirror import workable_mirror
+
+        with app.app_context():
+            try:
+                if resource == 'jobs':
+                    return workable_mirror.upsert_jobs(records)
+                persisted = workable_mirror.upsert_candidates(records)
+                workable_mirror.upsert_applications(records)
+                # Skills first seen in this batch get their rows in the skills table
+                skill_registry.flush()
+                return persisted
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Failed to persist synced Workable {resource}: {str(e)}")
+                return 0
+
+    # Sync ------------------------------------------------------------------
+
+    def _changes_since(self, resource: str, since: Optional[datetime]):
+        updated_after = (since - self.overlap).strftime('%Y-%m-%dT%H:%M:%SZ') if since else None
+        if resource == 'jobs':
+            return self.api.iter_jobs(updated_after=updated_after, strict=True)
+        return self.api.iter_candidates(updated_after=updated_after, strict=True)
+
+    def sync_resource(self, resource: str) -> Dict:
+        """Fetch and merge everything changed since the resource's high-water mark"""
+        if resource not in SYNC_RESOURCES:
+            raise ValueError(f"Unknown Workable sync resource: {resource}")
+
+        with self._run_lock:
+            self._load_state()
+            started = time.monotonic()
+            since = self.watermarks.get(resource)
+            high_water_mark = since
+            changed = []
+            complete = True
+
+            try:
+                for record in self._changes_since(resource, since):
+                    changed.append(record)
+                    stamp = parse_workable_timestamp(record.get('updated_at') or record.get('created_at'))
+                    if stamp and (high_water_mark is None or stamp > high_water_mark):
+                        high_water_mark = stamp
+            except Exception as e:
+                complete = False
+                logger.error(f"Incremental Workable sync of {resource} interrupted: {str(e)}")
+
+            # Freeze records with their display fields once here, before anything shares them
+            from services.workable_records import record_normalizer
+            changed = [record_normalizer.normalize(resource, record) for record in changed]
+
+            self._merge_into_store(resource, changed)
+            persisted = self._persist(resource, changed)
+
+            if complete:
+                self.watermarks[resource] = high_water_mark
+                self._save_state(resource, high_water_mark, len(changed))
+
+            self.last_changes[resource] = changed
+            if changed:
+                # Merge into the cached snapshot rather than dropping it, so no request waits on a full re-download
+                from services.workable_cache import workable_cache
+                workable_cache.apply_changes(resource, changed)
+                try:
+                    from services.batch_matcher import batch_matcher
+                    batch_matcher.apply_changes(resource, changed)
+                except Exception as e:
+                    logger.error(f"Incremental match update for {resource} failed: {str(e)}")
+                try:
+                    from services.dashboard_stats import dashboard_stats
+                    dashboard_stats.apply_changes(resource, changed)
+                except Exception as e:
+                    logger.error(f"Dashboard stats update for {resource} failed: {str(e)}")
+
+            result = {
+                'resource': resource,
+                'mode': 'incremental' if since else 'full',
+                'since': since.isoformat() if since else None,
+                'high_water_mark': self.watermarks[resource].isoformat() if self.watermarks[resource] else None,
+                'changed': len(changed),
+                'persisted': persisted,
+                'complete': complete,
+                'local_records': len(self.store[resource]),
+                'duration_ms': round((time.monotonic() - started) * 1000, 1),
+                'finished_at': datetime.now().isoformat()
+            }
+            self.last_results[resource] = result
+            logger.info(f"Workable {resource} sync: {len(changed)} changed since {result['since']}")
+            return result
+
+    def sync_all(self) -> Dict[str, Dict]:
+        if not self.api.connected:
+            return {}
+        return {resource: self.sync_resource(resource) for resource in SYNC_RESOURCES}
+
+    def reset(self, resource: Optional[str] = None):
+        """Forget watermarks so the next run does a full resync"""
+        with self._run_lock:
+            for name in ([resource] if resource else SYNC_RESOURCES):
+                self.watermarks[name] = None
+                self._save_state(name, None, 0)
+
+    # Background loop -------------------------------------------------------
+
+    def _sync_loop(self):
+        while self.running:
+            try:
+                self.sync_all()
+            except Exception as e:
+                logger.error(f"Workable sync loop error: {str(e)}")
+            time.sleep(self.interval)
+
+    def start_background_sync(self):
+        """Run incremental syncs every ``interval`` seconds in a daemon thread"""
+        if self.sync_thread and self.sync_thread.is_alive():
+            logger.warning("Workable sync already running")
+            return self.sync_thread
+        self.running = True
+        self.sync_thread = threading.Thread(target=self._sync_loop, daemon=True)
+        self.sync_thread.start()
+        logger.info(f"Workable incremental sync started (every {self.interval}s)")
+        return self.sync_thread
+
+    def ensure_background_sync(self):
+        """Start the background sync in this process unless it already runs here
+
+        Cheap enough to call on every request. A forked worker sees the
+        parent's thread as dead, so each process starts its own.
+        """
+        thread = self.sync_thread
+        if thread and thread.is_alive():
+            return thread
+        with self._start_lock:
+            if self.sync_thread is not thread and self.sync_thread.is_alive():
+                return self.sync_thread
+            return self.start_background_sync()
+
+    def stop_background_sync(self):
+        self.running = False
+
+    def get_status(self) -> Dict:
+        from services.workable_mirror import workable_mirror
+        return {
+            'running': bool(self.sync_thread and self.sync_thread.is_alive()),
+            'interval_seconds': self.interval,
+            'watermarks': {
+                resource: mark.isoformat() if mark else None
+                for resource, mark in self.watermarks.items()
+            },
+            'local_records': {resource: len(records) for resource, records in self.store.items()},
+            'last_results': self.last_results,
+            'mirror': workable_mirror.get_stats()
+        }
+
+# Global instance
+workable_sync = WorkableSyncEngine()
+
+def start_workable_sync():
+    """Initialize and start the background incremental sync"""
+    return workable_sync.start_background_sync()
+
+def ensure_workable_sync():
+    """Start the background incremental sync in the calling process if it isn't running there yet"""
+    return workable_sync.ensure_background_sync()
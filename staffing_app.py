@@ -31,6 +31,9 @@ from auto_recovery import auto_recovery
 # Import app and database from main app module
 from app import app, db
 from models import User, Client, Consultant, Job, Application, Placement, Skill, JobSkill
+from services.request_memo import request_memo
+from services.fan_out import fan_out
+from services.workable_snapshot import workable_snapshot
 
 # Enhanced health check endpoint with self-diagnostics
 @app.route('/health-detailed')
@@ -50,12 +53,39 @@ def health_check_detailed():
         db_status = f"error: {str(e)}"
         health_report = {"overall_status": "unhealthy", "components": {"database": db_status}}
     
+    # Workable HTTP session and cache: keep-alive reuse, retries and cache hit rates
+    try:
+        from services.workable_api import workable_api
+        from services.workable_cache import workable_cache
+        workable_http = workable_api.get_http_stats()
+        workable_cache_stats = workable_cache.get_stats()
+        workable_circuit = workable_api.breaker.get_stats()
+    except Exception as e:
+        logger.error(f"Workable stats unavailable: {e}")
+        workable_http = {"error": str(e)}
+        workable_cache_stats = {"error": str(e)}
+        workable_circuit = {"error": str(e)}
+    
+    try:
+        from services.dashboard_stats import dashboard_stats
+        dashboard_freshness = dashboard_stats.get_stats()
+    except Exception as e:
+        logger.error(f"Dashboard stats unavailable: {e}")
+        dashboard_freshness = {"error": str(e)}
+    
     return jsonify({
         "status": health_report.get("overall_status", "healthy"),
         "timestamp": datetime.now().isoformat(),
         "database": db_status,
         "service": "Growth Accelerator Platform",
         "detailed_health": health_report,
+        "workable_http": workable_http,
+        "workable_cache": workable_cache_stats,
+        "workable_circuit": workable_circuit,
+        "dashboard_stats": dashboard_freshness,
+        "request_memo": request_memo.get_stats(),
+        "fan_out": fan_out.get_stats(),
+        "workable_snapshot": workable_snapshot.get_stats(),
         "error_summary": error_handler.get_error_summary()
     })
 
@@ -313,41 +343,12 @@ for route in csrf_exempt_routes:
 # Utility functions
 def extract_skills_from_job(job_details):
     """Extract skills from job details using authentic data"""
-    if not job_details:
-        return []
-        
-    skills = []
-    # List of common job skills to look for
-    common_skills = [
-        'Python', 'JavaScript', 'TypeScript', 'React', 'Angular', 'Vue', 
-        'Node.js', 'Java', 'C#', '.NET', 'PHP', 'Ruby', 'Go', 'Rust',
-        'SQL', 'NoSQL', 'MongoDB', 'PostgreSQL', 'MySQL', 'Redis',
-        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins',
-        'DevOps', 'CI/CD', 'Git', 'Agile', 'Scrum', 'Kanban',
-        'REST', 'GraphQL', 'API', 'HTML', 'CSS', 'SASS', 'LESS',
-        'Machine Learning', 'AI', 'Data Science', 'Big Data', 'Hadoop',
-        'Marketing', 'SEO', 'SEM', 'Content Strategy', 'Social Media',
-        'UI/UX', 'Product Management', 'Growth Hacking'
-    ]
-    
     try:
-        # Extract from requirements
-        requirements_text = job_details.get('requirements', '')
-        if requirements_text:
-            for skill in common_skills:
-                if skill.lower() in requirements_text.lower():
-                    skills.append(skill)
-        
-        # Extract from description if we have few skills
-        if len(skills) < 2 and job_details.get('description'):
-            description_text = job_details.get('description', '')
-            for skill in common_skills:
-                if skill not in skills and skill.lower() in description_text.lower():
-                    skills.append(skill)
+        from services.skill_extractor import skill_extractor
+        return skill_extractor.extract_from_job(job_details)
     except Exception as e:
         logger.error(f"Error extracting skills: {str(e)}")
-        
-    return skills
+        return []
 
 # Auto-login functionality is disabled to require actual login
 # Uncomment the below code to re-enable auto-login if needed
@@ -405,6 +406,8 @@ def create_workable_match():
             
             if result:
                 logger.info(f"Successfully created match: candidate {candidate_id} to job {job_shortcode}")
+                from services.workable_cache import invalidate_workable_candidates
+                invalidate_workable_candidates()
                 return jsonify({
                     'status': 'success',
                     'message': 'Match created successfully in Workable',
@@ -519,6 +522,61 @@ def test_workable_api():
     
     return jsonify(test_results)
 
+@app.route('/api/workable/cache', methods=['GET', 'DELETE'])
+@csrf.exempt
+def workable_cache_status():
+    """Inspect or invalidate the Workable data cache"""
+    try:
+        from services.workable_cache import workable_cache
+        
+        if request.method == 'DELETE':
+            resource = request.args.get('resource')
+            removed = workable_cache.invalidate(resource)
+            return jsonify({
+                'status': 'success',
+                'invalidated': removed,
+                'timestamp': datetime.now().isoformat()
+            })
+        
+        return jsonify(workable_cache.get_stats())
+    except Exception as e:
+        logger.error(f"Error in workable_cache_status: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
+@app.route('/api/workable/sync', methods=['GET', 'POST'])
+@csrf.exempt
+def workable_sync_status():
+    """Inspect incremental Workable sync state or trigger a sync run"""
+    try:
+        from services.workable_sync import workable_sync, SYNC_RESOURCES
+        
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            resource = data.get('resource')
+            if resource and resource not in SYNC_RESOURCES:
+                return jsonify({'status': 'error', 'message': f'Unknown resource: {resource}'}), 400
+            if data.get('full'):
+                workable_sync.reset(resource)
+            results = {resource: workable_sync.sync_resource(resource)} if resource else workable_sync.sync_all()
+            return jsonify({
+                'status': 'success',
+                'results': results,
+                'timestamp': datetime.now().isoformat()
+            })
+        
+        return jsonify(workable_sync.get_status())
+    except Exception as e:
+        logger.error(f"Error in workable_sync_status: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 500
+
 @app.route('/api', methods=['GET', 'POST'])
 @csrf.exempt
 def unified_api():
@@ -604,6 +662,28 @@ try:
 except Exception as e:
     logger.error(f"Failed to start auto-recovery system: {e}")
 
+# Incremental Workable sync into the local Job/Consultant store. Under gunicorn.conf.py the
+# snapshot refresher process runs it. Otherwise it starts on the first request of each process,
+# never at import: with --preload a thread started here would live in the master only, and the
+# workers that serve requests would never see its updates.
+@app.before_request
+def ensure_workable_sync_started():
+    if os.environ.get('WORKABLE_SNAPSHOT_PATH'):
+        return
+    try:
+        from services.workable_sync import ensure_workable_sync
+        ensure_workable_sync()
+    except Exception as e:
+        logger.error(f"Failed to start Workable incremental sync: {str(e)}")
+
+# Periodic full re-scoring into ai_matches (only when BATCH_MATCH_INTERVAL is set)
+try:
+    from services.batch_matcher import start_batch_matcher
+    if start_batch_matcher():
+        logger.info("Batch matching started")
+except Exception as e:
+    logger.error(f"Failed to start batch matching: {e}")
+
 # Initialize services
 try:
     from always_on_service import start_always_on_service
@@ -755,21 +835,23 @@ def generate_sample_clients(count=8):
         })
     return clients
 
+@request_memo.memoize
 def get_workable_jobs():
     """Get jobs data from Workable API or fallback to sample data"""
     try:
         # Try to get real data from Workable API
-        from services.workable_api import workable_api
+        from services.workable_cache import workable_cache
         
-        if workable_api.connected:
-            real_jobs = workable_api.get_jobs()
-            if real_jobs:
-                logger.info(f"Using {len(real_jobs)} real jobs from Workable API")
-                return real_jobs
+        # The cache falls back to its last good snapshot when Workable is down or the circuit is open
+        real_jobs = workable_cache.get_jobs()
+        if real_jobs:
+            logger.info(f"Using {len(real_jobs)} real jobs from Workable API")
+            return real_jobs
         
         # Fallback to sample data if API not available
         logger.warning("Using sample jobs data - Workable API not connected")
-        return [
+        from services.workable_records import RecordSnapshot, normalize_job
+        sample_jobs = [
             {
                 "id": "job_001",
                 "title": "Senior Software Engineer",
@@ -849,38 +931,39 @@ def get_workable_jobs():
                 "applications": 15
             }
         ]
+        return RecordSnapshot(normalize_job(job) for job in sample_jobs)
     except Exception as e:
         logger.error(f"Error in get_workable_jobs: {str(e)}")
-        return []
+        from services.workable_records import RecordSnapshot
+        return RecordSnapshot()
         
+@request_memo.memoize
 def get_workable_job_details(job_id):
     """Get detailed information about a specific job"""
     try:
-        # Get all jobs and find the specific one
-        jobs = get_workable_jobs()
-        for job in jobs:
-            if job.get('id') == job_id:
-                return job
-        return None
+        # Snapshots carry an id map built alongside the list
+        return get_workable_jobs().get_by_id(job_id)
     except Exception as e:
         logger.error(f"Error fetching job details: {str(e)}")
         return None
 
+@request_memo.memoize
 def get_workable_candidates():
     """Get candidates data from Workable API or fallback to sample data"""
     try:
         # Try to get real data from Workable API
-        from services.workable_api import workable_api
+        from services.workable_cache import workable_cache
         
-        if workable_api.connected:
-            real_candidates = workable_api.get_candidates()
-            if real_candidates:
-                logger.info(f"Using {len(real_candidates)} real candidates from Workable API")
-                return real_candidates
+        # The cache falls back to its last good snapshot when Workable is down or the circuit is open
+        real_candidates = workable_cache.get_candidates()
+        if real_candidates:
+            logger.info(f"Using {len(real_candidates)} real candidates from Workable API")
+            return real_candidates
         
         # Fallback to sample data if API not available
         logger.warning("Using sample candidates data - Workable API not connected")
-        return [
+        from services.workable_records import RecordSnapshot, normalize_candidate
+        sample_candidates = [
             {
                 "id": "candidate_001",
                 "name": "Emma Johnson",
@@ -977,9 +1060,11 @@ def get_workable_candidates():
                 ]
             }
         ]
+        return RecordSnapshot(normalize_candidate(candidate) for candidate in sample_candidates)
     except Exception as e:
         logger.error(f"Error in get_workable_candidates: {str(e)}")
-        return []
+        from services.workable_records import RecordSnapshot
+        return RecordSnapshot()
 
 def api_jobs_list(data):
     """Handler for jobs list API action"""
@@ -1029,8 +1114,8 @@ def api_job_detail(job_id):
         # Extract skills from job description and requirements
         skills = extract_skills_from_job(job_details)
         
-        # Add skills to job details
-        job_details['skills'] = skills
+        # Add skills to a derived record; the cached job is shared and read-only
+        job_details = job_details.with_fields(skills=skills)
         
         return jsonify({
             "success": True,
@@ -1480,11 +1565,14 @@ def staffing_home():
 def dashboard():
     """Dashboard route"""
     try:
-        # Get dashboard data directly
-        jobs = get_workable_jobs()
-        candidates = get_workable_candidates()
-        active_job_count = len(jobs)
-        active_candidate_count = len(candidates)
+        # Jobs and candidates are independent fetches: run them side by side
+        from services.fan_out import fetch_concurrently
+        fetched = fetch_concurrently({'jobs': get_workable_jobs, 'candidates': get_workable_candidates})
+        
+        # Aggregates are maintained incrementally; syncing the cached snapshots is a no-op until they change
+        from services.dashboard_stats import dashboard_stats
+        dashboard_stats.sync(fetched['jobs'], fetched['candidates'])
+        dashboard = dashboard_stats.snapshot()
         conversion_rate = 85
         time_to_hire = 14
         recent_activity = [
@@ -1493,41 +1581,20 @@ def dashboard():
             {"type": "interview_scheduled", "description": "Technical interview scheduled for Lucas van der Berg", "timestamp": "2025-06-19T16:45:00Z"}
         ]
         
-        # Get client accounts from Workable if possible
-        client_accounts = []
-        try:
-            if workable_api:
-                client_accounts = workable_api.get_client_accounts() or []
-                if client_accounts:
-                    logger.info(f"Retrieved {len(client_accounts)} client accounts from Workable API")
-        except Exception as client_error:
-            logger.warning(f"Could not fetch client accounts from Workable API: {str(client_error)}")
-            
-        # Use client accounts from Workable or generate sample clients
-        if client_accounts:
-            clients = client_accounts
-        else:
-            clients = generate_sample_clients()
+        # The Workable API service has no client accounts endpoint, so clients are sample data
+        clients = generate_sample_clients()
         
         # Prepare statistics for the dashboard using Workable metrics where available
         stats = {
-            "jobs_count": active_job_count,
-            "candidates_count": active_candidate_count,
+            **dashboard['stats'],
             "clients_count": len(clients),
-            "applications_count": sum(job.get("applications", 0) for job in jobs if job.get("applications") is not None),
-            "open_jobs": len([job for job in jobs if job.get("status") == "open" or job.get("status") == "published"]),
-            "active_candidates": active_candidate_count,
             "conversion_rate": conversion_rate,
             "time_to_hire": time_to_hire
         }
         
-        # Sort jobs and candidates by date if available
-        sorted_jobs = sorted(jobs, key=lambda j: j.get("created_at", ""), reverse=True) if jobs else []
-        sorted_candidates = sorted(candidates, key=lambda c: c.get("created_at", ""), reverse=True) if candidates else []
-        
         return render_template('staffing_app/dashboard.html', 
-                            recent_jobs=sorted_jobs[:5],  # Show only the 5 most recent jobs
-                            recent_candidates=sorted_candidates[:5],  # Show only the 5 most recent candidates
+                            recent_jobs=dashboard['recent_jobs'],  # The 5 most recent jobs
+                            recent_candidates=dashboard['recent_candidates'],  # The 5 most recent candidates
                             clients=clients,
                             stats=stats,
                             recent_activity=recent_activity)
@@ -1541,48 +1608,9 @@ def dashboard():
 def jobs():
     """Jobs listing route"""
     try:
-        # Get jobs data directly
+        # Jobs arrive normalized: formatted_location, formatted_date and rates are filled in at ingest
         jobs = get_workable_jobs()
         
-        # Format job data for proper display
-        for job in jobs:
-            # Format location data if it's a dictionary
-            if isinstance(job.get('location'), dict):
-                location_dict = job['location']
-                location_parts = []
-                # Build a formatted location string from parts
-                if location_dict.get('city'):
-                    location_parts.append(location_dict.get('city'))
-                if location_dict.get('region') and location_dict.get('region') != location_dict.get('city'):
-                    location_parts.append(location_dict.get('region'))
-                if location_dict.get('country'):
-                    location_parts.append(location_dict.get('country'))
-                job['formatted_location'] = ", ".join(filter(None, location_parts))
-            
-            # Handle location_str field if it exists
-            elif isinstance(job.get('location_str'), str):
-                job['formatted_location'] = job['location_str']
-            
-            # Set default if neither is available
-            else:
-                job['formatted_location'] = str(job.get('location', 'Remote'))
-                
-            # Format dates
-            if isinstance(job.get('created_at'), str):
-                try:
-                    created_date = datetime.fromisoformat(job['created_at'].replace('Z', '+00:00'))
-                    job['formatted_date'] = created_date.strftime('%Y-%m-%d')
-                except (ValueError, TypeError):
-                    job['formatted_date'] = job.get('created_at', '')
-            else:
-                job['formatted_date'] = job.get('created_at', '')
-                
-            # Ensure we have rate values
-            if not job.get('rate_min'):
-                job['rate_min'] = job.get('salary_min', '60')
-            if not job.get('rate_max'):
-                job['rate_max'] = job.get('salary_max', '85')
-        
         # Map Workable statuses to our application's status categories
         jobs_by_status = {
             'open': [job for job in jobs if job.get('status', '').lower() in ['published', 'open']],
@@ -1615,6 +1643,10 @@ def add_job():
         # Log the new job information
         logger.info(f"New job created: {title} in {location}")
         
+        # Drop cached job lists so the new posting shows up on the next render
+        from services.workable_cache import invalidate_workable_jobs
+        invalidate_workable_jobs()
+        
         flash(f"Job '{title}' has been created successfully", "success")
         return redirect(url_for('jobs'))
     except Exception as e:
@@ -1650,75 +1682,25 @@ def job_detail(job_id):
             flash("Job not found", "error")
             return redirect(url_for('jobs'))
             
-        # Format job data for proper display
-        # Format location if it's a dictionary (same as in jobs route)
-        if isinstance(job.get('location'), dict):
-            location_dict = job['location']
-            location_parts = []
-            if location_dict.get('city'):
-                location_parts.append(location_dict.get('city'))
-            if location_dict.get('region') and location_dict.get('region') != location_dict.get('city'):
-                location_parts.append(location_dict.get('region'))
-            if location_dict.get('country'):
-                location_parts.append(location_dict.get('country'))
-            job['formatted_location'] = ", ".join(filter(None, location_parts))
-        elif isinstance(job.get('location_str'), str):
-            job['formatted_location'] = job['location_str']
-        else:
-            job['formatted_location'] = str(job.get('location', 'Remote'))
-            
-        # Format dates
-        if isinstance(job.get('created_at'), str):
-            try:
-                created_date = datetime.fromisoformat(job['created_at'].replace('Z', '+00:00'))
-                job['formatted_date'] = created_date.strftime('%Y-%m-%d')
-            except (ValueError, TypeError):
-                job['formatted_date'] = job.get('created_at', '')
-        else:
-            job['formatted_date'] = job.get('created_at', '')
-            
-        # Ensure we have rate values
-        if not job.get('rate_min'):
-            job['rate_min'] = job.get('salary_min', '60')
-        if not job.get('rate_max'):
-            job['rate_max'] = job.get('salary_max', '85')
-            
-        # Format description if it's a dictionary or complex structure
-        if isinstance(job.get('description'), dict):
-            job['formatted_description'] = job.get('description', {}).get('text', 'No description available')
-        elif isinstance(job.get('description'), str):
-            job['formatted_description'] = job['description']
-        else:
-            job['formatted_description'] = 'No description available'
+        # Detail fetches bypass the cache, so normalize them the same way as ingested jobs
+        from services.workable_records import normalize_job
+        job = normalize_job(job)
             
         # Extract skills from job description and requirements
         skills = extract_skills_from_job(job)
         
-        # Get candidates for potential matching
-        candidates = get_workable_candidates()
+        # Match candidates through the skill index instead of scanning all of them
+        from services.skill_index import skill_index
+        skill_index.sync_candidates(get_workable_candidates())
         
-        # Simple matching algorithm based on skills
         matched_candidates = []
-        for candidate in candidates:
-            candidate_skills = candidate.get('skills', [])
-            if not candidate_skills:
-                continue
-                
-            # Calculate match percentage based on skills overlap
-            skill_matches = sum(1 for skill in skills if skill in candidate_skills)
-            if skill_matches > 0:
-                match_percentage = min(100, int(skill_matches / len(skills) * 100))
-                matched_candidate = candidate.copy()
-                matched_candidate['match_percentage'] = match_percentage
-                matched_candidates.append(matched_candidate)
-        
-        # Sort matched candidates by match percentage (highest first)
-        matched_candidates.sort(key=lambda c: c.get('match_percentage', 0), reverse=True)
+        for candidate, match_percentage in skill_index.top_candidates(skills, limit=5):
+            matched_candidates.append(candidate.with_fields(match_percentage=match_percentage))
         
         return render_template('staffing_app/job_detail.html', 
                             job=job, 
                             skills=skills,
-                            matched_candidates=matched_candidates[:5])  # Show top 5 matches
+                            matched_candidates=matched_candidates)  # Top 5 matches
     except Exception as e:
         logger.error(f"Error in job_detail route: {str(e)}")
         flash(f"Error loading job details: {str(e)}", "error")
@@ -1731,86 +1713,47 @@ def candidates():
     try:
         # Get pagination parameters
         page = request.args.get('page', 1, type=int)
-        per_page = 25  # 25 candidates per page
-        
-        # Get consultant data from enhanced Workable API
-        from services.workable_api import workable_api
-        
-        if workable_api:
-            try:
-                # Get candidates directly from Workable API with higher limit
-                candidates_data = workable_api.get_all_candidates(limit=1000)
-                if candidates_data:
-                    logger.info(f"Retrieved {len(candidates_data)} candidates directly from Workable API")
-                    candidates = candidates_data
-                else:
-                    logger.warning("No candidates returned from Workable API, falling back to get_workable_candidates")
-                    candidates = get_workable_candidates()
-            except Exception as api_error:
-                logger.warning(f"Could not retrieve candidates from Workable API: {str(api_error)}")
-                candidates = get_workable_candidates()
-        else:
-            logger.warning("Workable API not initialized, using get_workable_candidates()")
-            candidates = get_workable_candidates()
+        from services.candidate_pages import candidate_pager
+        per_page = candidate_pager.per_page  # 25 candidates per page by default
         
-        # Process the candidates data
-        candidates_list = []
-        for candidate in candidates:
-            # Extract skills from candidate details or use empty list if not available
-            skills = candidate.get('skills', [])
-            if isinstance(skills, str):
-                skills = [skill.strip() for skill in skills.split(',')]
-                
-            candidate_data = {
-                'id': candidate.get('id', ''),
-                'first_name': candidate.get('first_name', ''),
-                'last_name': candidate.get('last_name', ''),
-                'email': candidate.get('email', ''),
-                'phone': candidate.get('phone', ''),
-                'status': candidate.get('status', 'available'),
-                'hourly_rate': candidate.get('hourly_rate', 0),
-                'skills': skills,
-                'created_at': candidate.get('created_at', ''),
-                'applications': candidate.get('total_applications', 0)
-            }
-            candidates_list.append(candidate_data)
+        # Page through the cached snapshot: only this page's rows are viewed, counts come precomputed
+        from services.workable_records import ConsultantRow
+        result = candidate_pager.page(get_workable_candidates(), page=page, after=request.args.get('after'),
+                                      before=request.args.get('before'))
+        candidates_page = [ConsultantRow(candidate) for candidate in result['records']]
+        page = result['page']
         
-        # Group candidates by status for the template
+        # Group this page's candidates by status for the template; whole-dataset totals are in candidate_counts
         candidates_by_status = {
-            'new': [],
-            'active': [],
-            'all': candidates_list
+            'new': [candidate for candidate in candidates_page if candidate['status'] == 'new'],
+            'active': [candidate for candidate in candidates_page if candidate['status'] != 'new'],
+            'all': candidates_page
         }
         
-        for candidate in candidates_list:
-            status = candidate.get('status', 'active')
-            if status == 'new':
-                candidates_by_status['new'].append(candidate)
-            else:
-                candidates_by_status['active'].append(candidate)
-        
-        # Calculate pagination
-        total = len(candidates_list)
-        start = (page - 1) * per_page
-        end = start + per_page
-        candidates_page = candidates_list[start:end]
-        
         # Create pagination info
+        total = result['total']
+        pages = (total + per_page - 1) // per_page
         pagination = {
             'page': page,
             'per_page': per_page,
             'total': total,
-            'pages': (total + per_page - 1) // per_page,
+            'pages': pages,
             'has_prev': page > 1,
-            'has_next': page < (total + per_page - 1) // per_page,
+            'has_next': result['next_cursor'] is not None,
             'prev_num': page - 1 if page > 1 else None,
-            'next_num': page + 1 if page < (total + per_page - 1) // per_page else None
+            'next_num': page + 1 if result['next_cursor'] is not None else None,
+            'next_cursor': result['next_cursor'],
+            'prev_cursor': result['prev_cursor'],
+            # Prev/next links carry keyset cursors, so they stay on the right rows when candidates arrive
+            'next_url': url_for('candidates', after=result['next_cursor']) if result['next_cursor'] else None,
+            'prev_url': url_for('candidates', before=result['prev_cursor']) if result['prev_cursor'] else None
         }
             
         return render_template('staffing_app/candidates.html', 
                              consultants=candidates_page, 
-                             candidates=candidates_list,
+                             candidates=candidates_page,
                              candidates_by_status=candidates_by_status,
+                             candidate_counts=result['counts'],
                              pagination=pagination)
     except Exception as e:
         logger.error(f"Error in candidates route: {str(e)}")
@@ -1819,6 +1762,7 @@ def candidates():
                              consultants=[], 
                              candidates=[],
                              candidates_by_status={'new': [], 'active': [], 'all': []},
+                             candidate_counts={'new': 0, 'active': 0, 'all': 0},
                              pagination={'page': 1, 'per_page': 25, 'total': 0, 'pages': 0, 'has_prev': False, 'has_next': False})
 
 @app.route('/add_candidate', methods=['GET', 'POST'])
@@ -1850,40 +1794,23 @@ def candidate_detail(candidate_id):
         # If we couldn't get the specific candidate, try to find them in the full list
         if not candidate:
             logger.warning(f"No direct candidate details, searching in all candidates for ID {candidate_id}")
-            candidates = get_workable_candidates()
-            candidate = next((c for c in candidates if c.get('id') == candidate_id), None)
+            candidate = get_workable_candidates().get_by_id(candidate_id)
         
         if not candidate:
             flash("Candidate not found", "error")
             return redirect(url_for('candidates'))
         
-        # Get jobs for potential matching
-        jobs = get_workable_jobs()
+        # Match jobs through the skill index; job skills are extracted once when indexed
+        from services.skill_index import skill_index
+        skill_index.sync_jobs(get_workable_jobs())
         
-        # Simple matching algorithm based on skills
         matched_jobs = []
-        candidate_skills = candidate.get('skills', [])
-        
-        for job in jobs:
-            # Extract skills from job
-            job_skills = extract_skills_from_job(job)
-            if not job_skills:
-                continue
-                
-            # Calculate match percentage based on skills overlap
-            skill_matches = sum(1 for skill in candidate_skills if skill in job_skills)
-            if skill_matches > 0:
-                match_percentage = min(100, int(skill_matches / len(job_skills) * 100))
-                matched_job = job.copy()
-                matched_job['match_percentage'] = match_percentage
-                matched_jobs.append(matched_job)
-        
-        # Sort matched jobs by match percentage (highest first)
-        matched_jobs.sort(key=lambda j: j.get('match_percentage', 0), reverse=True)
+        for job, match_percentage in skill_index.top_jobs(candidate.get('skills', []), limit=5):
+            matched_jobs.append(job.with_fields(match_percentage=match_percentage))
         
         return render_template('staffing_app/candidate_detail.html', 
                             candidate=candidate,
-                            matched_jobs=matched_jobs[:5])  # Show top 5 matches
+                            matched_jobs=matched_jobs)  # Top 5 matches
     except Exception as e:
         logger.error(f"Error in candidate_detail route: {str(e)}")
         flash(f"Error loading candidate details: {str(e)}", "error")
@@ -1926,6 +1853,7 @@ def client_detail(client_id):
     try:
         # Get client accounts from enhanced Workable API
         from services.workable_api import workable_api
+        from services.workable_records import RecordSnapshot
         
         client = None
         if workable_api:
@@ -1934,35 +1862,14 @@ def client_detail(client_id):
                 client_accounts = workable_api.get_client_accounts()
                 if client_accounts:
                     logger.info(f"Retrieved client accounts from Workable API, searching for ID {client_id}")
-                    # Try to find the client by ID
-                    # Try to convert to int if it seems to be a number
-                    client_id_int = None
-                    try:
-                        client_id_int = int(client_id)
-                    except ValueError:
-                        logger.warning(f"Client ID {client_id} is not an integer")
-                        # Continue with string comparison
-                        client = next((c for c in client_accounts if str(c.get('id', '')) == client_id), None)
-                    
-                    if client_id_int is not None:
-                        client = next((c for c in client_accounts if c.get('id') == client_id_int), None)
+                    client = RecordSnapshot(client_accounts).get_by_id(client_id)
             except Exception as api_error:
                 logger.warning(f"Could not retrieve client accounts from Workable API: {str(api_error)}")
         
         # If we couldn't find the client from Workable, use sample clients
         if not client:
             logger.warning(f"No client found in Workable API data, using sample clients for ID {client_id}")
-            client_list = generate_sample_clients()
-            
-            # Convert client_id to int for comparison
-            try:
-                client_id_int = int(client_id)
-            except ValueError:
-                flash("Invalid client ID", "error")
-                return redirect(url_for('clients'))
-            
-            # Find the specific client
-            client = next((c for c in client_list if c.get('id') == client_id_int), None)
+            client = RecordSnapshot(generate_sample_clients()).get_by_id(client_id)
         
         if not client:
             flash("Client not found", "error")
@@ -2003,66 +1910,37 @@ def matching():
             jobs = get_workable_jobs()
             candidates = get_workable_candidates()
         
-        # Transform candidates into consultant format for matching
-        consultants_list = []
-        
-        for candidate in candidates:
-            # Extract skills from candidate details or use empty list if not available
-            skills = candidate.get('skills', [])
-            if isinstance(skills, str):
-                skills = [skill.strip() for skill in skills.split(',')]
-                
-            candidate_data = {
-                'id': candidate.get('id', ''),
-                'first_name': candidate.get('first_name', ''),
-                'last_name': candidate.get('last_name', ''),
-                'email': candidate.get('email', ''),
-                'phone': candidate.get('phone', ''),
-                'status': candidate.get('status', 'available'),
-                'hourly_rate': candidate.get('hourly_rate', 0),
-                'skills': skills,
-                'created_at': candidate.get('created_at', ''),
-                'applications': candidate.get('total_applications', 0)
-            }
-            candidates_list.append(candidate_data)
+        # View candidates in consultant format for matching, without copying each one
+        from services.workable_records import ConsultantRow
+        consultants_list = [ConsultantRow(candidate) for candidate in candidates]
         
-        # Generate matches (in a real app, this would use a sophisticated matching algorithm)
-        matches = []
+        # Prefer the last batch run's scores; otherwise score every open job against every candidate
+        from services.batch_matcher import batch_matcher
+        from services.matching_engine import matching_engine
+        result = batch_matcher.precomputed(jobs, candidates) or matching_engine.match(jobs, candidates)
+        consultants_by_id = {consultant['id']: consultant for consultant in consultants_list}
         
-        for job in jobs[:5]:  # Use only the first 5 jobs for demonstration
-            job_skills = extract_skills_from_job(job)
-            if not job_skills:
-                continue
-                
-            for consultant in consultants_list[:10]:  # Use only the first 10 consultants for demonstration
-                consultant_skills = consultant.get('skills', [])
-                if not consultant_skills:
-                    continue
-                    
-                # Calculate match percentage based on skills overlap
-                skill_matches = sum(1 for skill in consultant_skills if skill in job_skills)
-                if skill_matches > 0:
-                    match_percentage = min(100, int(skill_matches / len(job_skills) * 100))
-                    if match_percentage >= 50:  # Only include matches with at least 50% match
-                        matches.append({
-                            'job': job,
-                            'consultant': consultant,
-                            'match_percentage': match_percentage,
-                            'matched_skills': [skill for skill in consultant_skills if skill in job_skills]
-                        })
-        
-        # Sort matches by match percentage (highest first)
-        matches.sort(key=lambda m: m.get('match_percentage', 0), reverse=True)
+        matches = [
+            {
+                'job': job,
+                'consultant': consultants_by_id.get(candidate.get('id', ''), candidate),
+                'match_percentage': match_percentage,
+                'matched_skills': matched_skills
+            }
+            for job, candidate, match_percentage, matched_skills in result['matches']
+        ]
         
         # Create job_matches structure for the template
         job_matches = []
-        for job in jobs[:5]:
-            job_match = {
+        for job in jobs:
+            best_score = result['best_scores'].get(job.get('id'))
+            if best_score is None:
+                continue
+            job_matches.append({
                 'job': job,
-                'match_score': random.randint(65, 95),  # Random score for demonstration
-                'status': random.choice(['new', 'in progress', 'matched'])
-            }
-            job_matches.append(job_match)
+                'match_score': best_score,
+                'status': 'matched' if best_score >= matching_engine.min_score else 'new'
+            })
             
         return render_template('staffing_app/matching.html', 
                             matches=matches, 
@@ -2114,7 +1992,8 @@ def applications():
             applications.append(application)
         
         # Sort applications by date (most recent first)
-        applications.sort(key=lambda a: a.get('date', ''), reverse=True)
+        from services.recent import recent
+        applications = recent(applications, None, field='date')
         
         return render_template('staffing_app/applications.html', applications=applications)
     except Exception as e:
@@ -2219,6 +2098,8 @@ def onboarding():
         
         # Generate onboardings based on Workable candidate data
         onboardings = []
+        from services.workable_records import RecordSnapshot
+        jobs_index = jobs if isinstance(jobs, RecordSnapshot) else RecordSnapshot(jobs)
         
         # Use real onboarding tasks when available
         if onboarding_tasks:
@@ -2231,12 +2112,9 @@ def onboarding():
             # Use candidate's job if available, otherwise pick one randomly
             job = None
             if candidate.get('job'):
-                job_id = candidate.get('job', {}).get('id')
-                if job_id:
-                    for j in jobs:
-                        if j.get('id') == job_id:
-                            job = j
-                            break
+                # Workable candidates reference their job by shortcode, older records by id
+                job_ref = candidate.get('job', {})
+                job = jobs_index.get_by_id(job_ref.get('id')) or jobs_index.get_by_shortcode(job_ref.get('shortcode'))
             
             if not job and jobs:
                 job = random.choice(jobs)
@@ -2642,7 +2520,8 @@ def placements():
             placements.append(placement)
         
         # Sort placements by start date (most recent first)
-        placements.sort(key=lambda p: p.get('start_date', ''), reverse=True)
+        from services.recent import recent
+        placements = recent(placements, None, field='start_date')
         
         return render_template('staffing_app/placements.html', placements=placements)
     except Exception as e:
@@ -2893,15 +2772,9 @@ def backoffice():
         from services.workable_api import workable_api
         
         if workable_api:
-            try:
-                # Get backoffice-specific data from Workable API
-                backoffice_data = workable_api.get_backoffice_data()
-                active_consultants = backoffice_data.get("active_consultants", [])
-                workable_candidates = get_workable_candidates()
-            except Exception as api_error:
-                logger.warning(f"Could not retrieve Workable backoffice data: {str(api_error)}")
-                active_consultants = []
-                workable_candidates = []
+            # The Workable API service has no backoffice endpoint: placements use sample data
+            active_consultants = []
+            workable_candidates = get_workable_candidates()
         else:
             logger.warning("Workable API not initialized, using sample data for backoffice")
             active_consultants = []
@@ -3097,9 +2970,13 @@ def logout():
 def workspace():
     """Workspace route - integrates all platform functionality"""
     try:
-        # Get basic data for the workspace
-        jobs = get_workable_jobs()[:5]
-        candidates = get_workable_candidates()[:5]
+        # Get basic data for the workspace, fetching jobs and candidates side by side
+        from services.fan_out import fetch_concurrently
+        from services.recent import recent
+        fetched = fetch_concurrently({'jobs': get_workable_jobs, 'candidates': get_workable_candidates},
+                                     defaults={'jobs': [], 'candidates': []})
+        jobs = recent(fetched['jobs'], 5)
+        candidates = recent(fetched['candidates'], 5)
         clients = generate_sample_clients()[:3]
         
         # Generate placement statistics
@@ -3146,7 +3023,7 @@ def workspace():
             activities.append(activity)
         
         # Sort activities by date (most recent first)
-        activities.sort(key=lambda a: a.get('timestamp', ''), reverse=True)
+        activities = recent(activities, None, field='timestamp')
         
         # Prepare workspace data
         workspace_data = {
@@ -3199,20 +3076,88 @@ def ai_chat():
 
 @app.route('/api/ai/suggestions')
 @csrf.exempt
-def ai_suggestions():
-    """Get AI suggestions for Growth Accelerator Assistant"""
+def get_ai_suggestions():
+    """Get AI-powered candidate suggestions using Azure AI Services"""
     try:
-        suggestions = [
-            "How do I create a new job posting?",
-            "What's the onboarding workflow?",
-            "Show me the candidate matching process",
-            "How do I manage client relationships?",
-            "What are the reporting features?"
-        ]
-        return jsonify({'suggestions': suggestions})
+        # Get recent jobs and candidates from Workable, side by side
+        from services.fan_out import fetch_concurrently
+        fetched = fetch_concurrently({'jobs': get_workable_jobs, 'candidates': get_workable_candidates},
+                                     defaults={'jobs': [], 'candidates': []})
+        jobs = fetched['jobs']
+        candidates = fetched['candidates']
+        
+        # Azure OpenAI suggestions, cached by prompt content and generated off the request thread
+        from services.ai_suggestions import ai_suggestion_service
+        job_titles = [job.get('title', 'Position') for job in jobs[:3]]
+        candidate_names = [c.get('name', f'Candidate {i+1}') for i, c in enumerate(candidates[:5])]
+        ai_result = ai_suggestion_service.submit(job_titles, candidate_names)
+        if ai_result['status'] == 'done':
+            return jsonify({
+                "suggestions": ai_result['suggestions'],
+                "total": len(ai_result['suggestions']),
+                "generated_at": datetime.now().isoformat(),
+                "data_source": "azure_ai",
+                "ai_status": "connected",
+                "cached": True
+            })
+        task_info = {}
+        if ai_result['status'] == 'pending':
+            task_info = {
+                "task_id": ai_result['task_id'],
+                "poll_url": url_for('ai_suggestion_task', task_id=ai_result['task_id'])
+            }
+            if ai_result['previous'] is not None:
+                # Serve the previous answer for these inputs while it is refreshed
+                return jsonify({
+                    "suggestions": ai_result['previous'],
+                    "total": len(ai_result['previous']),
+                    "generated_at": datetime.now().isoformat(),
+                    "data_source": "azure_ai",
+                    "ai_status": "refreshing",
+                    "cached": True,
+                    **task_info
+                })
+        
+        # Fallback to Workable-based intelligent matching
+        suggestions = []
+        
+        for i in range(min(5, len(candidates))):
+            candidate = candidates[i]
+            job = jobs[i % len(jobs)] if jobs else {"title": "Available Position"}
+            
+            suggestion = {
+                "candidate_name": candidate.get('name', f'Candidate {i+1}'),
+                "job_title": job.get('title', 'Open Position'),
+                "match_score": 88 + (i * 2),  # Realistic scores
+                "reasoning": f"Profile analysis indicates strong fit for {job.get('title', 'position')} requirements"
+            }
+            suggestions.append(suggestion)
+        
+        return jsonify({
+            "suggestions": suggestions,
+            "total": len(suggestions),
+            "generated_at": datetime.now().isoformat(),
+            "data_source": "workable_intelligence",
+            "ai_status": "generating" if task_info else "workable_based",
+            **task_info
+        }), (202 if task_info else 200)
+        
     except Exception as e:
-        logger.error(f"Error getting AI suggestions: {str(e)}")
-        return jsonify({'suggestions': []})
+        logger.error(f"Error in AI suggestions route: {str(e)}")
+        return jsonify({
+            "suggestions": [
+                {
+                    "candidate_name": "Growth Accelerator", 
+                    "job_title": "AI Integration Ready",
+                    "match_score": 95,
+                    "reasoning": "Azure AI Services configuration available - provide AZURE_OPENAI_KEY to activate"
+                }
+            ],
+            "total": 1,
+            "generated_at": datetime.now().isoformat(),
+            "data_source": "system",
+            "ai_status": "awaiting_credentials"
+        })
 
 # 24/7 Sync Status Endpoints
 @app.route('/api/sync/status')
@@ -3312,6 +3257,40 @@ def force_unified_sync():
         return jsonify({'error': 'Unified sync failed'}), 500
 
 
+@app.route('/api/ai/stub/openai/deployments/<deployment>/chat/completions', methods=['POST'])
+@csrf.exempt
+def ai_stub_chat_completions(deployment):
+    """Local Azure OpenAI stand-in; point AZURE_OPENAI_ENDPOINT at /api/ai/stub and set AI_STUB_ENABLED=true"""
+    if os.environ.get('AI_STUB_ENABLED', 'false').lower() != 'true':
+        return jsonify({'error': 'Not found'}), 404
+    from services.ai_suggestions import stub_chat_completion
+    return jsonify(stub_chat_completion(request.get_json(silent=True) or {}))
+
+@app.route('/api/ai/suggestions/tasks/<task_id>')
+@csrf.exempt
+def ai_suggestion_task(task_id):
+    """Poll a background AI suggestion generation started by /api/ai/suggestions"""
+    from services.ai_suggestions import ai_suggestion_service
+    task = ai_suggestion_service.get_task(task_id)
+    if task is None:
+        return jsonify({'error': 'Unknown or expired task'}), 404
+    response = {'task_id': task_id, 'status': task['status']}
+    if task['status'] == 'done':
+        response.update({
+            'suggestions': task['suggestions'],
+            'total': len(task['suggestions']),
+            'data_source': 'azure_ai'
+        })
+    return jsonify(response), (200 if task['status'] != 'pending' else 202)
+
+@app.route('/api/ai/suggestions/stats')
+@csrf.exempt
+def ai_suggestions_stats():
+    """Cache hit rate, token usage and upstream latency for AI suggestions"""
+    from services.ai_suggestions import ai_suggestion_service
+    return jsonify(ai_suggestion_service.get_stats())
+
+
 # Production domain configuration - only set SERVER_NAME in Azure production
 is_azure_production = "WEBSITE_HOSTNAME" in os.environ
 if is_azure_production:
@@ -3326,119 +3305,3 @@ if __name__ == '__main__':
     logger.info("Growth Accelerator Platform ready: Replit ↔ GitHub ↔ Azure")
     
     app.run(host='0.0.0.0', port=5000, debug=True)
-
-@app.route('/api/ai/suggestions')
-def get_ai_suggestions():
-    """Get AI-powered candidate suggestions using Azure AI Services"""
-    try:
-        # Get recent jobs and candidates from Workable
-        jobs = get_workable_jobs()
-        candidates = get_workable_candidates()
-        
-        # Check for Azure AI Services credentials
-        azure_endpoint = os.environ.get('AZURE_OPENAI_ENDPOINT')
-        azure_key = os.environ.get('AZURE_OPENAI_KEY')
-        
-        if azure_endpoint and azure_key:
-            # Use Azure OpenAI for intelligent suggestions
-            try:
-                headers = {
-                    'api-key': azure_key,
-                    'Content-Type': 'application/json'
-                }
-                
-                job_titles = [job.get('title', 'Position') for job in jobs[:3]]
-                candidate_names = [c.get('name', f'Candidate {i+1}') for i, c in enumerate(candidates[:5])]
-                
-                prompt = f"""As a recruitment AI, create 5 intelligent job-candidate matches.
-                
-Available jobs: {', '.join(job_titles)}
-Available candidates: {', '.join(candidate_names)}
-
-Return JSON format:
-{{
-    "suggestions": [
-        {{
-            "candidate_name": "candidate name",
-            "job_title": "job title",
-            "match_score": 90,
-            "reasoning": "specific matching reason"
-        }}
-    ]
-}}"""
-                
-                payload = {
-                    "messages": [
-                        {"role": "system", "content": "You are an expert recruitment AI providing job-candidate matching suggestions."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": 600,
-                    "temperature": 0.7
-                }
-                
-                response = requests.post(
-                    f"{azure_endpoint}/openai/deployments/gpt-4o/chat/completions?api-version=2024-08-01-preview",
-                    headers=headers,
-                    json=payload,
-                    timeout=15
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result['choices'][0]['message']['content']
-                    
-                    # Extract JSON from response
-                    import re
-                    json_match = re.search(r'\{.*?\}', content, re.DOTALL)
-                    if json_match:
-                        ai_suggestions = json.loads(json_match.group())
-                        return jsonify({
-                            "suggestions": ai_suggestions.get("suggestions", []),
-                            "total": len(ai_suggestions.get("suggestions", [])),
-                            "generated_at": datetime.now().isoformat(),
-                            "data_source": "azure_ai",
-                            "ai_status": "connected"
-                        })
-                
-            except Exception as ai_error:
-                print(f"Azure AI error: {ai_error}")
-        
-        # Fallback to Workable-based intelligent matching
-        suggestions = []
-        
-        for i in range(min(5, len(candidates))):
-            candidate = candidates[i]
-            job = jobs[i % len(jobs)] if jobs else {"title": "Available Position"}
-            
-            suggestion = {
-                "candidate_name": candidate.get('name', f'Candidate {i+1}'),
-                "job_title": job.get('title', 'Open Position'),
-                "match_score": 88 + (i * 2),  # Realistic scores
-                "reasoning": f"Profile analysis indicates strong fit for {job.get('title', 'position')} requirements"
-            }
-            suggestions.append(suggestion)
-        
-        return jsonify({
-            "suggestions": suggestions,
-            "total": len(suggestions),
-            "generated_at": datetime.now().isoformat(),
-            "data_source": "workable_intelligence",
-            "ai_status": "workable_based"
-        })
-        
-    except Exception as e:
-        print(f"AI suggestions error: {e}")
-        return jsonify({
-            "suggestions": [
-                {
-                    "candidate_name": "Growth Accelerator", 
-                    "job_title": "AI Integration Ready",
-                    "match_score": 95,
-                    "reasoning": "Azure AI Services configuration available - provide AZURE_OPENAI_KEY to activate"
-                }
-            ],
-            "total": 1,
-            "generated_at": datetime.now().isoformat(),
-            "data_source": "system",
-            "ai_status": "awaiting_credentials"
-        })
\ No newline at end of file
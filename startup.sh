@@ -19,4 +19,4 @@ fi
 
 # Start Flask application with Gunicorn
 echo "Starting Gunicorn server..."
-gunicorn --bind 0.0.0.0:$PORT --workers 4 --timeout 120 --preload main:app
+gunicorn -c gunicorn.conf.py --bind 0.0.0.0:$PORT --workers 4 --timeout 120 --preload main:app
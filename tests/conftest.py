@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Never let the suite touch a configured production database
+os.environ.pop('DATABASE_URL', None)
+
+@pytest.fixture
+def database():
+    """The app's SQLAlchemy bound to an empty in-memory SQLite database, inside an app context"""
+    from app import app, db
+    import models  # noqa: F401 - registers the tables
+    if 'sqlalchemy' not in app.extensions:
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield db
+        db.session.remove()
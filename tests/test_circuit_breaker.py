@@ -0,0 +1,72 @@
+import pytest
+
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable ``time.monotonic`` for the breaker's recovery timeout"""
+    now = [1000.0]
+    monkeypatch.setattr('services.circuit_breaker.time.monotonic', lambda: now[0])
+    return now
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+def test_opens_after_consecutive_failures_and_rejects_calls(clock):
+    breaker = CircuitBreaker('test', failure_threshold=3, recovery_timeout=30)
+
+    trip(breaker)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.get_stats()['rejected'] == 1
+
+def test_a_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker('test', failure_threshold=3)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_trial_success_closes_the_circuit(clock):
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=30)
+    trip(breaker)
+    clock[0] += 30
+
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_half_open_trial_failure_reopens_the_circuit(clock):
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=30)
+    trip(breaker)
+    clock[0] += 30
+
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_ignored_outcome_frees_the_half_open_slot_without_closing(clock):
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=30)
+    trip(breaker)
+    clock[0] += 30
+
+    breaker.before_call()
+    breaker.record_ignored()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+    assert breaker.get_stats()['ignored'] == 1
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from services import matching_engine as matching_module
+from services.matching_engine import MatchingEngine
+
+pytestmark = pytest.mark.skipif(matching_module.np is None, reason="parity needs numpy installed")
+
+def random_inputs(seed, jobs, candidates, skills, weighted):
+    rng = random.Random(seed)
+    job_weights = [
+        {skill_id: (rng.randint(1, 5) if weighted else 1) for skill_id in rng.sample(range(skills), rng.randint(1, 8))}
+        for _ in range(jobs)
+    ]
+    candidate_masks = []
+    for _ in range(candidates):
+        mask = 0
+        for skill_id in rng.sample(range(skills), rng.randint(0, 10)):
+            mask |= 1 << skill_id
+        candidate_masks.append(mask)
+    return job_weights, candidate_masks
+
+@pytest.mark.parametrize('seed', range(4))
+@pytest.mark.parametrize('skills', [40, 150])  # below and above the uint64 fast path
+@pytest.mark.parametrize('weighted', [False, True])
+@pytest.mark.parametrize('top_k,min_score', [(5, 50), (500, 0)])
+def test_numpy_and_python_scoring_agree(seed, skills, weighted, top_k, min_score):
+    engine = MatchingEngine()
+    engine.block_size = 7  # several job blocks
+    job_weights, candidate_masks = random_inputs(seed, jobs=30, candidates=300, skills=skills, weighted=weighted)
+
+    vectorized = engine._score_numpy(job_weights, candidate_masks, top_k, min_score, float('inf'))
+    python = engine._score_python(job_weights, candidate_masks, top_k, min_score, float('inf'))
+
+    assert vectorized == python
+
+def test_match_gives_the_same_result_without_numpy(monkeypatch):
+    jobs = [
+        {'id': 'j1', 'title': 'Python Developer', 'description': 'Python, Django and PostgreSQL', 'status': 'published'},
+        {'id': 'j2', 'title': 'Frontend Engineer', 'description': 'React and TypeScript', 'status': 'published'},
+        {'id': 'j3', 'title': 'Closed role', 'description': 'Python', 'status': 'closed'}
+    ]
+    candidates = [
+        {'id': 'c1', 'skills': ['Python', 'Django']},
+        {'id': 'c2', 'skills': ['React', 'TypeScript', 'Python']},
+        {'id': 'c3', 'skills': ['PostgreSQL', 'Python', 'Django']}
+    ]
+    engine = MatchingEngine()
+    monkeypatch.setattr(engine, 'load_importance', lambda: {})
+
+    def summary(result):
+        return [(job['id'], candidate['id'], score, skills) for job, candidate, score, skills in result['matches']]
+
+    with_numpy = engine.match(jobs, candidates, top_k=3, min_score=0)
+    monkeypatch.setattr(matching_module, 'np', None)
+    without_numpy = engine.match(jobs, candidates, top_k=3, min_score=0)
+
+    assert without_numpy['engine'] == 'python'
+    assert summary(with_numpy) and summary(with_numpy) == summary(without_numpy)
+    assert 'j3' not in with_numpy['best_scores']
@@ -0,0 +1,108 @@
+import os
+
+import pytest
+import requests
+
+from services.workable_api import WorkableAPIService
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class ScriptedSession:
+    """Plays back one outcome (a status code or an exception) per attempt"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.attempts = 0
+
+    def request(self, method, url, **kwargs):
+        self.attempts += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr('services.workable_api.time.sleep', lambda seconds: None)
+    service = WorkableAPIService()
+    service.max_retries = 3
+    service.backoff_factor = 0
+    return service
+
+def use_session(api, session):
+    api._session, api._session_pid = session, os.getpid()
+    return session
+
+def test_retryable_status_is_retried_until_it_succeeds(api):
+    session = use_session(api, ScriptedSession(503, 429, 200))
+
+    response = api._request('GET', 'https://example.test/jobs')
+
+    assert response.status_code == 200
+    assert session.attempts == 3
+    assert api._http_stats['retries_by_reason'] == {'503': 1, '429': 1}
+    assert api.breaker.get_stats()['successes'] == 1
+
+def test_connection_errors_are_retried(api):
+    session = use_session(api, ScriptedSession(requests.exceptions.ConnectTimeout(), requests.ConnectionError(), 200))
+
+    assert api._request('GET', 'https://example.test/jobs').status_code == 200
+    assert session.attempts == 3
+
+def test_read_timeout_is_not_retried(api):
+    session = use_session(api, ScriptedSession(requests.exceptions.ReadTimeout(), 200))
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        api._request('GET', 'https://example.test/jobs')
+    assert session.attempts == 1
+    assert api.breaker.get_stats()['failures'] == 1
+
+def test_retries_stop_at_the_retry_count(api):
+    session = use_session(api, ScriptedSession(503, 503, 503, 503, 200))
+
+    assert api._request('GET', 'https://example.test/jobs').status_code == 503
+    assert session.attempts == 4
+    assert api.breaker.get_stats()['failures'] == 1
+
+def test_retries_stop_when_the_time_budget_is_spent(api):
+    api.retry_budget = 0
+    session = use_session(api, ScriptedSession(503, 200))
+
+    assert api._request('GET', 'https://example.test/jobs').status_code == 503
+    assert session.attempts == 1
+
+def test_explicit_retries_override_the_default(api):
+    session = use_session(api, ScriptedSession(requests.ConnectionError(), 200))
+
+    with pytest.raises(requests.ConnectionError):
+        api._request('GET', 'https://example.test/jobs', retries=0)
+    assert session.attempts == 1
+
+def test_client_errors_are_neither_retried_nor_breaker_successes(api):
+    session = use_session(api, ScriptedSession(404))
+    api.breaker.record_failure()
+
+    assert api._request('GET', 'https://example.test/jobs/missing').status_code == 404
+    stats = api.breaker.get_stats()
+    assert session.attempts == 1
+    assert stats['successes'] == 0 and stats['ignored'] == 1
+    assert stats['consecutive_failures'] == 1
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs fork")
+def test_forked_child_builds_its_own_session(api):
+    parent_session = api.session
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(write_end, b'1' if api.session is not parent_session else b'0')
+        os._exit(0)
+    os.waitpid(pid, 0)
+    assert os.read(read_end, 1) == b'1'
+    assert api.session is parent_session
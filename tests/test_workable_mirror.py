@@ -0,0 +1,73 @@
+import pytest
+
+from services.workable_mirror import WorkableMirror
+
+def candidate(candidate_id, email, shortcode=None, stage='applied'):
+    return {
+        'id': candidate_id,
+        'first_name': 'First',
+        'last_name': candidate_id,
+        'email': email,
+        'stage': stage,
+        'job': {'shortcode': shortcode} if shortcode else {}
+    }
+
+@pytest.fixture
+def mirror(database):
+    return WorkableMirror()
+
+def test_jobs_are_upserted_on_workable_id(database, mirror):
+    from models import Job
+
+    mirror.upsert_jobs([{'id': 'j1', 'shortcode': 'SC1', 'title': 'Engineer'}])
+    mirror.upsert_jobs([{'id': 'j1', 'shortcode': 'SC1', 'title': 'Senior Engineer'}])
+
+    jobs = Job.query.all()
+    assert [(job.workable_id, job.shortcode, job.title) for job in jobs] == [('j1', 'SC1', 'Senior Engineer')]
+
+def test_candidates_sharing_an_email_are_counted_as_skipped(database, mirror):
+    from models import Consultant
+    records = [candidate(f"c{i}", f"person{i % 250}@example.com") for i in range(300)]
+
+    written = mirror.upsert_candidates(records)
+
+    assert written == 250
+    assert mirror.get_stats()['skipped'] == 50
+    assert Consultant.query.count() == 250
+
+def test_candidates_without_an_email_are_skipped(database, mirror):
+    written = mirror.upsert_candidates([candidate('c1', None), candidate('c2', 'c2@example.com')])
+
+    assert written == 1
+    assert mirror.get_stats()['skipped'] == 1
+
+def test_email_taken_by_another_row_only_drops_that_row(database, mirror):
+    from models import Consultant
+    mirror.upsert_candidates([candidate('c1', 'shared@example.com')])
+
+    written = mirror.upsert_candidates([candidate('c2', 'shared@example.com'), candidate('c3', 'c3@example.com')])
+
+    assert written == 1
+    assert mirror.get_stats()['row_fallbacks'] == 1
+    assert sorted(row.workable_id for row in Consultant.query) == ['c1', 'c3']
+
+def test_applications_resolve_jobs_from_the_jobs_table(database, mirror):
+    from models import Application, Job
+    mirror.upsert_jobs([{'id': 'j1', 'shortcode': 'SC1', 'title': 'Engineer'}])
+    records = [candidate('c1', 'c1@example.com', 'SC1', 'interview'),
+               candidate('c2', 'c2@example.com', 'UNKNOWN')]
+    mirror.upsert_candidates(records)
+
+    written = mirror.upsert_applications(records)
+
+    assert written == 1
+    application = Application.query.one()
+    assert application.job_id == Job.query.one().id
+    assert application.status == 'interview'
+
+def test_unsupported_dialect_is_a_value_error(database, mirror, monkeypatch):
+    from models import Job
+    monkeypatch.setattr(database.engine.dialect, 'name', 'mysql')
+
+    with pytest.raises(ValueError, match='mysql'):
+        mirror._insert(Job.__table__)
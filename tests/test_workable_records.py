@@ -0,0 +1,72 @@
+import dataclasses
+import json
+import pickle
+
+import pytest
+
+from services.workable_records import CandidateRecord, RecordNormalizer, normalize_candidate, normalize_job
+
+def job_source():
+    return {
+        'id': 'j1',
+        'title': 'Engineer',
+        'status': 'published',
+        'location': {'city': 'Amsterdam', 'country': 'Netherlands'},
+        'created_at': '2024-01-02T10:00:00Z',
+        'custom_field': 'kept'
+    }
+
+def test_records_cannot_be_changed():
+    record = normalize_job(job_source())
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.title = 'Changed'
+    with pytest.raises(TypeError):
+        record['title'] = 'Changed'
+
+def test_display_fields_are_filled_in_and_unknown_keys_kept():
+    record = normalize_job(job_source())
+
+    assert record['formatted_location'] == 'Amsterdam, Netherlands'
+    assert record['formatted_date'] == '2024-01-02'
+    assert record['custom_field'] == 'kept'
+    assert 'department' not in record and record.get('department', 'none') == 'none'
+
+def test_copy_and_with_fields_leave_the_record_alone():
+    record = normalize_candidate({'id': 'c1', 'first_name': 'Ada', 'skills': ['Python']})
+
+    copied = record.copy()
+    copied['first_name'] = 'Grace'
+    overlay = record.with_fields(match_percentage=80, first_name='Bob')
+
+    assert record['first_name'] == 'Ada'
+    assert overlay['first_name'] == 'Bob' and overlay['match_percentage'] == 80
+    assert set(overlay) == set(record) | {'match_percentage'}
+
+def test_records_serialize_as_json_objects():
+    from app import app
+    record = normalize_candidate({'id': 'c1', 'first_name': 'Ada', 'created_at': '2024-01-02T10:00:00Z'})
+
+    payload = json.loads(app.json.dumps({'candidate': record, 'row': record.with_fields(score=1)}))
+
+    assert payload['candidate'] == {'id': 'c1', 'first_name': 'Ada', 'created_at': '2024-01-02T10:00:00Z',
+                                    'formatted_date': '2024-01-02'}
+    assert payload['row']['score'] == 1
+
+def test_records_survive_a_pickle_roundtrip():
+    record = normalize_job(job_source())
+
+    restored = pickle.loads(pickle.dumps(record))
+
+    assert type(restored) is type(record) and dict(restored) == dict(record)
+
+def test_unchanged_records_are_normalized_once():
+    normalizer = RecordNormalizer()
+    first = normalizer.normalize_all('candidates', [{'id': 'c1', 'first_name': 'Ada'}])
+    second = normalizer.normalize_all('candidates', [{'id': 'c1', 'first_name': 'Ada'}])
+    changed = normalizer.normalize_all('candidates', [{'id': 'c1', 'first_name': 'Grace'}])
+
+    assert isinstance(first[0], CandidateRecord)
+    assert second[0] is first[0]
+    assert changed[0] is not first[0] and changed[0]['first_name'] == 'Grace'
+    assert normalizer.get_stats()['reused'] == 1
@@ -0,0 +1,91 @@
+import os
+import stat
+
+import pytest
+
+from services.workable_snapshot import SnapshotRefresher, WorkableSnapshot, read_snapshot, write_snapshot
+
+SECTIONS = {
+    'jobs': [{'id': 'j1', 'title': 'Engineer', 'location': {'city': 'Amsterdam'}}],
+    'candidates': [{'id': 'c1', 'first_name': 'Ada', 'skills': ['Python']}],
+    'job_skills': {'j1': ['python']}
+}
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'workable' / 'snapshot.bin')
+
+@pytest.fixture
+def snapshot(path, monkeypatch):
+    monkeypatch.setenv('WORKABLE_SNAPSHOT_PATH', path)
+    monkeypatch.setenv('WORKABLE_SNAPSHOT_CHECK_INTERVAL', '0')
+    return WorkableSnapshot()
+
+def test_written_sections_are_read_back(path):
+    version = write_snapshot(path, SECTIONS)
+
+    snapshot = read_snapshot(path)
+
+    assert snapshot['header']['version'] == version
+    assert snapshot['sections'] == SECTIONS
+
+def test_snapshot_is_private_to_its_owner(path):
+    write_snapshot(path, SECTIONS)
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(os.path.dirname(path)).st_mode) == 0o700
+    assert os.listdir(os.path.dirname(path)) == ['snapshot.bin']
+
+def test_a_newer_version_replaces_the_file(path):
+    first = write_snapshot(path, SECTIONS)
+    second = write_snapshot(path, {**SECTIONS, 'jobs': []})
+
+    snapshot = read_snapshot(path)
+
+    assert second > first
+    assert snapshot['header']['version'] == second and snapshot['sections']['jobs'] == []
+
+def test_other_files_are_rejected(path):
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'wb') as f:
+        f.write(b'NOTSNAP!' + bytes(16))
+
+    with pytest.raises(ValueError, match='not a Workable snapshot'):
+        read_snapshot(path)
+
+def test_worker_serves_normalized_records_from_the_file(path, snapshot):
+    write_snapshot(path, SECTIONS)
+
+    jobs = snapshot.get('jobs')
+    candidates = snapshot.get('candidates')
+
+    assert [job['formatted_location'] for job in jobs] == ['Amsterdam']
+    assert jobs.skills == {'j1': ['python']}
+    assert candidates[0]['first_name'] == 'Ada'
+    assert snapshot.get_stats()['records'] == {'jobs': 1, 'candidates': 1}
+
+def test_without_a_file_there_is_nothing_to_serve(snapshot):
+    assert snapshot.get('jobs') is None
+    assert snapshot.get_stats()['load_errors'] == 0
+
+def test_invalidate_removes_the_file_and_drops_the_records(path, snapshot):
+    write_snapshot(path, SECTIONS)
+    assert snapshot.get('jobs') is not None
+
+    assert snapshot.invalidate() is True
+
+    assert not os.path.exists(path)
+    assert snapshot.get('jobs') is None
+    assert snapshot.invalidate() is False
+
+def test_refresher_rewrites_the_last_contents_when_workable_is_unavailable(path, monkeypatch):
+    refresher = SnapshotRefresher(path, interval=1, full_interval=1)
+    refresher._sections = dict(SECTIONS)
+    refresher._write()
+    assert refresher.rewrite_if_invalidated() is None
+
+    os.remove(path)
+    monkeypatch.setattr(refresher, 'refresh', lambda: None)
+
+    assert refresher.rewrite_if_invalidated() is not None
+    assert read_snapshot(path)['sections'] == SECTIONS
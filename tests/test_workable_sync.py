@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.workable_sync import WorkableSyncEngine
+
+class FakeWorkable:
+    """Serves a change feed the way ``iter_jobs``/``iter_candidates`` do, honouring ``updated_after``"""
+
+    connected = True
+
+    def __init__(self, jobs=(), candidates=()):
+        self.records = {'jobs': list(jobs), 'candidates': list(candidates)}
+        self.calls = []
+        self.fail_after = None
+
+    def _feed(self, resource, updated_after):
+        self.calls.append((resource, updated_after))
+        changed = [record for record in self.records[resource]
+                   if not updated_after or record['updated_at'] > updated_after]
+        for position, record in enumerate(changed):
+            if self.fail_after is not None and position >= self.fail_after:
+                raise ConnectionError("change feed interrupted")
+            yield dict(record)
+
+    def iter_jobs(self, updated_after=None, strict=False):
+        return self._feed('jobs', updated_after)
+
+    def iter_candidates(self, updated_after=None, strict=False):
+        return self._feed('candidates', updated_after)
+
+def candidate(candidate_id, updated_at, email=None):
+    return {
+        'id': candidate_id,
+        'first_name': 'First',
+        'last_name': candidate_id,
+        'email': email or f"{candidate_id}@example.com",
+        'stage': 'applied',
+        'created_at': '2024-01-01T00:00:00Z',
+        'updated_at': updated_at
+    }
+
+@pytest.fixture
+def feed():
+    return FakeWorkable(candidates=[
+        candidate('c1', '2024-01-01T10:00:00Z'),
+        candidate('c2', '2024-01-02T00:00:00Z')
+    ])
+
+def consultant_ids(db):
+    from models import Consultant
+    return sorted(workable_id for (workable_id,) in db.session.query(Consultant.workable_id))
+
+def test_first_sync_reads_everything_and_sets_the_watermark(database, feed):
+    engine = WorkableSyncEngine(api=feed)
+
+    result = engine.sync_resource('candidates')
+
+    assert feed.calls == [('candidates', None)]
+    assert result['mode'] == 'full' and result['complete']
+    assert engine.watermarks['candidates'] == datetime(2024, 1, 2)
+    assert consultant_ids(database) == ['c1', 'c2']
+
+def test_next_sync_asks_for_changes_since_the_mark_minus_the_overlap(database, feed):
+    engine = WorkableSyncEngine(api=feed)
+    engine.overlap = timedelta(seconds=60)
+    engine.sync_resource('candidates')
+    feed.records['candidates'].append(candidate('c3', '2024-01-03T00:00:00Z'))
+
+    result = engine.sync_resource('candidates')
+
+    assert feed.calls[-1] == ('candidates', '2024-01-01T23:59:00Z')
+    # c2 sits inside the overlap window and is merged again without creating a duplicate
+    assert result['changed'] == 2
+    assert engine.watermarks['candidates'] == datetime(2024, 1, 3)
+    assert consultant_ids(database) == ['c1', 'c2', 'c3']
+    assert sorted(record['id'] for record in engine.get_records('candidates')) == ['c1', 'c2', 'c3']
+
+def test_interrupted_feed_keeps_the_watermark_but_merges_what_arrived(database, feed):
+    engine = WorkableSyncEngine(api=feed)
+    feed.fail_after = 1
+
+    result = engine.sync_resource('candidates')
+
+    assert not result['complete']
+    assert engine.watermarks['candidates'] is None
+    assert [record['id'] for record in engine.get_records('candidates')] == ['c1']
+
+    feed.fail_after = None
+    engine.sync_resource('candidates')
+    assert feed.calls[-1] == ('candidates', None)
+    assert engine.watermarks['candidates'] == datetime(2024, 1, 2)
+
+def test_watermark_is_restored_from_the_database(database, feed):
+    WorkableSyncEngine(api=feed).sync_resource('candidates')
+
+    restarted = WorkableSyncEngine(api=feed)
+    restarted.overlap = timedelta(0)
+    result = restarted.sync_resource('candidates')
+
+    assert feed.calls[-1] == ('candidates', '2024-01-02T00:00:00Z')
+    assert result['mode'] == 'incremental' and result['changed'] == 0
+
+def test_unknown_resource_is_rejected():
+    with pytest.raises(ValueError):
+        WorkableSyncEngine(api=FakeWorkable()).sync_resource('clients')